@@ -9,9 +9,17 @@ __version__ = "1.0"
 
 from hexlogic import RectCoords as RectCoords
 from hexlogic import HexCoords as HexCoords
+from hexlogic import TileSnapshot as TileSnapshot
+from hexlogic import SearchStats as SearchStats
+from hexlogic import SearchTrace as SearchTrace
 from hexlogic import GraphMatrix as GraphMatrix
+from hexlogic import ContractionHierarchy as ContractionHierarchy
+from hexlogic import LineOfSight as LineOfSight
+from hexlogic import HexSpatialHash as HexSpatialHash
+from hexlogic import HexLayout as HexLayout
 from hexlogic import float_to_int as float_to_int
 from hexlogic import tuple_or_object as tuple_or_object
+from hexlogic import deep_sizeof as deep_sizeof
 from hexlogic import linint as linint
 from hexlogic import rect_linint as rect_linint
 from hexlogic import cube_linint as cube_linint
@@ -21,13 +29,36 @@ from hexlogic import get_xy as get_xy
 from hexlogic import set_xy as set_xy
 from hexlogic import get_qrs as get_qrs
 from hexlogic import set_qrs as set_qrs
+from hexlogic import offset_to_cube as offset_to_cube
+from hexlogic import cube_to_offset as cube_to_offset
+from hexlogic import offset_to_cube_batch as offset_to_cube_batch
+from hexlogic import cube_to_offset_batch as cube_to_offset_batch
 from hexlogic import hex_to_pixel as hex_to_pixel
+from hexlogic import sync_xy as sync_xy
 from hexlogic import pixel_to_hex as pixel_to_hex
+from hexlogic import pick_hex as pick_hex
+from hexlogic import pick_hex_batch as pick_hex_batch
+from hexlogic import pick_raster as pick_raster
+from hexlogic import in_rect as in_rect
 from hexlogic import get_angle as get_angle
 from hexlogic import neighbors as neighbors
 from hexlogic import distance as distance
 from hexlogic import in_range as in_range
+from hexlogic import range_offsets as range_offsets
+from hexlogic import ring as ring
+from hexlogic import spiral as spiral
 from hexlogic import line_draw as line_draw
+from hexlogic import field_of_view as field_of_view
+from hexlogic import field_of_view_batch as field_of_view_batch
 from hexlogic import dist_lim_flood_fill as dist_lim_flood_fill
+from hexlogic import TILE_RECORD as TILE_RECORD
+from hexlogic import load_tilemap as load_tilemap
+from hexlogic import profiling_targets as profiling_targets
+from hexlogic import enable_profiling as enable_profiling
+from hexlogic import disable_profiling as disable_profiling
+from hexlogic import profiling_enabled as profiling_enabled
+from hexlogic import reset_profiling as reset_profiling
+from hexlogic import profiling_stats as profiling_stats
+from hexlogic import profiling_text as profiling_text
 
 
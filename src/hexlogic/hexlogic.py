@@ -51,15 +51,53 @@ preference.
 
 Dependencies:
 -------------
+array.array
+    Compact arrays of basic values, used to store large amounts of numbers 
+    without one Python Object per value.
+    
+csv
+    Implements classes to read and write tabular data in CSV format, used 
+    to stream tilemaps.
+    
 collections.namedtuple
     Provides a new tuple subclass. The new subclass is used to create tuple-like 
     objects that have fields accessible by attribute lookup, as well as being 
     indexable and iterable.
     
+collections.abc.Callable
+    Abstract base class for callable Objects, used in type hints.
+    
+heapq.heappush, heapq.heappop
+    Binary heap operations on Lists, used as priority queue of searches with 
+    non Integer movement costs.
+    
+functools.lru_cache, functools.wraps
+    Decorator to wrap a function with a memoizing callable that saves up to 
+    the maxsize most recent calls. Decorator copying the name and docstring 
+    of a wrapped function, used by the profiling hooks.
+    
+json
+    Encoder and decoder for the JSON format, used to stream tilemaps stored 
+    as JSON Lines.
+    
 math
     This module provides access to the mathematical functions defined by the 
     C standard library.
     
+os
+    Miscellaneous operating system interfaces, used to determine the size of 
+    a tilemap file for progress reports.
+    
+struct
+    Interprets bytes as packed binary data, used to stream tilemaps stored in 
+    the binary record format.
+    
+sys
+    System-specific parameters and functions, used to find the modules 
+    having imported HexLogic functions, when toggling the profiling hooks.
+    
+time.perf_counter
+    Clock with the highest available resolution, used to time searches.
     
 unittest
     The unittest unit testing framework supports test automation, sharing of 
@@ -82,12 +120,46 @@ HexCoords(namedtuple("HexCoords", "q r s")):
     Coordinates in a three-dimensional cartesian coordinate system, limited by 
     the constraint q + r + s = 0.
     
-GraphMatrix(tile_grp:set|list):
+TileSnapshot(tile_grp:set|list, attributes:tuple|list=("movement_cost",)):
+    Extracts the coordinates and selected attributes of all Objects in 
+    tile_grp once into parallel arrays, accepted by GraphMatrix and 
+    dist_lim_flood_fill instead of tile_grp.
+    
+SearchStats():
+    Counters of one or, aggregated, many searches on a GraphMatrix, like the 
+    nodes expanded and pushed, the frontier high-water mark, the path cost and 
+    the elapsed time.
+    
+SearchTrace():
+    Records the expansion order, g and f values and final frontier of a 
+    search on a GraphMatrix in arrays, exportable as JSON Lines or as heatmap 
+    data positioned with hex_to_pixel.
+    
+GraphMatrix(tile_grp:set|list|TileSnapshot):
     Creates a GraphMatrix Object, containing a directed, weighted graph, from the 
     Objects or coordinates contained in tile_grp, which is a container, organized 
     in a Dictionary, mapping the traversability with movement cost, as well as 
     a Set containing all connected coordinates.
     
+ContractionHierarchy(coords:list, rank:list|array, edges:dict):
+    Preprocessed copy of the graph of a static GraphMatrix, answering shortest 
+    path queries by a bidirectional search over shortcut edges, serialisable 
+    as JSON.
+    
+LineOfSight(blockers:list|set=None, symmetric:bool=True):
+    Answers whether one hexagon can be seen from another, memorising the 
+    results and invalidating only the pairs whose line passes through a 
+    hexagon, whose blocking state changed.
+    
+HexSpatialHash(obj_grp:list|set=None, sync_qrs:bool=False):
+    Indexes Objects like units or items by the cube coordinates of the hexagon 
+    they are located on, with O(1) insert, move and remove.
+    
+HexLayout(tile_width:int=64, tile_height:int=64, origin:object|tuple|RectCoords=(0, 0), 
+          cache_size:int=0, validate:bool=True):
+    Converts between cube and pixel coordinates with one tile size and 
+    origin, with the pick raster computed once and an optional cache of pixel positions.
+    
     
 Functions:
 ----------
@@ -102,6 +174,10 @@ container_or_object(container_or_object:object|tuple|RectCoords|HexCoords,
     Returns a Tuple, Namedtuple, List or Dictionary of predefined length, 
     when passed an Object or a Tuple.
 
+deep_sizeof(obj:object, seen:set=None) -> int:
+    Returns the size in bytes of obj and of all Objects contained in it, 
+    following built-in containers, each Object counted once.
+    
 linint(a:int|float, b:int|float, t:int|float) -> int|float:
     Linear interpolation returns point at t of distance between a and b.
     
@@ -135,34 +211,156 @@ get_qrs(obj:object, return_obj_type:str="Tuple") -> tuple|HexCoords|list|dict:
 set_qrs(obj:object, q:int|float, r:int|float, s:int|float) -> None:
     Set q, r and s attribute of obj to specified values.
     
+offset_to_cube(col_row:tuple|list, offset:str="even-q", return_obj_type:str="Tuple") -> tuple|HexCoords|list|dict:
+    Converts offset coordinates (column, row) of an 'even-q' or 'odd-q' 
+    grid to cube coordinates.
+    
+cube_to_offset(qrs:object|tuple|HexCoords, offset:str="even-q", return_obj_type:str="Tuple") -> tuple|list|dict:
+    Converts cube coordinates to offset coordinates (column, row) of an 
+    'even-q' or 'odd-q' grid.
+    
+offset_to_cube_batch(cols:list|tuple|array|memoryview, rows:list|tuple|array|memoryview, offset:str="even-q") -> tuple:
+    Converts parallel sequences of columns and rows to three arrays q, r 
+    and s, without a Tuple per tile.
+    
+cube_to_offset_batch(q:list|tuple|array|memoryview, r:list|tuple|array|memoryview, offset:str="even-q") -> tuple:
+    Converts parallel sequences of q and r to two arrays of columns and 
+    rows, without a Tuple per tile.
+    
 hex_to_pixel(qrs:object|tuple|HexCoords, tile_width:int=64, tile_height:int=64, 
              return_obj_type:str="Tuple") -> tuple|RectCoords|list|dict:
     Converts cube coordinates to pixel coordinates.
     
+sync_xy(obj_grp:list|set, tile_width:int=64, tile_height:int=64, 
+        offset:object|tuple|RectCoords=(0, 0), layout:HexLayout=None) -> None:
+    Sets the x and y attributes of every Object in obj_grp to the pixel 
+    coordinates of its q, r and s attributes, validating all Objects first.
+    
 pixel_to_hex(xy:object|tuple|RectCoords, tile_width:int=64, tile_height:int=64,
              return_obj_type:str="Tuple") -> tuple|HexCoords|list|dict:
     Converts pixel coordinates to cube coordinates.
     
+pick_hex(xy:object|tuple|RectCoords, tile_width:int=64, tile_height:int=64,
+         return_obj_type:str="Tuple") -> tuple|HexCoords|list|dict:
+    Returns the cube coordinates of the hexagon containing the pixel xy, 
+    looked up in a periodic label raster precomputed per tile size.
+    
+pick_hex_batch(xys:list|tuple, tile_width:int=64, tile_height:int=64) -> list:
+    Returns a List containing the cube coordinates of the hexagon containing 
+    each pixel in xys.
+    
+pick_raster(tile_width:int=64, tile_height:int=64) -> tuple:
+    Returns the cached periodic label raster used by pick_hex for a tile size.
+    
+in_rect(rect:object|tuple, tile_width:int=64, tile_height:int=64, 
+        return_obj_type:str="Tuple", clip_coords:set|None=None) -> generator:
+    Generator yielding the cube coordinates of every hexagon overlapping a 
+    rectangle in pixel coordinates, row by row from top to bottom.
+    
 neighbors(qrs:object|tuple|HexCoords) -> set|dict:
     Return a Set or Dictionary of coordinates of neighboring hexagons.
     
 distance(obj_a:object|tuple|HexCoords, obj_b:object|tuple|HexCoords) -> int|float:
     Returns distance from one Object to another in a cube coordinate system.
     
-in_range(obj:object|tuple|HexCoords, n:int) -> set:
+in_range(obj:object|tuple|HexCoords, n:int, return_obj_type:str="Tuple", 
+         clip_coords:set|None=None) -> set:
     Returns a Set containing the cube coordinates of every hexagon in 
-    distance n from obj.
+    distance n from obj, optionally clipped to clip_coords.
+    
+range_offsets(n:int) -> tuple:
+    Returns a cached Tuple containing the offsets of every hexagon within 
+    distance n from (0, 0, 0).
+    
+ring(center:object|tuple|HexCoords, k:int, return_obj_type:str="Tuple") -> generator:
+    Generator yielding the cube coordinates of every hexagon in exactly 
+    distance k from center.
     
-line_draw(obj_a:object|tuple|HexCoords, obj_b:object|tuple|HexCoords, return_obj_type:str="Tuple") -> tuple:
+spiral(center:object|tuple|HexCoords, max_k:int, return_obj_type:str="Tuple") -> generator:
+    Generator yielding the cube coordinates of every hexagon within distance 
+    max_k from center, in order of increasing distance.
+    
+line_draw(obj_a:object|tuple|HexCoords, obj_b:object|tuple|HexCoords, 
+          return_obj_type:str="Tuple", nudge:bool=False) -> tuple:
     Draws a line from one hexagon to another, returns a Tuple containing 
     the hexagons with the center closest to the line.
     
+field_of_view(origin:object|tuple|HexCoords, radius:int, blockers:set|dict|Callable, 
+              return_obj_type:str="Tuple") -> set:
+    Returns a Set containing the cube coordinates of every hexagon within 
+    radius of origin, that can be seen from origin, using symmetric shadowcasting.
+    
+field_of_view_batch(origins:list|set, radius:int, blockers:set|dict|Callable) -> dict:
+    Field of view for many observers sharing one blocker map, returns a 
+    Dictionary mapping each origin to its visible Set.
+    
 dist_lim_flood_fill(start_obj:object|tuple|HexCoords, n:int, obj_grp:list|set, 
                     movement_var:str="movement_cost") -> set:
     All cube coordinates within n distance from an Object, factoring in movement_var 
     (variable if -1 blocks object traversability). Supports movement cost different
     than 1.
 
+load_tilemap(source:str|os.PathLike|object, file_format:str=None, progress:Callable=None, 
+             progress_every:int=4096) -> GraphMatrix:
+    Streams the tiles of a CSV, JSON Lines or binary tilemap file into a 
+    GraphMatrix record by record, reporting progress.
+
+profiling_targets() -> list:
+    Returns the names of all functions and methods enable_profiling can wrap, classmethods and constructors included.
+
+enable_profiling(names:list|tuple|set=None) -> None:
+    Wraps the public functions and methods, or the ones in names, with call 
+    counters and cumulative timers, toggled at runtime.
+
+disable_profiling() -> None:
+    Restores the original functions and methods, the counters are kept.
+
+profiling_enabled() -> bool:
+    Returns True while functions are wrapped by enable_profiling.
+
+reset_profiling() -> None:
+    Sets all call counters and timers back to zero.
+
+profiling_stats() -> dict:
+    Returns calls, cumulative seconds and seconds per call of every profiled 
+    function called at least once.
+
+profiling_text(path:str|os.PathLike=None) -> str:
+    Returns the counters in the Prometheus text exposition format, optionally 
+    writing them to path.
+
+TileSnapshot.get(self, qrs:tuple, attribute:str, default:int|float=None) -> int|float:
+    Return the value of attribute for coordinates qrs, or default if qrs is 
+    not part of the snapshot.
+
+TileSnapshot.memory_footprint(self) -> dict:
+    Return the deep size in bytes of the arrays and the index.
+
+SearchStats.reset(self) -> None:
+    Set all counters back to zero.
+    
+SearchStats.merge(self, other:SearchStats) -> None:
+    Add the counters of other to the counters of self.
+    
+SearchStats.as_dict(self) -> dict:
+    Return the counters as a Dictionary.
+    
+SearchStats.shortcut_rate(self) -> float:
+    Return the share of searches answered by the line between start and goal.
+
+SearchTrace.expansions(self) -> generator:
+    Yield (order, (q, r, s), g, f) for each expansion, in order.
+    
+SearchTrace.to_jsonl(self, path:str|os.PathLike|object) -> None:
+    Write the trace as JSON Lines to a path or a text file.
+    
+SearchTrace.heatmap(self, tile_width:int=64, tile_height:int=64, value:str="order") -> list:
+    Return (x, y, intensity) of every expanded coordinate for rendering.
+
+GraphMatrix.from_cost_grid(cls, grid:list|tuple|array|memoryview, offset:str="even-q", width:int=None) -> GraphMatrix:
+    Create a GraphMatrix directly from a dense two-dimensional grid of 
+    movement costs in offset coordinates, without Objects per tile.
+
 GraphMatrix.update_entry(self, from_coord:object|tuple|HexCoords, to_coord:object|tuple|HexCoords, movement_cost:int|float) -> None:  
     Add or update a one-directional entry in the adjacency matrix.
     
@@ -175,9 +373,99 @@ GraphMatrix.connected(self, from_coord:object|tuple|HexCoords) -> set:
 GraphMatrix.get_movement_cost(self, from_coord:object|tuple|HexCoords, to_coord:object|tuple|HexCoords) -> int|float:
     Get the movement cost from one Object or coordinate to another.
 
+GraphMatrix.reset_stats(self) -> None:
+    Set the aggregated search counters in stats back to zero.
+
 GraphMatrix.a_star_algorithm(start:object|tuple|HexCoords, goal:object|tuple|HexCoords, 
-                             test_accessibility:bool=False) -> list:
-    Modified version of Dijkstra’s Algorithm that is optimized for a single destination. It prioritizes paths that seem to be leading closer to a goal.
+                             test_accessibility:bool=False, return_obj_type:str="Tuple", 
+                             stats:SearchStats=None, trace:SearchTrace=None, 
+                             cost_bound:int=None, line_shortcut:bool=True) -> list:
+    Modified version of Dijkstra’s Algorithm that is optimized for a single destination. It prioritizes paths that seem to be leading closer to a goal. 
+    The frontier is a bucket queue for Integer movement costs up to bucket_limit, else a binary heap.
+    Returns the line between start and goal without searching, if its steps all cost the lowest movement cost.
+    
+GraphMatrix.a_star_nearest(start:object|tuple|HexCoords, goals:list|set|tuple, 
+                           test_accessibility:bool=False, return_obj_type:str="Tuple", 
+                           stats:SearchStats=None, trace:SearchTrace=None, 
+                           cost_bound:int=None) -> tuple:
+    A* search to the nearest of several goals, returning the goal reached and the path to it.
+    
+GraphMatrix.build_hierarchy(self, witness_limit:int=64) -> ContractionHierarchy:
+    Preprocess the graph into a contraction hierarchy, stored as hierarchy until the graph changes.
+    
+GraphMatrix.hierarchy_path(start:object|tuple|HexCoords, goal:object|tuple|HexCoords, 
+                           return_obj_type:str="Tuple", stats:SearchStats=None) -> list:
+    Shortest path from start to goal, through hierarchy if there is one, else a_star_algorithm.
+    
+GraphMatrix.memory_footprint(self) -> dict:
+    Return the deep size in bytes of matrix_dict, matrix_coords and stats.
+    
+ContractionHierarchy.from_graph(cls, graph:GraphMatrix, witness_limit:int=64) -> ContractionHierarchy:
+    Contract all tiles of graph.
+    
+ContractionHierarchy.shortest_path(self, start:object|tuple|HexCoords, goal:object|tuple|HexCoords) -> tuple:
+    Return (path_cost, path) of a shortest path, None if there is none.
+    
+ContractionHierarchy.to_json(self, path:str|os.PathLike|object) -> None:
+    Write the hierarchy as JSON.
+    
+ContractionHierarchy.from_json(cls, path:str|os.PathLike|object) -> ContractionHierarchy:
+    Read a hierarchy written by to_json.
+    
+ContractionHierarchy.memory_footprint(self) -> dict:
+    Return the deep size in bytes of the tiles, ranks, edges and up edges.
+    
+LineOfSight.can_see(self, obj_a:object|tuple|HexCoords, obj_b:object|tuple|HexCoords) -> bool:
+    Returns True if no blocking hexagon lies on the line between obj_a and obj_b.
+    
+LineOfSight.set_blocked(self, qrs:object|tuple|HexCoords, blocked:bool=True) -> None:
+    Set the blocking state of a hexagon and invalidate the affected cached pairs.
+    
+LineOfSight.clear(self) -> None:
+    Remove all cached pairs.
+    
+LineOfSight.memory_footprint(self) -> dict:
+    Return the deep size in bytes of blockers, cache and reverse_index.
+    
+HexSpatialHash.insert(self, obj:object, qrs:object|tuple|HexCoords=None) -> None:
+    Add obj to the index, at qrs or at the coordinates of obj.
+    
+HexSpatialHash.move(self, obj:object, qrs:object|tuple|HexCoords) -> None:
+    Move an indexed obj to qrs.
+    
+HexSpatialHash.remove(self, obj:object) -> None:
+    Remove obj from the index.
+    
+HexSpatialHash.objects_at(self, qrs:object|tuple|HexCoords) -> list:
+    Return a List of all Objects located on qrs.
+    
+HexSpatialHash.objects_in_range(self, center:object|tuple|HexCoords, n:int) -> list:
+    Return a List of all Objects within distance n from center.
+    
+HexSpatialHash.k_nearest(self, center:object|tuple|HexCoords, k:int, predicate:Callable=None, 
+                         max_radius:int=None) -> list:
+    Return a List of up to k Objects nearest to center, ordered by distance.
+    
+HexSpatialHash.memory_footprint(self) -> dict:
+    Return the deep size in bytes of cells and positions.
+    
+HexLayout.to_pixel(self, qrs:object|tuple|HexCoords, return_obj_type:str="Tuple") -> tuple|RectCoords|list|dict:
+    Converts cube coordinates to pixel coordinates, identical to hex_to_pixel plus origin.
+    
+HexLayout.to_hex(self, xy:object|tuple|RectCoords, return_obj_type:str="Tuple") -> tuple|HexCoords|list|dict:
+    Returns the cube coordinates of the hexagon containing pixel xy, identical to pick_hex minus origin.
+    
+HexLayout.to_pixel_batch(self, qrs_lst:list|tuple) -> list:
+    Converts an Iterable of (q, r, s) Tuples to a List of (x, y) Tuples.
+    
+HexLayout.to_hex_batch(self, xy_lst:list|tuple) -> list:
+    Converts an Iterable of (x, y) Tuples to a List of (q, r, s) Tuples.
+    
+HexLayout.clear_cache(self) -> None:
+    Remove all cached pixel positions.
+    
+HexLayout.memory_footprint(self) -> dict:
+    Return the deep size in bytes of the cache and the pick raster.
     
 
 @author: Maximilian Hauser  
@@ -195,7 +483,17 @@ https://numpydoc.readthedocs.io/en/latest/format.html
 
 # import section ------------------------------------------------------------ #
 from collections import namedtuple
-from math import degrees, atan2, pi
+from collections.abc import Callable
+from array import array
+from functools import lru_cache, wraps
+from heapq import heappush, heappop
+from math import degrees, atan2, pi, floor, ceil
+import csv
+import json
+import os
+import struct
+import sys
+from time import perf_counter
 
 
 # custom datatypes to ensure constraints ------------------------------------ #
@@ -263,6 +561,455 @@ class HexCoords(namedtuple("HexCoords", "q r s")):
         return super().__new__(cls, q, r, s)
     
     
+# TileSnapshot extracting Object attributes once into arrays ---------------- #
+class TileSnapshot:
+    """
+    Creates a TileSnapshot object, extracting the q, r and s coordinates and 
+    selected numerical attributes of all Objects in tile_grp once, into 
+    parallel arrays (struct of arrays), plus a Dictionary mapping coordinates 
+    to rows. Can be passed instead of tile_grp or obj_grp to GraphMatrix and 
+    dist_lim_flood_fill, so the attributes of the Objects are accessed once 
+    per load, instead of once per query.
+        
+    Parameters:
+    -----------
+    tile_grp : List | Set | SpriteGroup(Pygame-CE)
+        A container containing Objects having q, r and s attributes and the 
+        selected attributes, the values being Integers or Floats. The 
+        coordinates need to adhere to the zero constraint.
+        
+    attributes : Tuple | List, optional
+        Names of the attributes to extract, defaults to ("movement_cost",).
+        
+    Attributes:
+    -----------
+    q, r, s : array
+        The coordinates of each row, of typecode "q" (signed Integer) if all 
+        values are Integers, else "d" (Float).
+        
+    columns : Dictionary
+        Dictionary mapping each attribute name to an array of its values, one 
+        per row, typecode as for q, r and s.
+        
+    index : Dictionary
+        Dictionary mapping the (q, r, s) Tuple of each row to its row number, 
+        for duplicate coordinates to the last row.
+        
+    Methods:
+    --------
+    get(self, qrs:tuple, attribute:str, default:int|float=None) -> int|float
+        Return the value of attribute for coordinates qrs, or default if qrs 
+        is not part of the snapshot.
+        
+    memory_footprint(self) -> dict
+        Return the deep size in bytes of the arrays and the index.
+        
+    Raises:
+    -------
+    TypeError: 
+        If q, r, s or one of the attributes is not an Integer or a Float.
+        
+    AttributeError: 
+        If an Object is missing q, r, s or one of the attributes.
+        
+    ConstraintViolation: 
+        If the q+r+s=0 constraint is violated.
+        
+    Returns:
+    --------
+    TileSnapshot(object): 
+        Coordinates and attributes of tile_grp in arrays.
+    """
+    def __init__(self, tile_grp:list|set, attributes:tuple|list=("movement_cost",)):
+        rows_q = list()
+        rows_r = list()
+        rows_s = list()
+        values = {attribute:list() for attribute in attributes}
+        self.index = dict()
+        
+        for tile in tile_grp:
+            qrs = container_or_object(tile, 3)
+            self.index[qrs] = len(rows_q)
+            rows_q.append(qrs[0])
+            rows_r.append(qrs[1])
+            rows_s.append(qrs[2])
+            for attribute in attributes:
+                value = getattr(tile, attribute)
+                if not isinstance(value, int|float):
+                    raise TypeError(attribute + " of " + str(tile) + " needs to be of type Integer or Float.")
+                values[attribute].append(value)
+                
+        self.q = _numeric_array(rows_q)
+        self.r = _numeric_array(rows_r)
+        self.s = _numeric_array(rows_s)
+        self.columns = {attribute:_numeric_array(values[attribute]) for attribute in attributes}
+        
+        
+    def __len__(self) -> int:
+        return len(self.q)
+    
+    
+    def get(self, qrs:tuple, attribute:str, default:int|float=None) -> int|float:
+        """
+        Return the value of attribute for coordinates qrs, or default if qrs 
+        is not part of the snapshot. Raises a KeyError if attribute was not 
+        extracted.
+        """
+        row = self.index.get(qrs)
+        if row is None:
+            return default
+        return self.columns[attribute][row]
+    
+    
+    def memory_footprint(self) -> dict:
+        """
+        Return the deep size in bytes of the coordinate arrays, the attribute 
+        columns and the index, and their total, see deep_sizeof.
+        """
+        return _footprint({"coordinates":(self.q, self.r, self.s), "columns":self.columns, 
+                           "index":self.index})
+    
+    
+# SearchStats for instrumenting graph searches ------------------------------ #
+class SearchStats:
+    """
+    Creates a SearchStats object, holding the counters of a search on a 
+    GraphMatrix, if passed to it, or aggregating the counters of all searches 
+    on a GraphMatrix, as its stats attribute.
+    
+    Attributes:
+    -----------
+    searches : Integer
+        Number of searches recorded.
+        
+    paths_found : Integer
+        Number of searches, that reached their goal.
+        
+    nodes_expanded : Integer
+        Number of coordinates taken from the frontier and expanded.
+        
+    nodes_pushed : Integer
+        Number of entries added to the frontier, start included.
+        
+    frontier_max : Integer
+        Highest number of entries in the frontier at once, the maximum over 
+        all searches, if aggregated.
+        
+    path_cost : Integer | Float | None
+        Movement cost of the path found, the sum over all paths found, if 
+        aggregated. None if no path was found.
+        
+    shortcuts : Integer
+        Number of searches answered by the line between start and goal, 
+        without running A*.
+        
+    elapsed : Float
+        Seconds spent searching, the sum over all searches, if aggregated.
+        
+    Methods:
+    --------
+    reset(self) -> None
+        Set all counters back to zero.
+        
+    merge(self, other:SearchStats) -> None
+        Add the counters of other to the counters of self.
+        
+    as_dict(self) -> dict
+        Return the counters as a Dictionary.
+        
+    shortcut_rate(self) -> float
+        Return the share of searches answered by the line between start and 
+        goal.
+    
+    Returns:
+    --------
+    SearchStats(object): 
+        Counters, all set to zero.
+    """
+    __slots__ = ("searches", "paths_found", "nodes_expanded", "nodes_pushed", 
+                 "frontier_max", "path_cost", "shortcuts", "elapsed")
+    
+    def __init__(self):
+        self.reset()
+        
+        
+    def __repr__(self) -> str:
+        return "SearchStats(" + ", ".join(key + "=" + repr(value) for key, value in self.as_dict().items()) + ")"
+    
+    
+    def reset(self) -> None:
+        """
+        Set all counters back to zero.
+        """
+        self.searches = 0
+        self.paths_found = 0
+        self.nodes_expanded = 0
+        self.nodes_pushed = 0
+        self.frontier_max = 0
+        self.path_cost = None
+        self.shortcuts = 0
+        self.elapsed = 0.0
+        
+        
+    def merge(self, other:"SearchStats") -> None:
+        """
+        Add the counters of other to the counters of self, frontier_max 
+        being the maximum of both.
+        """
+        self.searches += other.searches
+        self.paths_found += other.paths_found
+        self.nodes_expanded += other.nodes_expanded
+        self.nodes_pushed += other.nodes_pushed
+        self.frontier_max = max(self.frontier_max, other.frontier_max)
+        if other.path_cost is not None:
+            self.path_cost = other.path_cost if self.path_cost is None else self.path_cost + other.path_cost
+        self.shortcuts += other.shortcuts
+        self.elapsed += other.elapsed
+        
+        
+    def as_dict(self) -> dict:
+        """
+        Return the counters as a Dictionary.
+        """
+        return {key:getattr(self, key) for key in self.__slots__}
+    
+    
+    def shortcut_rate(self) -> float:
+        """
+        Return the share of searches answered by the line between start and 
+        goal, without running A*, 0.0 if there were no searches.
+        """
+        return self.shortcuts / self.searches if self.searches else 0.0
+    
+    
+# SearchTrace for recording the search space of graph searches -------------- #
+class SearchTrace:
+    """
+    Creates a SearchTrace object, recording which coordinates a search on a 
+    GraphMatrix expanded, in which order and with which g (cost so far) and 
+    f (g plus heuristic) values, as well as the frontier left when the search 
+    ended, if passed to the search. The records are stored in arrays, one 
+    value per expansion, to keep traces of large searches compact.
+    
+    Attributes:
+    -----------
+    start, goal : Tuple
+        Coordinates of the start and goal of the search traced.
+        
+    found : Boolean
+        True if the search reached goal.
+        
+    q, r, s, g, f : array
+        Coordinates and g and f value of each expansion, in expansion order, 
+        of typecode "q" (signed Integer) if all values are Integers, else 
+        "d" (Float). A coordinate can be expanded more than once.
+        
+    frontier_q, frontier_r, frontier_s, frontier_f : array
+        Coordinates and f value of each entry left in the frontier.
+        
+    Methods:
+    --------
+    expansions(self) -> generator
+        Yield (order, (q, r, s), g, f) for each expansion.
+        
+    to_jsonl(self, path:str|os.PathLike|object) -> None
+        Write the trace as JSON Lines to a path or a text file.
+        
+    heatmap(self, tile_width:int=64, tile_height:int=64, value:str="order") -> list
+        Return (x, y, intensity) of every expanded coordinate for rendering.
+        
+    Returns:
+    --------
+    SearchTrace(object): 
+        Empty trace, filled by the search it is passed to.
+    """
+    def __init__(self):
+        self._begin(None, None)
+        
+        
+    def __len__(self) -> int:
+        return len(self.q)
+    
+    
+    def _begin(self, start:tuple|None, goal:tuple|None) -> None:
+        """
+        Empty the trace for a new search from start to goal.
+        """
+        self.start = start
+        self.goal = goal
+        self.found = False
+        self._expanded = list()
+        for name in ("q", "r", "s", "g", "f", "frontier_q", "frontier_r", "frontier_s", "frontier_f"):
+            setattr(self, name, array("q"))
+            
+            
+    def _expand(self, qrs:tuple, g:int|float, f:int|float) -> None:
+        """
+        Record the expansion of qrs.
+        """
+        self._expanded.append((qrs[0], qrs[1], qrs[2], g, f))
+        
+        
+    def _finish(self, frontier:list, found:bool) -> None:
+        """
+        Move the recorded expansions and the (qrs, f) entries of frontier 
+        into arrays.
+        """
+        self.found = found
+        for i, name in enumerate(("q", "r", "s", "g", "f")):
+            setattr(self, name, _numeric_array([row[i] for row in self._expanded]))
+        for i, name in enumerate(("frontier_q", "frontier_r", "frontier_s")):
+            setattr(self, name, _numeric_array([entry[0][i] for entry in frontier]))
+        self.frontier_f = _numeric_array([entry[1] for entry in frontier])
+        self._expanded = list()
+        
+        
+    def expansions(self):
+        """
+        Yield (order, (q, r, s), g, f) for each expansion, in order.
+        """
+        for i in range(len(self.q)):
+            yield (i, (self.q[i], self.r[i], self.s[i]), self.g[i], self.f[i])
+            
+            
+    def to_jsonl(self, path:str|os.PathLike|object) -> None:
+        """
+        Write the trace as JSON Lines to path, or to a file opened in text 
+        mode. The first line describes the search 
+        {"type":"search", "start":[q, r, s], "goal":[q, r, s], "found":bool, 
+        "expanded":int, "frontier":int}, followed by one line per expansion 
+        {"type":"expand", "order":int, "q", "r", "s", "g", "f"} and one line 
+        per frontier entry {"type":"frontier", "q", "r", "s", "f"}.
+        """
+        if isinstance(path, str|os.PathLike):
+            with open(path, "w", encoding="utf-8") as file:
+                self.to_jsonl(file)
+            return
+        
+        path.write(json.dumps({"type":"search", "start":self.start and list(self.start), 
+                               "goal":self.goal and list(self.goal), "found":self.found, 
+                               "expanded":len(self.q), "frontier":len(self.frontier_q)}) + "\n")
+        for (order, (q, r, s), g, f) in self.expansions():
+            path.write(json.dumps({"type":"expand", "order":order, "q":q, "r":r, "s":s, "g":g, "f":f}) + "\n")
+        for i in range(len(self.frontier_q)):
+            path.write(json.dumps({"type":"frontier", "q":self.frontier_q[i], "r":self.frontier_r[i], 
+                                   "s":self.frontier_s[i], "f":self.frontier_f[i]}) + "\n")
+            
+            
+    def heatmap(self, tile_width:int=64, tile_height:int=64, value:str="order") -> list:
+        """
+        Return a List of (x, y, intensity) for every expanded coordinate, x and 
+        y being its pixel coordinates as returned by hex_to_pixel and 
+        intensity between 0 and 1. value selects what the intensity shows: 
+        'order' the first expansion, early expansions being 0, 'count' the 
+        number of expansions, 'g' or 'f' the lowest g or f value, each 
+        normalised by its maximum. Raises a ValueError for any other value.
+        """
+        if value not in ("order", "count", "g", "f"):
+            raise ValueError("value needs to be 'order', 'count', 'g' or 'f'.")
+        cells = dict()
+        for (order, qrs, g, f) in self.expansions():
+            if value == "count":
+                cells[qrs] = cells.get(qrs, 0) + 1
+            elif qrs not in cells:
+                cells[qrs] = {"order":order, "g":g, "f":f}[value]
+            elif value != "order":
+                cells[qrs] = min(cells[qrs], g if value == "g" else f)
+                
+        if not cells:
+            return list()
+        low = 0 if value == "count" else min(cells.values())
+        span = max(cells.values()) - low
+        return [hex_to_pixel(qrs, tile_width, tile_height) + ((amount - low) / span if span else 1.0,) 
+                for qrs, amount in cells.items()]
+    
+    
+# priority queues for the frontier of graph searches ------------------------ #
+class _BucketQueue:
+    """
+    Bucket queue (Dial's algorithm) for Integer priorities, that never drop 
+    below the last priority popped and never exceed it by more than span. 
+    Push and pop are O(1), span + 1 Lists being reused circularly. Items of 
+    equal priority are popped last in, first out.
+    """
+    __slots__ = ("buckets", "size", "current", "length")
+    
+    def __init__(self, span:int):
+        self.size = span + 1
+        self.buckets = [list() for _ in range(self.size)]
+        self.current = None
+        self.length = 0
+        
+        
+    def __len__(self) -> int:
+        return self.length
+    
+    
+    def push(self, priority:int, item:object) -> None:
+        if self.current is None:
+            self.current = priority
+        elif priority < self.current:
+            priority = self.current
+        elif priority - self.current >= self.size:
+            raise ValueError("A movement cost exceeds the cost bound of the search.")
+        self.buckets[priority % self.size].append(item)
+        self.length += 1
+        
+        
+    def pop(self) -> tuple:
+        while True:
+            bucket = self.buckets[self.current % self.size]
+            if bucket:
+                self.length -= 1
+                return (self.current, bucket.pop())
+            self.current += 1
+            
+            
+    def entries(self) -> list:
+        """
+        Return (priority, item) of all items, in the order they would be popped.
+        """
+        entries = list()
+        if self.current is not None:
+            for priority in range(self.current, self.current + self.size):
+                entries.extend((priority, item) for item in reversed(self.buckets[priority % self.size]))
+        return entries
+    
+    
+class _HeapQueue:
+    """
+    Binary heap priority queue for any comparable priorities, with O(log n) 
+    push and pop. Items of equal priority are popped last in, first out, 
+    like in _BucketQueue.
+    """
+    __slots__ = ("heap", "count")
+    
+    def __init__(self):
+        self.heap = list()
+        self.count = 0
+        
+        
+    def __len__(self) -> int:
+        return len(self.heap)
+    
+    
+    def push(self, priority:int|float, item:object) -> None:
+        self.count += 1
+        heappush(self.heap, (priority, -self.count, item))
+        
+        
+    def pop(self) -> tuple:
+        (priority, _, item) = heappop(self.heap)
+        return (priority, item)
+    
+    
+    def entries(self) -> list:
+        """
+        Return (priority, item) of all items, in the order they would be popped.
+        """
+        return [(priority, item) for (priority, _, item) in sorted(self.heap)]
+    
+    
 # GraphMatrix for storing weighted, directed graphs ------------------------- #
 class GraphMatrix:
     """
@@ -273,11 +1020,12 @@ class GraphMatrix:
         
     Parameters:
     -----------
-    tile_grp : List | Set | SpriteGroup(Pygame-CE)
+    tile_grp : List | Set | SpriteGroup(Pygame-CE) | TileSnapshot
         A container containing Objects adjacent to each other in a cube 
         coordinate system (tiles in tilemap). The hexagonal coordinates need to 
         be stored in q, r and s coordinates and they must adhere to the zero 
-        constraint.
+        constraint. Or a TileSnapshot of such a container, having extracted 
+        movement_cost, whose movement costs are all Floats if one of them is.
         
     Attributes:
     -----------
@@ -289,8 +1037,29 @@ class GraphMatrix:
     matrix_coords : Set
         Set containing all coordinates, connected to another coordinate.
     
+    collect_stats : Boolean
+        If True, the counters of every search are added to stats. False by 
+        default, so searches only count in local variables.
+        
+    stats : SearchStats
+        Counters aggregated over all searches, while collect_stats is True.
+        
+    bucket_limit : Integer
+        Highest movement cost, up to which searches use a bucket queue, if 
+        all movement costs are Integers of at least 1, defaults to 1024. 
+        Higher or other movement costs use a binary heap.
+        
+    hierarchy : ContractionHierarchy | None
+        Set by build_hierarchy, or assigned one loaded by 
+        ContractionHierarchy.from_json, and used by hierarchy_path. Discarded, 
+        set to None, by update_entry, del_entry and new tiles.
+        
     Methods:
     --------
+    from_cost_grid(cls, grid:list|tuple|array|memoryview, offset:str="even-q", width:int=None) -> GraphMatrix
+        Create a GraphMatrix directly from a dense two-dimensional grid of 
+        movement costs in offset coordinates, without Objects per tile.
+        
     update_entry(self, from_coord:object|tuple|HexCoords, to_coord:object|tuple|HexCoords, movement_cost:int|float) -> None
         Add or update a one-directional entry in the adjacency matrix.
         
@@ -303,9 +1072,23 @@ class GraphMatrix:
     get_movement_cost(self, from_coord:object|tuple|HexCoords, to_coord:object|tuple|HexCoords) -> int|float
         Get the movement cost from one Object or coordinate to another.
         
+    reset_stats(self) -> None
+        Set the aggregated search counters in stats back to zero.
+        
     a_star_algorithm(self, start:object|tuple|HexCoords, goal:object|tuple|HexCoords) -> list
         Modified version of Dijkstra’s Algorithm that is optimized for a single destination. It prioritizes paths that seem to be leading closer to a goal.
         
+    a_star_nearest(self, start:object|tuple|HexCoords, goals:list|set|tuple) -> tuple
+        A* search to the nearest of several goals, returning the goal reached and the path to it.
+        
+    build_hierarchy(self, witness_limit:int=64) -> ContractionHierarchy
+        Preprocess the graph into a contraction hierarchy, stored as hierarchy.
+        
+    hierarchy_path(self, start:object|tuple|HexCoords, goal:object|tuple|HexCoords) -> list
+        Shortest path from start to goal, through hierarchy if there is one, else a_star_algorithm.
+        
+    memory_footprint(self) -> dict
+        Return the deep size in bytes of matrix_dict, matrix_coords and stats.
         
     Raises:
     -------
@@ -324,45 +1107,160 @@ class GraphMatrix:
     GraphMatrix(object): 
         Two-dimensional, directed, weighted graph, stored in a Dictionary.
     """
-    def __init__(self, tile_grp:list|set):
+    bucket_limit = 1024
+    
+    def __init__(self, tile_grp:list|set|TileSnapshot):
         # contains all directional movement costs --------------------------- #
         self.matrix_dict = dict()
         # contains all coordinates connected to another coordinate ---------- #
         self.matrix_coords = set()
-        
-        # creating a set with all connections ------------------------------- #
-        edges = set()
-        
-        for tile in tile_grp:
-            tile_qrs = container_or_object(tile, 3)
-            t_nbors_tuple = neighbors((tile_qrs[0], tile_qrs[1], tile_qrs[2]))
-            for nbor in t_nbors_tuple:
-                for t in tile_grp:
-                    t_coords = container_or_object(t, 3)
-                    if t_coords == nbor:
-                        edges.add((tile_qrs, nbor, tile.movement_cost, t.movement_cost))
-                        
-        for edge in edges:
-            # movement_cost defined by the tile moved onto ------------------ #
-            # movement_cost if possible from edge[0] to edge[1] ------------- #
-            if edge[0] in self.matrix_dict.keys():
-                self.matrix_dict[edge[0]].update({edge[1]:edge[3]})
-            else:
-                self.matrix_dict.update({edge[0]:{edge[1]:edge[3]}})
-            # movement_cost if possible from edge[1] to edge[0] ------------- #
-            if edge[1] in self.matrix_dict.keys():
-                self.matrix_dict[edge[1]].update({edge[0]:edge[2]})
-            else:
-                self.matrix_dict.update({edge[1]:{edge[0]:edge[2]}})
-            # add edge coordinats to set connected coordinates -------------- #
-            if edge[2] >= 0:
-                self.matrix_coords.add(edge[0])
-            if edge[3] >= 0:
-                self.matrix_coords.add(edge[1])
+        # aggregated search counters, only updated if collect_stats --------- #
+        self.collect_stats = False
+        self.stats = SearchStats()
+        # highest Integer movement cost, None until known, 0 if not Integer - #
+        self._cost_bound = None
+        self._min_cost = None
+        # contraction hierarchy, discarded when the graph changes ----------- #
+        self.hierarchy = None
+        
+        # movement cost of each tile, attributes are accessed once ---------- #
+        if isinstance(tile_grp, TileSnapshot):
+            costs = tile_grp.columns["movement_cost"]
+            tile_costs = {qrs:costs[row] for qrs, row in tile_grp.index.items()}
+        else:
+            tile_costs = {container_or_object(tile, 3):tile.movement_cost for tile in tile_grp}
+        
+        # movement_cost defined by the tile moved onto ---------------------- #
+        for tile_qrs, tile_cost in tile_costs.items():
+            for nbor in neighbors(tile_qrs):
+                if nbor in tile_costs:
+                    if tile_qrs in self.matrix_dict:
+                        self.matrix_dict[tile_qrs][nbor] = tile_costs[nbor]
+                    else:
+                        self.matrix_dict[tile_qrs] = {nbor:tile_costs[nbor]}
+                    # add connected coordinates to set ---------------------- #
+                    if tile_cost >= 0:
+                        self.matrix_coords.add(tile_qrs)
+
                                       
-        
-    def update_entry(self, from_coord:object|tuple|HexCoords, 
-                     to_coord:object|tuple|HexCoords, movement_cost:int|float) -> None:
+    
+    @classmethod
+    def from_cost_grid(cls, grid:list|tuple|array|memoryview, offset:str="even-q", 
+                       width:int=None) -> "GraphMatrix":
+        """
+        Create a GraphMatrix directly from a dense two-dimensional grid of 
+        movement costs, stored row by row in offset coordinates (flat top, 
+        columns along q), as used by tilemap editors. Every cell is a tile, 
+        its value being the movement cost of moving onto it, -1 marking it 
+        as not traversable, like the movement_cost of the Objects passed to 
+        GraphMatrix(tile_grp). The grid is read in a single pass, without 
+        creating an Object per tile.
+        
+        Parameters:
+        -----------
+        grid : List | Tuple | array | memoryview
+            Either a sequence of rows, each a sequence of Integers or Floats, 
+            None marking a cell without a tile. Or an Object supporting the 
+            buffer protocol, like an array or a bytes Object, either 
+            two-dimensional or one-dimensional with the rows one after 
+            another, in which case width needs to be passed.
+            
+        offset : String, optional
+            'even-q' if even columns are shoved down by half a tile, 'odd-q' 
+            if odd columns are, defaults to 'even-q'. Cell (column, row) has 
+            the cube coordinates q = column, r = row - (column + (column&1)) // 2 
+            for 'even-q' and r = row - (column - (column&1)) // 2 for 'odd-q'.
+            
+        width : Integer, optional
+            Number of columns of a one-dimensional buffer.
+            
+        Raises:
+        -------
+        TypeError: 
+            If a cell is neither an Integer, a Float nor None. If grid is a 
+            one-dimensional buffer and width is not an Integer.
+            
+        ValueError: 
+            If offset is neither 'even-q' nor 'odd-q'. If width is not 
+            positive or the length of a one-dimensional buffer is not a 
+            multiple of width.
+            
+        Returns:
+        --------
+        GraphMatrix(object): 
+            Two-dimensional, directed, weighted graph, stored in a Dictionary.
+        """
+        shift = 1 if _even_offset(offset) else -1
+        
+        # split buffers into rows, values of buffers need no type check ----- #
+        try:
+            view = memoryview(grid)
+        except TypeError:
+            rows = grid
+            validate = True
+        else:
+            if view.ndim == 2:
+                width = view.shape[1]
+                view = view.cast("B").cast(view.format)
+            if not isinstance(width, int) or isinstance(width, bool):
+                raise TypeError("width needs to be an Integer for a one-dimensional buffer.")
+            if width <= 0 or len(view) % width:
+                raise ValueError("width needs to be positive and divide the length of grid.")
+            rows = (view[i:i + width] for i in range(0, len(view), width))
+            validate = False
+            
+        graph = cls(())
+        tile_costs = dict()
+        
+        for row, cells in enumerate(rows):
+            for col, cost in enumerate(cells):
+                if cost is None:
+                    continue
+                if validate and not isinstance(cost, int|float):
+                    raise TypeError("Cell (" + str(col) + ", " + str(row) + ") of grid needs to be of type Integer, Float or None.")
+                r = row - (col + shift * (col & 1)) // 2
+                graph._link_tile((col, r, -col - r), cost, tile_costs)
+                        
+        return graph
+    
+        
+    def _link_tile(self, tile:tuple, cost:int|float, tile_costs:dict) -> None:
+        """
+        Link tile in both directions with the tiles in tile_costs neighboring 
+        it, the movement cost being the one of the tile moved onto, then add 
+        tile to tile_costs. Builds a GraphMatrix one tile at a time, in any 
+        order, a later tile replacing an earlier one with equal coordinates.
+        """
+        (q, r, s) = tile
+        matrix_dict = self.matrix_dict
+        links = dict()
+        
+        for nbor in ((q + 1, r, s - 1), (q + 1, r - 1, s), (q, r - 1, s + 1), 
+                     (q - 1, r, s + 1), (q - 1, r + 1, s), (q, r + 1, s - 1)):
+            nbor_cost = tile_costs.get(nbor)
+            if nbor_cost is not None:
+                links[nbor] = nbor_cost
+                if nbor in matrix_dict:
+                    matrix_dict[nbor][tile] = cost
+                else:
+                    matrix_dict[nbor] = {tile:cost}
+                if nbor_cost >= 0:
+                    self.matrix_coords.add(nbor)
+                    
+        tile_costs[tile] = cost
+        self._cost_bound = None
+        self.hierarchy = None
+        if links:
+            matrix_dict[tile] = links
+            if cost >= 0:
+                self.matrix_coords.add(tile)
+            else:
+                # a replaced tile, that became impassable ------------------- #
+                self.matrix_coords.discard(tile)
+                
+                
+    def update_entry(self, from_coord:object|tuple|HexCoords, 
+                     to_coord:object|tuple|HexCoords, movement_cost:int|float) -> None:
         """
         Add or update a one-directional entry in the adjacency matrix.
         """
@@ -372,6 +1270,8 @@ class GraphMatrix:
             self.matrix_dict[from_c].update({to_c:movement_cost})
         else:
             self.matrix_dict.update({from_c:{to_c:movement_cost}})
+        self._cost_bound = None
+        self.hierarchy = None
             
         # add from_c and to_c to self.matrix_coords if missing -------------- #
         if from_c not in self.matrix_coords:
@@ -394,6 +1294,7 @@ class GraphMatrix:
                 del self.matrix_dict[from_c][to_c]
         if from_c in self.matrix_dict.keys():
             del self.matrix_dict[from_c]
+        self.hierarchy = None
             
         # del from_c or to_c from self.matrix_coords if not connected anymore #
         destinations = list()
@@ -439,12 +1340,116 @@ class GraphMatrix:
         return movement_cost
     
     
+    def _scan_costs(self) -> None:
+        """
+        Memorise the highest movement cost as _cost_bound, if all movement 
+        costs of traversable entries are Integers from 1 to bucket_limit, else 
+        0, and the lowest movement cost as _min_cost, None if there is none. 
+        Scanned again after the matrix is changed by update_entry or a new tile.
+        """
+        if self._cost_bound is None:
+            bound = 0
+            lowest = None
+            integer = True
+            for edges in self.matrix_dict.values():
+                for movement_cost in edges.values():
+                    if movement_cost < 0:
+                        continue
+                    if lowest is None or movement_cost < lowest:
+                        lowest = movement_cost
+                    if movement_cost.__class__ is not int or not 1 <= movement_cost <= self.bucket_limit:
+                        integer = False
+                    elif movement_cost > bound:
+                        bound = movement_cost
+            self._cost_bound = bound if integer else 0
+            self._min_cost = lowest
+            
+            
+    def _integer_cost_bound(self) -> int:
+        """
+        Return the highest movement cost, if all movement costs of traversable 
+        entries are Integers from 1 to bucket_limit, else 0.
+        """
+        self._scan_costs()
+        return self._cost_bound
+    
+    
+    def _line_path(self, start:tuple, goal:tuple) -> list|None:
+        """
+        Return the tiles of line_draw from start to goal, if every step along 
+        it costs the lowest movement cost of the matrix, else None. No path 
+        has fewer steps than distance(start, goal) or cheaper steps, so such 
+        a line is a path of lowest cost.
+        """
+        self._scan_costs()
+        lowest = self._min_cost
+        if lowest is None:
+            return None
+        path = line_draw(start, goal)
+        matrix_dict = self.matrix_dict
+        no_edges = dict()
+        for i in range(len(path) - 1):
+            if matrix_dict.get(path[i], no_edges).get(path[i + 1], -1) != lowest:
+                return None
+        return list(path)
+    
+    
+    def memory_footprint(self) -> dict:
+        """
+        Return the deep size in bytes of the adjacency (matrix_dict), the 
+        coordinate set (matrix_coords) and the search counters (stats), and 
+        their total, see deep_sizeof. Coordinate Tuples shared by several 
+        components are counted once, for the first component holding them.
+        """
+        return _footprint({"matrix_dict":self.matrix_dict, "matrix_coords":self.matrix_coords, 
+                           "stats":self.stats})
+        
+        
+    def reset_stats(self) -> None:
+        """
+        Set the aggregated search counters in stats back to zero.
+        """
+        self.stats.reset()
+        
+        
+    def _record_search(self, stats:SearchStats|None, started:float, expanded:int, 
+                       pushed:int, frontier_max:int, path_cost:int|float|None, 
+                       shortcut:bool=False) -> None:
+        """
+        Write the counters of a finished search into stats, if passed, and add 
+        them to self.stats, if collect_stats is True.
+        """
+        if stats is None and not self.collect_stats:
+            return
+        record = SearchStats() if stats is None else stats
+        record.reset()
+        record.searches = 1
+        record.paths_found = 0 if path_cost is None else 1
+        record.nodes_expanded = expanded
+        record.nodes_pushed = pushed
+        record.frontier_max = frontier_max
+        record.path_cost = path_cost
+        record.shortcuts = 1 if shortcut else 0
+        record.elapsed = perf_counter() - started
+        if self.collect_stats:
+            self.stats.merge(record)
+            
+            
     # graph based path finding algorithms ----------------------------------- #
     def a_star_algorithm(self, start:object|tuple|HexCoords, goal:object|tuple|HexCoords, 
-                         test_accessibility:bool=False, return_obj_type:str="Tuple") -> list:
+                         test_accessibility:bool=False, return_obj_type:str="Tuple", 
+                         stats:SearchStats=None, trace:SearchTrace=None, 
+                         cost_bound:int=None, line_shortcut:bool=True) -> list:
         """
         Modified version of Dijkstra’s Algorithm that is optimized for a single 
         destination. It prioritizes paths that seem to be leading closer to a goal.
+        If all movement costs are Integers between 1 and bucket_limit, the 
+        frontier is a bucket queue (Dial's algorithm) with O(1) push and pop, 
+        else a binary heap. Whether the movement costs are Integers is checked 
+        once and memorised until the matrix is changed by update_entry.
+        Before searching, the tiles of line_draw from start to goal are 
+        checked: if every step along them costs the lowest movement cost of 
+        the matrix, no path can be cheaper and the line is returned.
         
         Parameters:
         -----------
@@ -470,6 +1475,30 @@ class GraphMatrix:
             and if 'Dict' returns the path as a list containing Dictionaries, 
             with the axis as keys. {"q":q, "r":r, "s":s}
             
+        stats : SearchStats, optional
+            If passed, reset and filled with the counters of this search.
+            
+        trace : SearchTrace, optional
+            If passed, emptied and filled with the expansion order, g and f 
+            values and final frontier of this search.
+            
+        cost_bound : Integer, optional
+            Hint, that all movement costs are Integers between 1 and 
+            cost_bound, skipping the check and using a bucket queue, whose 
+            buckets span cost_bound + 1 f values above the f value of the 
+            tile expanded last. If 0, a binary heap is used. A ValueError is 
+            raised, if a tile is pushed with an f value more than 
+            cost_bound + 1 above the one of the tile expanded, as f grows by 
+            the movement cost plus at most 1: always for a movement cost 
+            above cost_bound + 1, for cost_bound + 1 only when moving away 
+            from goal. Paths found despite higher movement costs are still 
+            of lowest cost. Float movement costs raise a TypeError.
+            
+        line_shortcut : Boolean, optional
+            If True, the default, returns the line between start and goal 
+            without searching, if it is a path of lowest cost, counted in 
+            SearchStats.shortcuts. Only for Integer coordinates.
+            
         Raises:
         -------
         TypeError: 
@@ -488,526 +1517,2186 @@ class GraphMatrix:
         """
         start = container_or_object(start, 3)
         goal = container_or_object(goal, 3)
+        started = perf_counter()
+        if trace is not None:
+            trace._begin(start, goal)
         
         # test accessibility ------------------------------------------------ #
         if test_accessibility:
             if start not in self.matrix_coords or goal not in self.matrix_coords:
+                self._record_search(stats, started, 0, 0, 0, None)
+                if trace is not None:
+                    trace._finish([], False)
+                return None
+        
+        # line between start and goal, if no path can be cheaper ------------ #
+        integer = start[0].__class__ is int and goal[0].__class__ is int
+        path = self._line_path(start, goal) if line_shortcut and integer else None
+        if path is not None:
+            self._record_search(stats, started, 0, 0, 0, self._min_cost * (len(path) - 1), True)
+            if trace is not None:
+                trace._finish([], True)
+        
+        # distance to goal as heuristic ------------------------------------- #
+        (g_q, g_r, g_s) = goal
+        def heuristic(qrs:tuple) -> int|float:
+            return max(abs(qrs[0] - g_q), abs(qrs[1] - g_r), abs(qrs[2] - g_s))
+        
+        if path is None:
+            found = self._best_first(start, {goal}, heuristic, integer, cost_bound, stats, trace, started)
+            if found is None:
                 return None
+            path = found[1]
+        
+        if return_obj_type.lower() == "tuple":
+            return path
+        if return_obj_type.lower() == "coords":
+            return [HexCoords(item[0], item[1], item[2]) for item in path]
+        if return_obj_type.lower() == "list":
+            return [[item[0], item[1], item[2]] for item in path]
+        if return_obj_type.lower() == "dict":
+            return [{"q":item[0], "r":item[1], "s":item[2]} for item in path]
+        
+        
+    def a_star_nearest(self, start:object|tuple|HexCoords, goals:list|set|tuple, 
+                       test_accessibility:bool=False, return_obj_type:str="Tuple", 
+                       stats:SearchStats=None, trace:SearchTrace=None, 
+                       cost_bound:int=None) -> tuple:
+        """
+        A* search from start to the nearest of several goals, in a single 
+        search instead of one search per goal. The heuristic is the lowest 
+        distance to any of the goals, the search stops at the first goal 
+        reached, which is the goal with the lowest path cost.
+        
+        Parameters:
+        -----------
+        start : Object | Tuple | HexCoords
+            A Tuple consisting of an Integer or Float for the q, r and s value,
+            or an Object having a q, r and s attribute, the assigned values being 
+            an Integer or Float. Needs to adhere to zero constraint.
+            
+        goals : List | Set | Tuple
+            A container containing the goals, each a Tuple consisting of an 
+            Integer or Float for the q, r and s value, or an Object having a 
+            q, r and s attribute. Needs to adhere to zero constraint.
+            
+        test_accessibility : Boolean, optional
+            If True, ignores goals not connected to other tiles and returns 
+            None if start is not connected.
+            
+        return_obj_type : String, optional
+            If 'Coords', returns goal and path as HexCoords(Namedtuple), if 
+            'Tuple' or not defined as Tuples of shape (q, r, s), if 'List' as 
+            Lists of length 3 and if 'Dict' as Dictionaries, with the axis as 
+            keys. {"q":q, "r":r, "s":s}
+            
+        stats : SearchStats, optional
+            If passed, reset and filled with the counters of this search.
+            
+        trace : SearchTrace, optional
+            If passed, emptied and filled like by a_star_algorithm, its goal 
+            being the goal reached.
+            
+        cost_bound : Integer, optional
+            Hint, that all movement costs are Integers between 1 and 
+            cost_bound, see a_star_algorithm.
+            
+        Raises:
+        -------
+        TypeError: 
+            If q, r or s is not an Integer or a Float. If a passed Tuple has
+            too many or too few individual values.
+            
+        AttributeError: 
+            If an Object is passed, but is missing the q, r or s coordinates attributes.
+            
+        ConstraintViolation: 
+            If the q+r+s=0 constraint is violated.
+        
+        Returns:
+        --------
+        (goal, path)(Tuple): The goal reached and a List containing all tiles 
+        from start to it, None if no goal can be reached.
+        """
+        start = container_or_object(start, 3)
+        goals = {container_or_object(goal, 3) for goal in goals}
+        started = perf_counter()
+        if trace is not None:
+            trace._begin(start, None)
+        
+        # test accessibility ------------------------------------------------ #
+        if test_accessibility:
+            goals = goals & self.matrix_coords if start in self.matrix_coords else set()
+        if not goals:
+            self._record_search(stats, started, 0, 0, 0, None)
+            if trace is not None:
+                trace._finish([], False)
+            return None
+        
+        # lowest distance to any goal as heuristic -------------------------- #
+        goal_list = list(goals)
+        def heuristic(qrs:tuple) -> int|float:
+            (q, r, s) = qrs
+            return min(max(abs(q - g_q), abs(r - g_r), abs(s - g_s)) for (g_q, g_r, g_s) in goal_list)
+        
+        integer = start[0].__class__ is int and all(goal[0].__class__ is int for goal in goal_list)
+        found = self._best_first(start, goals, heuristic, integer, cost_bound, stats, trace, started)
+        if found is None:
+            return None
+        (goal, path) = found
+        if trace is not None:
+            trace.goal = goal
+        
+        if return_obj_type.lower() == "tuple":
+            return (goal, path)
+        if return_obj_type.lower() == "coords":
+            return (HexCoords(goal[0], goal[1], goal[2]), [HexCoords(item[0], item[1], item[2]) for item in path])
+        if return_obj_type.lower() == "list":
+            return ([goal[0], goal[1], goal[2]], [[item[0], item[1], item[2]] for item in path])
+        if return_obj_type.lower() == "dict":
+            return ({"q":goal[0], "r":goal[1], "s":goal[2]}, [{"q":item[0], "r":item[1], "s":item[2]} for item in path])
+        
+        
+    def build_hierarchy(self, witness_limit:int=64) -> "ContractionHierarchy":
+        """
+        Preprocess the graph into a ContractionHierarchy, see 
+        ContractionHierarchy.from_graph, store it as hierarchy and return it. 
+        Meant for static maps, as update_entry, del_entry and new tiles 
+        discard it. Takes seconds on maps of tens of thousands of tiles.
+        """
+        self.hierarchy = ContractionHierarchy.from_graph(self, witness_limit)
+        return self.hierarchy
+    
+    
+    def hierarchy_path(self, start:object|tuple|HexCoords, goal:object|tuple|HexCoords, 
+                       return_obj_type:str="Tuple", stats:SearchStats=None) -> list:
+        """
+        Return a shortest path from start to goal, answered by a bidirectional 
+        search on hierarchy, or by a_star_algorithm if there is no hierarchy, 
+        None if goal cannot be reached. Paths of equal cost may differ from 
+        the ones of a_star_algorithm.
+        
+        Parameters:
+        -----------
+        start, goal : Object | Tuple | HexCoords
+            A Tuple consisting of an Integer or Float for the q, r and s value,
+            or an Object having a q, r and s attribute, the assigned values being 
+            an Integer or Float. Needs to adhere to zero constraint.
+            
+        return_obj_type : String, optional
+            'Coords', 'Tuple', 'List' or 'Dict', see a_star_algorithm.
+            
+        stats : SearchStats, optional
+            If passed, reset and filled with the counters of this search.
+            
+        Raises:
+        -------
+        TypeError: 
+            If q, r or s is not an Integer or a Float. If a passed Tuple has
+            too many or too few individual values.
+            
+        AttributeError: 
+            If an Object is passed, but is missing the q, r or s coordinates attributes.
+            
+        ConstraintViolation: 
+            If the q+r+s=0 constraint is violated.
+        
+        Returns:
+        --------
+        path(List): A List containing all tiles from start to goal coordinate.
+        """
+        hierarchy = self.hierarchy
+        if hierarchy is None:
+            return self.a_star_algorithm(start, goal, return_obj_type=return_obj_type, stats=stats)
+        start = container_or_object(start, 3)
+        goal = container_or_object(goal, 3)
+        started = perf_counter()
+        
+        if start == goal:
+            (cost, path, expanded, pushed, frontier_max) = (0, [0], 0, 0, 0)
+        elif start in hierarchy.index and goal in hierarchy.index:
+            (cost, path, expanded, pushed, frontier_max) = hierarchy._query(hierarchy.index[start], 
+                                                                            hierarchy.index[goal])
+        else:
+            (cost, path, expanded, pushed, frontier_max) = (None, None, 0, 0, 0)
+        self._record_search(stats, started, expanded, pushed, frontier_max, cost)
+        if path is None:
+            return None
+        path = [start] if start == goal else [hierarchy.coords[node] for node in path]
+        
+        if return_obj_type.lower() == "tuple":
+            return path
+        if return_obj_type.lower() == "coords":
+            return [HexCoords(item[0], item[1], item[2]) for item in path]
+        if return_obj_type.lower() == "list":
+            return [[item[0], item[1], item[2]] for item in path]
+        if return_obj_type.lower() == "dict":
+            return [{"q":item[0], "r":item[1], "s":item[2]} for item in path]
+        
+        
+    def _best_first(self, start:tuple, goals:set, heuristic:Callable, integer:bool, 
+                    cost_bound:int|None, stats:SearchStats|None, trace:SearchTrace|None, 
+                    started:float) -> tuple|None:
+        """
+        A* search from start until a tile in goals is popped, returning the 
+        goal reached and the path to it, or None. integer tells, whether all 
+        coordinates are Integers, so a bucket queue can be used.
+        """
+        # frontier ordered by g + heuristic --------------------------------- #
+        if cost_bound is None:
+            cost_bound = self._integer_cost_bound()
+        if cost_bound and integer:
+            frontier = _BucketQueue(cost_bound + 1)
+        else:
+            frontier = _HeapQueue()
+        matrix_dict = self.matrix_dict
+        no_edges = dict()
         
-        frontier = list()
-        frontier.append((start, 0))
         came_from = dict()
         cost_so_far = dict()
         came_from[start] = None
         cost_so_far[start] = 0
+        frontier.push(heuristic(start), (start, 0))
+        # search counters, kept in local variables -------------------------- #
+        expanded = 0
+        pushed = 1
+        frontier_max = 1
         
-        # while not all tiles have been processed, pop first tile from list - #
+        # while not all tiles have been processed, pop lowest priority ------ #
         while frontier:
-            current = frontier.pop(0)
+            (priority, (current, g)) = frontier.pop()
+            # skip entries, whose tile was pushed again with a lower cost --- #
+            if g != cost_so_far[current]:
+                continue
             
-            # if current qrs_coords equal goal coords, break out of loop ---- #
-            if current[0] == goal:
+            # if current qrs_coords are a goal, break out of loop ----------- #
+            if current in goals:
                 break
-            # else execute loop --------------------------------------------- #
-            else:
-                for nbor in neighbors(current[0]):
-                    if self.get_movement_cost(current[0], nbor) >= 0:
-                        new_cost = cost_so_far[current[0]] + self.get_movement_cost(current[0], nbor)
-                        if nbor not in cost_so_far or new_cost < cost_so_far[nbor]:
-                            cost_so_far[nbor] = new_cost
-                            came_from[nbor] = current[0]
-                            priority = new_cost + distance(goal, nbor)
-                            frontier.append((nbor, priority))
-                            frontier.sort(key= lambda x:x[1] in frontier)
-        
-        # if goal not reached and no more frontier tiles left return None --- #
+            
+            expanded += 1
+            if trace is not None:
+                trace._expand(current, g, priority)
+            edges = matrix_dict.get(current, no_edges)
+            (q, r, s) = current
+            for nbor in ((q + 1, r, s - 1), (q + 1, r - 1, s), (q, r - 1, s + 1), 
+                         (q - 1, r, s + 1), (q - 1, r + 1, s), (q, r + 1, s - 1)):
+                movement_cost = edges.get(nbor, -1)
+                if movement_cost >= 0:
+                    new_cost = g + movement_cost
+                    if nbor not in cost_so_far or new_cost < cost_so_far[nbor]:
+                        cost_so_far[nbor] = new_cost
+                        came_from[nbor] = current
+                        frontier.push(new_cost + heuristic(nbor), (nbor, new_cost))
+                        pushed += 1
+                        if len(frontier) > frontier_max:
+                            frontier_max = len(frontier)
+        
+        # if no goal reached and no more frontier tiles left return None ---- #
         else:
+            self._record_search(stats, started, expanded, pushed, frontier_max, None)
+            if trace is not None:
+                trace._finish([], False)
             return None
                         
         # follow the path from goal to start in came_from ------------------- #
-        current = goal 
+        goal = current
         path = list()
         while current != start: 
             path.append(current)
             current = came_from[current]
         path.append(start)
         path.reverse()
-        
-        if return_obj_type.lower() == "tuple":
-            return path
-        if return_obj_type.lower() == "coords":
-            return [HexCoords(item[0], item[1], item[2]) for item in path]
-        if return_obj_type.lower() == "list":
-            return [[item[0], item[1], item[2]] for item in path]
-        if return_obj_type.lower() == "dict":
-            return [{"q":item[0], "r":item[1], "s":item[2]} for item in path]
+        self._record_search(stats, started, expanded, pushed, frontier_max, cost_so_far[goal])
+        if trace is not None:
+            trace._finish([(item[0], priority) for (priority, item) in frontier.entries()], True)
+        return (goal, path)
                
 
-# helper functions ---------------------------------------------------------- #
-def float_to_int(num_in:int|float) -> int|float:
+# ContractionHierarchy for fast queries on static GraphMatrix objects ------- #
+class ContractionHierarchy:
     """
-    Returns an Integer if passed an Integer or if passed a Float with its
-    decimal being zero. Returns a Float if passed a Float, with a non zero
-    decimal.
-    
+    Creates a ContractionHierarchy object, a preprocessed copy of the graph 
+    of a GraphMatrix, answering shortest path queries between two tiles by a 
+    bidirectional search settling only a few hundred nodes on large maps. 
+    Tiles are contracted one after another, least important first, adding a 
+    shortcut edge between two neighbors of a contracted tile whenever the 
+    path through it is the only shortest one found. Queries then only follow 
+    edges to tiles contracted later, from start forward and from goal 
+    backward, and unpack the shortcuts of the path found. Built by 
+    GraphMatrix.build_hierarchy or from_graph, it does not follow later 
+    changes of the GraphMatrix.
+        
     Parameters:
     -----------
-    num_in : Integer | Float
-        An Integer or a Float to be cast as Integer if decimal is zero.
-    
-    Raises:
-    -------
-    TypeError: If num_in is not of type Integer or a Float.
+    coords : List
+        The (q, r, s) Tuples of all tiles, the index of a tile being its id.
+        
+    rank : List | array
+        Position of each tile id in the contraction order.
+        
+    edges : Dictionary
+        {(from_id, to_id) : (movement_cost, middle_id)} of all edges kept, 
+        middle_id being the contracted tile a shortcut replaces, -1 for edges 
+        of the GraphMatrix.
+        
+    Attributes:
+    -----------
+    coords, rank, edges : List, array, Dictionary
+        As passed, rank being an array of typecode "q".
+        
+    index : Dictionary
+        {(q, r, s) : id} of all tiles.
+        
+    up_out, up_in : List
+        Per tile id a Dictionary {id : movement_cost} of the edges to, or 
+        from, tiles of higher rank.
+        
+    Methods:
+    --------
+    from_graph(cls, graph:GraphMatrix, witness_limit:int=64) -> ContractionHierarchy
+        Contract all tiles of graph.
+        
+    shortest_path(self, start:object|tuple|HexCoords, goal:object|tuple|HexCoords) -> tuple
+        Return (path_cost, path) of a shortest path, None if there is none.
+        
+    to_json(self, path:str|os.PathLike|object) -> None
+        Write the hierarchy as JSON.
+        
+    from_json(cls, path:str|os.PathLike|object) -> ContractionHierarchy
+        Read a hierarchy written by to_json.
+        
+    memory_footprint(self) -> dict
+        Return the deep size in bytes of the tiles, ranks, edges and up edges.
     
     Returns:
     --------
-    num_in(Integer|Float): num_in as Float if non zero decimal, else as Integer.
+    ContractionHierarchy(object): 
+        Hierarchy over the tiles in coords.
     """
-    if isinstance(num_in, int):
-        return num_in
-    elif isinstance(num_in, float):
-        if num_in.is_integer():
-            return int(num_in)
-        else:
-            return num_in
-    else:
-        raise TypeError("num_in needs to be of type Integer or Float.") 
-
-
-def container_or_object(container_or_object:object|tuple|RectCoords|HexCoords|list|dict, 
-                    expected_len:2|3, return_obj_type:str="Tuple") -> tuple|RectCoords|HexCoords|list|dict:
-    """
-    Returns a Tuple or a Namedtuple of predefined length, when passed an Object
-    or a Tuple. Tests whether the Tuple is of the desired length and/or if the 
-    Object contains the predefined coordinate variables x, y for 2-dimensional
-    and q, r and s for 3-dimensional coordinate systems. Helper function to 
-    catch divergence from desired coordinate shape as early as possible in
-    hexlogic functions.
+    def __init__(self, coords:list, rank:list|array, edges:dict):
+        self.coords = [tuple(qrs) for qrs in coords]
+        self.index = {qrs:node for node, qrs in enumerate(self.coords)}
+        self.rank = _numeric_array(rank)
+        self.edges = edges
+        # split edges into upward edges of both search directions ----------- #
+        self.up_out = [dict() for _ in self.coords]
+        self.up_in = [dict() for _ in self.coords]
+        for (u, w), (cost, _) in edges.items():
+            if self.rank[w] > self.rank[u]:
+                self.up_out[u][w] = cost
+            else:
+                self.up_in[w][u] = cost
+                
+                
+    def __len__(self) -> int:
+        return len(self.coords)
     
-    Parameters:
-    -----------
-    container_or_object : Object | Tuple | RectCoords | HexCoords
-        Object having either x and y, or q, r and s attributes, with Integers 
-        or Floats as values. Or a Tuple or Namedtuple with length equivalent to 
-        the selected dimension. q, r and s need to fullfill the zero constraint 
-        for Hexagonal Coordinates.
     
-    expected_len : 2 | 3
-        Integer for the number of axis of the cartesian coordinate system,
-        in case of 3, q + r + s = 0, constraint is enforced.
-        
-    return_obj_type : String, optional
-        If 'Coords', returns the rect_linint as RectCoords(Namedtuple) or 
-        HexCoords(Namedtuple), if 'Tuple' as a Tuple of shape (x, y) or (q, r, s), 
-        if 'List' as a List of length 2 or 3 and if 'Dict' returns a Dictionary, 
-        with the axis as keys.
+    @classmethod
+    def from_graph(cls, graph:"GraphMatrix", witness_limit:int=64) -> "ContractionHierarchy":
+        """
+        Contract all tiles of graph, in the order of their edge difference 
+        (shortcuts added minus edges removed) plus the number of neighbors 
+        already contracted, updated lazily. Witness searches, looking for a 
+        path around the tile to contract, settle at most witness_limit tiles; 
+        a lower limit builds faster, but adds more shortcuts.
+        """
+        # working graph of tile ids, edges with movement cost >= 0 ---------- #
+        index = dict()
+        coords = list()
+        for tile, links in graph.matrix_dict.items():
+            for qrs in (tile, *links):
+                if qrs not in index:
+                    index[qrs] = len(coords)
+                    coords.append(qrs)
+        out = [dict() for _ in coords]
+        inn = [dict() for _ in coords]
+        for tile, links in graph.matrix_dict.items():
+            u = index[tile]
+            for nbor, movement_cost in links.items():
+                w = index[nbor]
+                if movement_cost >= 0 and u != w:
+                    out[u][w] = movement_cost
+                    inn[w][u] = movement_cost
+        middle = dict()
+        
+        def shortcuts(v:int) -> list:
+            # (u, w, cost) for every path u -> v -> w without a witness ----- #
+            found = list()
+            for u, cost_in in inn[v].items():
+                targets = {w:cost_in + cost_out for w, cost_out in out[v].items() if w != u}
+                if not targets:
+                    continue
+                max_cost = max(targets.values())
+                dist = {u:0}
+                heap = [(0, u)]
+                settled = 0
+                while heap:
+                    (d, x) = heappop(heap)
+                    if d != dist[x]:
+                        continue
+                    settled += 1
+                    if d > max_cost or settled > witness_limit:
+                        break
+                    for y, cost in out[x].items():
+                        if y != v and (y not in dist or d + cost < dist[y]):
+                            dist[y] = d + cost
+                            heappush(heap, (d + cost, y))
+                for w, cost in targets.items():
+                    if w not in dist or dist[w] > cost:
+                        found.append((u, w, cost))
+            return found
+        
+        contracted_nbors = [0] * len(coords)
+        
+        # contract tiles in order of priority, updated when popped ---------- #
+        queue = [(len(shortcuts(v)) - len(inn[v]) - len(out[v]), v) for v in range(len(coords))]
+        queue.sort()
+        rank = [0] * len(coords)
+        edges = dict()
+        order = 0
+        while queue:
+            (_, v) = heappop(queue)
+            found = shortcuts(v)
+            current = len(found) - len(inn[v]) - len(out[v]) + contracted_nbors[v]
+            if queue and current > queue[0][0]:
+                heappush(queue, (current, v))
+                continue
+            
+            for (u, w, cost) in found:
+                if w not in out[u] or cost < out[u][w]:
+                    out[u][w] = cost
+                    inn[w][u] = cost
+                    middle[(u, w)] = v
+            # remaining edges of v lead to tiles contracted later ----------- #
+            for w, cost in out[v].items():
+                edges[(v, w)] = (cost, middle.pop((v, w), -1))
+                del inn[w][v]
+                contracted_nbors[w] += 1
+            for u, cost in inn[v].items():
+                edges[(u, v)] = (cost, middle.pop((u, v), -1))
+                del out[u][v]
+                contracted_nbors[u] += 1
+            out[v] = inn[v] = None
+            rank[v] = order
+            order += 1
+            
+        return cls(coords, rank, edges)
     
-    Raises:
-    -------
-    TypeError: 
-        If x, y, q, r or s is not an Integer or a Float. If a passed Tuple has
-        too many or too few individual values.
+    
+    def _query(self, start:int, goal:int) -> tuple:
+        """
+        Bidirectional upward search between the tile ids start and goal, 
+        returning (path_cost, path ids, expanded, pushed, frontier_max), the 
+        path_cost and path being None if goal cannot be reached.
+        """
+        up_out = self.up_out
+        up_in = self.up_in
+        dist = ({start:0}, {goal:0})
+        parent = ({start:None}, {goal:None})
+        heaps = ([(0, start)], [(0, goal)])
+        best = None
+        meet = None
+        expanded = 0
+        pushed = 2
+        frontier_max = 2
+        
+        # search the side with the lower key, until both reach best --------- #
+        while True:
+            side = -1
+            for i in (0, 1):
+                if heaps[i] and (best is None or heaps[i][0][0] < best):
+                    if side < 0 or heaps[i][0][0] < heaps[side][0][0]:
+                        side = i
+            if side < 0:
+                break
+            (d, x) = heappop(heaps[side])
+            if d != dist[side][x]:
+                continue
+            expanded += 1
+            other = dist[1 - side]
+            if x in other and (best is None or d + other[x] < best):
+                best = d + other[x]
+                meet = x
+            for y, cost in (up_out if side == 0 else up_in)[x].items():
+                if y not in dist[side] or d + cost < dist[side][y]:
+                    dist[side][y] = d + cost
+                    parent[side][y] = x
+                    heappush(heaps[side], (d + cost, y))
+                    pushed += 1
+            if len(heaps[0]) + len(heaps[1]) > frontier_max:
+                frontier_max = len(heaps[0]) + len(heaps[1])
+                
+        if meet is None:
+            return (None, None, expanded, pushed, frontier_max)
+        
+        # tile ids from start to meet and on to goal, shortcuts unpacked ---- #
+        hops = list()
+        node = meet
+        while node is not None:
+            hops.append(node)
+            node = parent[0][node]
+        hops.reverse()
+        node = parent[1][meet]
+        while node is not None:
+            hops.append(node)
+            node = parent[1][node]
+        path = [start]
+        for i in range(len(hops) - 1):
+            stack = [(hops[i], hops[i + 1])]
+            while stack:
+                (u, w) = stack.pop()
+                mid = self.edges[(u, w)][1]
+                if mid < 0:
+                    path.append(w)
+                else:
+                    stack.append((mid, w))
+                    stack.append((u, mid))
+        return (best, path, expanded, pushed, frontier_max)
+    
+    
+    def shortest_path(self, start:object|tuple|HexCoords, goal:object|tuple|HexCoords) -> tuple:
+        """
+        Return (path_cost, path) of a shortest path from start to goal, path 
+        being a List of (q, r, s) Tuples, or None if goal cannot be reached or 
+        a tile is not part of the hierarchy.
+        """
+        start = container_or_object(start, 3)
+        goal = container_or_object(goal, 3)
+        if start == goal:
+            return (0, [start])
+        if start not in self.index or goal not in self.index:
+            return None
+        (cost, path, _, _, _) = self._query(self.index[start], self.index[goal])
+        if path is None:
+            return None
+        return (cost, [self.coords[node] for node in path])
+    
+    
+    def to_json(self, path:str|os.PathLike|object) -> None:
+        """
+        Write the hierarchy as JSON to path, or to a file opened in text mode: 
+        {"format":"hexlogic-ch", "version":1, "coords":[[q, r, s], ...], 
+        "rank":[...], "edges":[[from_id, to_id, movement_cost, middle_id], ...]}.
+        """
+        if isinstance(path, str|os.PathLike):
+            with open(path, "w", encoding="utf-8") as file:
+                self.to_json(file)
+            return
         
-    ValueError:
-        If a different value than 2 or 3 is passed as expected_len.
+        json.dump({"format":"hexlogic-ch", "version":1, "coords":[list(qrs) for qrs in self.coords], 
+                   "rank":list(self.rank), 
+                   "edges":[[u, w, cost, mid] for (u, w), (cost, mid) in self.edges.items()]}, path)
+        
+        
+    @classmethod
+    def from_json(cls, path:str|os.PathLike|object) -> "ContractionHierarchy":
+        """
+        Read a hierarchy written by to_json from path, or from a file opened 
+        in text mode. Raises a ValueError if it is not such a hierarchy.
+        """
+        if isinstance(path, str|os.PathLike):
+            with open(path, encoding="utf-8") as file:
+                return cls.from_json(file)
+            
+        data = json.load(path)
+        if not isinstance(data, dict) or data.get("format") != "hexlogic-ch" or data.get("version") != 1:
+            raise ValueError("from_json needs a contraction hierarchy written by to_json.")
+        return cls(data["coords"], data["rank"], {(u, w):(cost, mid) for (u, w, cost, mid) in data["edges"]})
+    
+    
+    def memory_footprint(self) -> dict:
+        """
+        Return the deep size in bytes of the tiles (coords and index), the 
+        contraction order (rank), the edges and the upward edges (up_out and 
+        up_in), and their total, see deep_sizeof.
+        """
+        return _footprint({"coords":(self.coords, self.index), "rank":self.rank, 
+                           "edges":self.edges, "up":(self.up_out, self.up_in)})
+    
+    
+# LineOfSight for cached visibility queries between two hexagons ------------ #
+class LineOfSight:
+    """
+    Creates a LineOfSight object bound to a Set of blocking coordinates, 
+    answering whether one hexagon can be seen from another. Results are 
+    memorised per pair of coordinates, together with the hexagons the line 
+    passes through. A reverse index maps each of these hexagons to the cached 
+    pairs whose line crosses it, so changing the blocking state of a hexagon 
+    only invalidates the affected entries instead of the whole cache.
+        
+    Parameters:
+    -----------
+    blockers : List | Set, optional
+        A container containing the (q, r, s) Tuples of all hexagons blocking 
+        the line of sight.
+        
+    symmetric : Boolean, optional
+        If True, the line between two hexagons is always drawn from the smaller 
+        to the larger coordinate Tuple, so can_see(a, b) equals can_see(b, a) 
+        and both share one cache entry. If False, lines are drawn from a to b 
+        and cached per direction.
+        
+    Attributes:
+    -----------
+    blockers : Set
+        Set containing the coordinates of all blocking hexagons.
+        
+    cache : Dictionary
+        Dictionary mapping a pair of coordinates to a Tuple of shape 
+        (visible, line_coords), line_coords being the hexagons between the 
+        pair, without the pair itself.
+        
+    reverse_index : Dictionary
+        Dictionary mapping coordinates to a Set of the cached pairs whose line 
+        passes through them.
+        
+    version : Integer
+        Incremented each time the blocking state of a hexagon changes.
+        
+    Methods:
+    --------
+    can_see(self, obj_a:object|tuple|HexCoords, obj_b:object|tuple|HexCoords) -> bool
+        Returns True if no blocking hexagon lies on the line between obj_a and obj_b.
+        
+    set_blocked(self, qrs:object|tuple|HexCoords, blocked:bool=True) -> None
+        Set the blocking state of a hexagon and invalidate the cached pairs 
+        whose line passes through it.
+        
+    clear(self) -> None
+        Remove all cached pairs.
+        
+    memory_footprint(self) -> dict
+        Return the deep size in bytes of blockers, cache and reverse_index.
+        
+    Raises:
+    -------
+    TypeError: 
+        If q, r or s is not an Integer or a Float. If a passed Tuple has
+        too many or too few individual values.
         
     AttributeError: 
-        If an Object is passed, but is missing the coordinates attributes 
-        for the selected dimension.
+        If an Object is passed, but is missing the q, r or s coordinates attributes.
         
     ConstraintViolation: 
-        If the selected coordinate system is 3-dimensional and the 
-        q+r+s=0 constraint is violated.
-    
+        If the q+r+s=0 constraint is violated.
+        
     Returns:
     --------
-    coordinates(Tuple|RectCoords|HexCoords) : 
-        Coordinates for the selected dimension in a Tuple or childclass.
+    LineOfSight(object): 
+        Object answering and memorising line of sight queries.
     """
-    # rectangular coordinates ----------------------------------------------- #
-    if expected_len == 2:
-        if isinstance(container_or_object, tuple):
-            if len(container_or_object) == 2:
-                x, y = container_or_object
+    def __init__(self, blockers:list|set=None, symmetric:bool=True):
+        # contains the coordinates of all blocking hexagons ----------------- #
+        self.blockers = set()
+        if blockers is not None:
+            for qrs in blockers:
+                self.blockers.add(container_or_object(qrs, 3))
+        self.symmetric = symmetric
+        # {(from, to) : (visible, line_coords)} ----------------------------- #
+        self.cache = dict()
+        # {coords : {(from, to), ...}} -------------------------------------- #
+        self.reverse_index = dict()
+        self.version = 0
+        
+        
+    def can_see(self, obj_a:object|tuple|HexCoords, obj_b:object|tuple|HexCoords) -> bool:
+        """
+        Returns True if no blocking hexagon lies on the line between obj_a and 
+        obj_b, the two hexagons themselves are not tested.
+        """
+        a = container_or_object(obj_a, 3)
+        b = container_or_object(obj_b, 3)
+        
+        if self.symmetric and b < a:
+            a, b = b, a
+        key = (a, b)
+        
+        try:
+            return self.cache[key][0]
+        except KeyError:
+            pass
+        
+        line_coords = line_draw(a, b)[1:-1]
+        visible = True
+        for qrs in line_coords:
+            if qrs in self.blockers:
+                visible = False
+                break
+            
+        self.cache[key] = (visible, line_coords)
+        for qrs in line_coords:
+            if qrs in self.reverse_index:
+                self.reverse_index[qrs].add(key)
             else:
-                raise TypeError("container_or_object needs to be either an Object having attributes x and y or a Tuple of length 2")
-        elif isinstance(container_or_object, (int, float, complex, str, list, range, bytes, 
-                               bytearray, memoryview, bool, dict, set, frozenset)):
-            raise TypeError("container_or_object needs to be either an Object having attributes x and y or a Tuple of length 2")
+                self.reverse_index[qrs] = {key}
+                
+        return visible
+    
+    
+    def set_blocked(self, qrs:object|tuple|HexCoords, blocked:bool=True) -> None:
+        """
+        Set the blocking state of a hexagon. If the state changed, removes all 
+        cached pairs whose line passes through the hexagon and increments 
+        version.
+        """
+        qrs = container_or_object(qrs, 3)
+        
+        if blocked == (qrs in self.blockers):
+            return
+        
+        if blocked:
+            self.blockers.add(qrs)
         else:
-            x = getattr(container_or_object, "x")
-            y = getattr(container_or_object, "y")
+            self.blockers.remove(qrs)
+        self.version += 1
+        
+        for key in self.reverse_index.pop(qrs, ()):
+            # unlink the pair from the other hexagons on its line ----------- #
+            for other in self.cache.pop(key)[1]:
+                if other != qrs:
+                    self.reverse_index[other].discard(key)
+                    if not self.reverse_index[other]:
+                        del self.reverse_index[other]
+                        
+                        
+    def clear(self) -> None:
+        """
+        Remove all cached pairs.
+        """
+        self.cache.clear()
+        self.reverse_index.clear()
+        
+        
+    def memory_footprint(self) -> dict:
+        """
+        Return the deep size in bytes of blockers, the cache of pairs and the 
+        reverse index, and their total, see deep_sizeof.
+        """
+        return _footprint({"blockers":self.blockers, "cache":self.cache, 
+                           "reverse_index":self.reverse_index})
+    
+
+# HexSpatialHash for indexing dynamic Objects by their coordinates ---------- #
+class HexSpatialHash:
+    """
+    Creates a HexSpatialHash object, indexing Objects like units or items by 
+    the cube coordinates of the hexagon they are located on. Inserting, moving 
+    and removing an Object are O(1), range queries only look at the hexagons 
+    within range or at the occupied hexagons, whichever are fewer.
+        
+    Parameters:
+    -----------
+    obj_grp : List | Set | SpriteGroup(Pygame-CE), optional
+        A container containing Objects having q, r and s attributes, to be 
+        inserted on creation. Objects need to be hashable.
+        
+    sync_qrs : Boolean, optional
+        If True, inserting or moving an Object to explicitly passed coordinates 
+        also sets its q, r and s attributes through set_qrs.
+        
+    Attributes:
+    -----------
+    cells : Dictionary
+        Dictionary mapping the (q, r, s) Tuple of each occupied hexagon to a 
+        Dictionary, whose keys are the Objects located on it, in order of 
+        insertion.
+        
+    positions : Dictionary
+        Dictionary mapping each indexed Object to its (q, r, s) Tuple.
+        
+    Methods:
+    --------
+    insert(self, obj:object, qrs:object|tuple|HexCoords=None) -> None
+        Add obj to the index, at qrs or at the coordinates of obj.
+        
+    move(self, obj:object, qrs:object|tuple|HexCoords) -> None
+        Move an indexed obj to qrs.
+        
+    remove(self, obj:object) -> None
+        Remove obj from the index.
+        
+    objects_at(self, qrs:object|tuple|HexCoords) -> list
+        Return a List of all Objects located on qrs.
+        
+    objects_in_range(self, center:object|tuple|HexCoords, n:int) -> list
+        Return a List of all Objects within distance n from center.
+        
+    k_nearest(self, center:object|tuple|HexCoords, k:int, predicate:Callable=None, max_radius:int=None) -> list
+        Return a List of up to k Objects nearest to center, ordered by distance.
+        
+    memory_footprint(self) -> dict
+        Return the deep size in bytes of cells and positions.
+        
+    Raises:
+    -------
+    TypeError: 
+        If q, r or s is not an Integer or a Float. If a passed Tuple has
+        too many or too few individual values.
+        
+    AttributeError: 
+        If an Object is passed, but is missing the q, r or s coordinates attributes.
+        
+    ConstraintViolation: 
+        If the q+r+s=0 constraint is violated.
+        
+    KeyError: 
+        If an Object to be moved or removed is not indexed.
+        
+    Returns:
+    --------
+    HexSpatialHash(object): 
+        Index of Objects by cube coordinates.
+    """
+    def __init__(self, obj_grp:list|set=None, sync_qrs:bool=False):
+        # {coords : {obj : None, ...}} -------------------------------------- #
+        self.cells = dict()
+        # {obj : coords} ---------------------------------------------------- #
+        self.positions = dict()
+        self.sync_qrs = sync_qrs
+        
+        if obj_grp is not None:
+            for obj in obj_grp:
+                self.insert(obj)
+                
+                
+    def __len__(self) -> int:
+        return len(self.positions)
+    
+    
+    def __contains__(self, obj:object) -> bool:
+        return obj in self.positions
+    
+    
+    def insert(self, obj:object, qrs:object|tuple|HexCoords=None) -> None:
+        """
+        Add obj to the index, located at qrs, or if qrs is None at the q, r and s 
+        attributes of obj. If obj is already indexed, it is moved instead.
+        """
+        if qrs is None:
+            qrs = container_or_object(obj, 3)
+        else:
+            qrs = container_or_object(qrs, 3)
+            if self.sync_qrs:
+                set_qrs(obj, qrs[0], qrs[1], qrs[2])
+                
+        if obj in self.positions:
+            self._unlink(obj, self.positions[obj])
+        
+        self.positions[obj] = qrs
+        if qrs in self.cells:
+            self.cells[qrs][obj] = None
+        else:
+            self.cells[qrs] = {obj:None}
             
-        if return_obj_type.lower() == "tuple":
-            rect_coords = (x, y)
-        elif return_obj_type.lower() == "coords":
-            rect_coords = RectCoords(x, y)
-        elif return_obj_type.lower() == "list":
-            rect_coords = [x, y]
-        elif return_obj_type.lower() == "dict":
-            rect_coords = {"x":x, "y":y}
             
-        return rect_coords
-
-    # cube coordinates ------------------------------------------------------ #
-    elif expected_len == 3:
-        if isinstance(container_or_object, tuple):
-            if len(container_or_object) == 3:
-                q, r, s = container_or_object
-                test_type_and_constraints = HexCoords(q, r, s)
-                del test_type_and_constraints
-            else:
-                raise TypeError("container_or_object needs to be either an Object having attributes q, r and s or a Tuple of length 3")
-        elif isinstance(container_or_object, (int, float, complex, str, list, range, bytes, 
-                               bytearray, memoryview, bool, dict, set, frozenset)):
-            raise TypeError("container_or_object needs to be either an Object having attributes q, r and s or a Tuple of length 3")
+    def move(self, obj:object, qrs:object|tuple|HexCoords) -> None:
+        """
+        Move an indexed obj to qrs. Raises a KeyError if obj is not indexed.
+        """
+        if obj not in self.positions:
+            raise KeyError(str(obj) + ", is not indexed.")
+        self.insert(obj, qrs)
+        
+        
+    def remove(self, obj:object) -> None:
+        """
+        Remove obj from the index. Raises a KeyError if obj is not indexed.
+        """
+        self._unlink(obj, self.positions.pop(obj))
+        
+        
+    def _unlink(self, obj:object, qrs:tuple) -> None:
+        """
+        Remove obj from the cell at qrs, deleting the cell if it is empty.
+        """
+        cell = self.cells[qrs]
+        del cell[obj]
+        if not cell:
+            del self.cells[qrs]
+            
+            
+    def objects_at(self, qrs:object|tuple|HexCoords) -> list:
+        """
+        Return a List of all Objects located on qrs, in order of insertion.
+        """
+        qrs = container_or_object(qrs, 3)
+        return list(self.cells.get(qrs, ()))
+    
+    
+    def objects_in_range(self, center:object|tuple|HexCoords, n:int) -> list:
+        """
+        Return a List of all Objects within distance n from center, having the 
+        same semantics as in_range. Iterates over the hexagons within range, or 
+        over the occupied hexagons if there are fewer of them.
+        """
+        (c_q, c_r, c_s) = container_or_object(center, 3)
+        
+        if not isinstance(n, int|float):
+            raise TypeError("n needs to be an Integer, fractional distances not supported")
+        elif isinstance(n, float):
+            if not n.is_integer():
+                raise TypeError("n needs to be an Integer, fractional distances not supported")
+        n = int(n)
+        
+        objs = list()
+        
+        if 3 * n * (n + 1) + 1 <= len(self.cells):
+            for (q, r, s) in range_offsets(n):
+                cell = self.cells.get((c_q+q, c_r+r, c_s+s))
+                if cell:
+                    objs.extend(cell)
         else:
-            q = getattr(container_or_object, "q")
-            r = getattr(container_or_object, "r")
-            s = getattr(container_or_object, "s")
-            test_type_and_constraints = HexCoords(q, r, s)
-            del test_type_and_constraints
-
-        if return_obj_type.lower() == "tuple":
-            hex_coords = (q, r, s)
-        elif return_obj_type.lower() == "coords":
-            hex_coords = HexCoords(q, r, s)
-        elif return_obj_type.lower() == "list":
-            hex_coords = [q, r, s]
-        elif return_obj_type.lower() == "dict":
-            hex_coords = {"q":q, "r":r, "s":s}
-
-        return hex_coords
+            for (q, r, s), cell in self.cells.items():
+                if max(abs(q - c_q), abs(r - c_r), abs(s - c_s)) <= n:
+                    objs.extend(cell)
+                    
+        return objs
+    
+    
+    def k_nearest(self, center:object|tuple|HexCoords, k:int, 
+                  predicate:Callable=None, max_radius:int=None) -> list:
+        """
+        Return a List of up to k Objects nearest to center by distance, 
+        ordered by increasing distance, Objects in the same distance in no 
+        particular order. Expands rings around center and stops after the 
+        ring in which k matches have been found, so the cost depends on the 
+        density of Objects around center, rather than their total number. 
+        Once a ring would contain more hexagons than there are occupied ones, 
+        the remaining occupied hexagons are sorted by distance instead.
+        
+        Parameters:
+        -----------
+        center : Object | Tuple | HexCoords
+            A Tuple consisting of an Integer or Float for the q, r and s value,
+            or an Object having a q, r and s attribute, the assigned values being 
+            an Integer or Float. Needs to adhere to zero constraint.
+            
+        k : Integer
+            The maximum number of Objects to return.
+            
+        predicate : Callable, optional
+            If passed, only Objects for which predicate(obj) returns True are 
+            considered, e.g. only enemy units.
+            
+        max_radius : Integer, optional
+            If passed, only Objects within distance max_radius from center 
+            are considered.
+            
+        Returns:
+        --------
+        nearest(List): Up to k Objects ordered by distance from center.
+        """
+        (c_q, c_r, c_s) = container_or_object(center, 3)
+        
+        if not isinstance(k, int):
+            raise TypeError("k needs to be an Integer")
+        
+        nearest = list()
+        if k < 1:
+            return nearest
+        
+        d = 0
+        while max_radius is None or d <= max_radius:
+            # sparse index: sort the remaining occupied hexagons instead ---- #
+            if 6 * d > len(self.cells):
+                remaining = list()
+                for (q, r, s), cell in self.cells.items():
+                    dist = max(abs(q - c_q), abs(r - c_r), abs(s - c_s))
+                    if dist >= d and (max_radius is None or dist <= max_radius):
+                        remaining.append((dist, cell))
+                remaining.sort(key=lambda x:x[0])
+                
+                for i in range(0, len(remaining)):
+                    # stop once the next distance exceeds a full result ----- #
+                    if len(nearest) >= k and remaining[i][0] != remaining[i-1][0]:
+                        break
+                    nearest.extend(obj for obj in remaining[i][1] if predicate is None or predicate(obj))
+                break
+            
+            for qrs in _ring(c_q, c_r, c_s, d, "tuple"):
+                cell = self.cells.get(qrs)
+                if cell:
+                    nearest.extend(obj for obj in cell if predicate is None or predicate(obj))
+            
+            if len(nearest) >= k:
+                break
+            d += 1
+            
+        return nearest[:k]
     
-    # other integer than 2 or 3 not supported ------------------------------- #
-    else:
-        raise ValueError("Only 2 or 3 axis coordinate systems supported.")
-
 
-# Hexlogic functions -------------------------------------------------------- #
-def linint(a:int|float, b:int|float, t:int|float) -> int|float:
-    """
-    Linear interpolation returns point at t of distance between point a and 
-    point b on a line.
+    def memory_footprint(self) -> dict:
+        """
+        Return the deep size in bytes of cells and positions, and their total, 
+        see deep_sizeof. The indexed Objects are owned by the caller and only 
+        counted as references.
+        """
+        return _footprint({"cells":self.cells, "positions":self.positions})
     
+    
+# HexLayout for repeated conversions with one tile size --------------------- #
+class HexLayout:
+    """
+    Creates a HexLayout object for converting between cube and pixel 
+    coordinates with one tile size and origin. The label raster of pick_hex is 
+    computed once, instead of on every call of pick_hex, and the arguments are 
+    validated once. The forward conversion repeats the float arithmetic of 
+    hex_to_pixel on every call, so its results are byte-identical; folding 
+    tile_width * 0.375 into one precomputed factor would change the rounding 
+    of some centers. Optionally caches the pixel positions of hexagons, for 
+    static maps, where the same tiles are converted every frame.
+        
     Parameters:
     -----------
-    a : Integer | Float
-        A real numeric value, representing a point on a line.
+    tile_width : Integer, optional
+        Specifies the width of a hexagon tile in pixel.
+    
+    tile_height : Integer, optional
+        Specifies the height of a hexagon tile in pixel.
+        
+    origin : Object | Tuple | RectCoords, optional
+        Pixel coordinates of hexagon (0, 0, 0), e.g. the negative camera 
+        position of a scrolling map.
+        
+    cache_size : Integer, optional
+        Maximum number of pixel positions kept by to_pixel, 0 disables the 
+        cache. If full, the oldest entry is removed first.
+        
+    validate : Boolean, optional
+        If True, coordinates passed to to_pixel and to_hex are tested like in 
+        hex_to_pixel and pixel_to_hex. If False, they need to be Tuples of 
+        shape (q, r, s) and (x, y) and are used as they are, the batch methods 
+        never validate single coordinates.
+        
+    Attributes:
+    -----------
+    tile_width : Integer
+    
+    tile_height : Integer
+    
+    origin_x : Integer | Float
+    
+    origin_y : Integer | Float
+    
+    cache : Dictionary
+        Dictionary mapping (q, r, s) Tuples to (x, y) Tuples.
+        
+    Methods:
+    --------
+    to_pixel(self, qrs:object|tuple|HexCoords, return_obj_type:str="Tuple") -> tuple|RectCoords|list|dict
+        Converts cube coordinates to pixel coordinates, identical to hex_to_pixel plus origin.
+        
+    to_hex(self, xy:object|tuple|RectCoords, return_obj_type:str="Tuple") -> tuple|HexCoords|list|dict
+        Returns the cube coordinates of the hexagon containing pixel xy, identical to pick_hex minus origin.
+        
+    to_pixel_batch(self, qrs_lst:list|tuple) -> list
+        Converts an Iterable of (q, r, s) Tuples to a List of (x, y) Tuples.
+        
+    to_hex_batch(self, xy_lst:list|tuple) -> list
+        Converts an Iterable of (x, y) Tuples to a List of (q, r, s) Tuples.
+        
+    clear_cache(self) -> None
+        Remove all cached pixel positions.
+        
+    memory_footprint(self) -> dict
+        Return the deep size in bytes of the cache and the pick raster.
+        
+    Raises:
+    -------
+    TypeError: 
+        If tile_width, tile_height or cache_size is not an Integer. If origin 
+        is not a Tuple of length 2 or an Object with x and y attributes.
+        
+    ValueError: 
+        If tile_width or tile_height is not positive.
+        
+    Returns:
+    --------
+    HexLayout(object): 
+        Object converting between cube and pixel coordinates.
+    """
+    def __init__(self, tile_width:int=64, tile_height:int=64, 
+                 origin:object|tuple|RectCoords=(0, 0), cache_size:int=0, 
+                 validate:bool=True):
+        # label raster for to_hex, also tests tile_width and tile_height ---- #
+        self._raster = pick_raster(tile_width, tile_height)
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        (self.origin_x, self.origin_y) = container_or_object(origin, 2)
+        if not isinstance(self.origin_x, int|float) or not isinstance(self.origin_y, int|float):
+            raise TypeError("origin needs to consist of Integers or Floats.")
+        if not isinstance(cache_size, int):
+            raise TypeError("cache_size needs to be of type Integer.")
+        self.cache_size = cache_size
+        self.cache = dict()
+        self.validate = validate
+        
+        # (r - s) * tile_height * 0.5 equals (r - s) * (tile_height * 0.5), - #
+        # as halving is exact, tile_width * 0.375 is not folded likewise ---- #
+        self._half_height = tile_height * 0.5
+        
+        
+    def _pixel(self, q:int|float, r:int|float, s:int|float) -> tuple:
+        """
+        Pixel coordinates of hexagon q, r, s, with the arithmetic of 
+        hex_to_pixel, so the results are identical.
+        """
+        x = round(((4/3)*q - (2/3)*r - (2/3)*s) * self.tile_width * 0.375) + self.origin_x
+        y = round((r - s) * self._half_height) + self.origin_y
+        return (x, y)
+    
+    
+    def to_pixel(self, qrs:object|tuple|HexCoords, return_obj_type:str="Tuple") -> tuple|RectCoords|list|dict:
+        """
+        Converts cube coordinates to pixel coordinates, the result being 
+        identical to hex_to_pixel plus origin.
+        """
+        if self.validate:
+            qrs = container_or_object(qrs, 3)
+            
+        if self.cache_size > 0:
+            try:
+                xy = self.cache[qrs]
+            except KeyError:
+                if len(self.cache) >= self.cache_size:
+                    del self.cache[next(iter(self.cache))]
+                xy = self.cache[qrs] = self._pixel(qrs[0], qrs[1], qrs[2])
+        else:
+            xy = self._pixel(qrs[0], qrs[1], qrs[2])
+            
+        rot = return_obj_type.lower()
+        
+        if rot == "tuple":
+            return xy
+        elif rot == "coords":
+            return RectCoords(xy[0], xy[1])
+        elif rot == "list":
+            return [xy[0], xy[1]]
+        elif rot == "dict":
+            return {"x":xy[0], "y":xy[1]}
+        
+        
+    def to_hex(self, xy:object|tuple|RectCoords, return_obj_type:str="Tuple") -> tuple|HexCoords|list|dict:
+        """
+        Returns the cube coordinates of the hexagon containing pixel xy, the 
+        result being identical to pick_hex minus origin.
+        """
+        if self.validate:
+            xy = container_or_object(xy, 2)
+            if not isinstance(xy[0], int|float) or not isinstance(xy[1], int|float):
+                raise TypeError("x and y need to be of type Integer or Float.")
+                
+        q, r = _pick(xy[0] - self.origin_x, xy[1] - self.origin_y, self._raster)
+        
+        rot = return_obj_type.lower()
+        
+        if rot == "tuple":
+            return (q, r, -q-r)
+        elif rot == "coords":
+            return HexCoords(q, r, -q-r)
+        elif rot == "list":
+            return [q, r, -q-r]
+        elif rot == "dict":
+            return {"q":q, "r":r, "s":-q-r}
+        
+        
+    def to_pixel_batch(self, qrs_lst:list|tuple) -> list:
+        """
+        Converts an Iterable of (q, r, s) Tuples to a List of (x, y) Tuples in 
+        the same order, without validating or caching single coordinates.
+        """
+        w = self.tile_width
+        h_h = self._half_height
+        o_x = self.origin_x
+        o_y = self.origin_y
+        
+        return [(round(((4/3)*q - (2/3)*r - (2/3)*s) * w * 0.375) + o_x, 
+                 round((r - s) * h_h) + o_y) for (q, r, s) in qrs_lst]
+    
+    
+    def to_hex_batch(self, xy_lst:list|tuple) -> list:
+        """
+        Converts an Iterable of (x, y) Tuples to a List of (q, r, s) Tuples in 
+        the same order, without validating single coordinates.
+        """
+        raster = self._raster
+        o_x = self.origin_x
+        o_y = self.origin_y
+        
+        qrs_lst = list()
+        for (x, y) in xy_lst:
+            q, r = _pick(x - o_x, y - o_y, raster)
+            qrs_lst.append((q, r, -q-r))
+            
+        return qrs_lst
+    
+    
+    def clear_cache(self) -> None:
+        """
+        Remove all cached pixel positions.
+        """
+        self.cache.clear()
+        
+        
+    def memory_footprint(self) -> dict:
+        """
+        Return the deep size in bytes of the cache of pixel positions and the 
+        pick raster, and their total, see deep_sizeof. The raster is shared 
+        by all HexLayouts and calls of pick_hex with the same tile size.
+        """
+        return _footprint({"cache":self.cache, "raster":self._raster})
+        
+
+# helper functions ---------------------------------------------------------- #
+def float_to_int(num_in:int|float) -> int|float:
+    """
+    Returns an Integer if passed an Integer or if passed a Float with its
+    decimal being zero. Returns a Float if passed a Float, with a non zero
+    decimal.
+    
+    Parameters:
+    -----------
+    num_in : Integer | Float
+        An Integer or a Float to be cast as Integer if decimal is zero.
+    
+    Raises:
+    -------
+    TypeError: If num_in is not of type Integer or a Float.
+    
+    Returns:
+    --------
+    num_in(Integer|Float): num_in as Float if non zero decimal, else as Integer.
+    """
+    if isinstance(num_in, int):
+        return num_in
+    elif isinstance(num_in, float):
+        if num_in.is_integer():
+            return int(num_in)
+        else:
+            return num_in
+    else:
+        raise TypeError("num_in needs to be of type Integer or Float.") 
+
+
+def container_or_object(container_or_object:object|tuple|RectCoords|HexCoords|list|dict, 
+                    expected_len:2|3, return_obj_type:str="Tuple") -> tuple|RectCoords|HexCoords|list|dict:
+    """
+    Returns a Tuple or a Namedtuple of predefined length, when passed an Object
+    or a Tuple. Tests whether the Tuple is of the desired length and/or if the 
+    Object contains the predefined coordinate variables x, y for 2-dimensional
+    and q, r and s for 3-dimensional coordinate systems. Helper function to 
+    catch divergence from desired coordinate shape as early as possible in
+    hexlogic functions.
+    
+    Parameters:
+    -----------
+    container_or_object : Object | Tuple | RectCoords | HexCoords
+        Object having either x and y, or q, r and s attributes, with Integers 
+        or Floats as values. Or a Tuple or Namedtuple with length equivalent to 
+        the selected dimension. q, r and s need to fullfill the zero constraint 
+        for Hexagonal Coordinates.
+    
+    expected_len : 2 | 3
+        Integer for the number of axis of the cartesian coordinate system,
+        in case of 3, q + r + s = 0, constraint is enforced.
+        
+    return_obj_type : String, optional
+        If 'Coords', returns the rect_linint as RectCoords(Namedtuple) or 
+        HexCoords(Namedtuple), if 'Tuple' as a Tuple of shape (x, y) or (q, r, s), 
+        if 'List' as a List of length 2 or 3 and if 'Dict' returns a Dictionary, 
+        with the axis as keys.
+    
+    Raises:
+    -------
+    TypeError: 
+        If x, y, q, r or s is not an Integer or a Float. If a passed Tuple has
+        too many or too few individual values.
+        
+    ValueError:
+        If a different value than 2 or 3 is passed as expected_len.
+        
+    AttributeError: 
+        If an Object is passed, but is missing the coordinates attributes 
+        for the selected dimension.
+        
+    ConstraintViolation: 
+        If the selected coordinate system is 3-dimensional and the 
+        q+r+s=0 constraint is violated.
+    
+    Returns:
+    --------
+    coordinates(Tuple|RectCoords|HexCoords) : 
+        Coordinates for the selected dimension in a Tuple or childclass.
+    """
+    # rectangular coordinates ----------------------------------------------- #
+    if expected_len == 2:
+        if isinstance(container_or_object, tuple):
+            if len(container_or_object) == 2:
+                x, y = container_or_object
+            else:
+                raise TypeError("container_or_object needs to be either an Object having attributes x and y or a Tuple of length 2")
+        elif isinstance(container_or_object, (int, float, complex, str, list, range, bytes, 
+                               bytearray, memoryview, bool, dict, set, frozenset)):
+            raise TypeError("container_or_object needs to be either an Object having attributes x and y or a Tuple of length 2")
+        else:
+            x = getattr(container_or_object, "x")
+            y = getattr(container_or_object, "y")
+            
+        if return_obj_type.lower() == "tuple":
+            rect_coords = (x, y)
+        elif return_obj_type.lower() == "coords":
+            rect_coords = RectCoords(x, y)
+        elif return_obj_type.lower() == "list":
+            rect_coords = [x, y]
+        elif return_obj_type.lower() == "dict":
+            rect_coords = {"x":x, "y":y}
+            
+        return rect_coords
+
+    # cube coordinates ------------------------------------------------------ #
+    elif expected_len == 3:
+        if isinstance(container_or_object, tuple):
+            if len(container_or_object) == 3:
+                q, r, s = container_or_object
+                test_type_and_constraints = HexCoords(q, r, s)
+                del test_type_and_constraints
+            else:
+                raise TypeError("container_or_object needs to be either an Object having attributes q, r and s or a Tuple of length 3")
+        elif isinstance(container_or_object, (int, float, complex, str, list, range, bytes, 
+                               bytearray, memoryview, bool, dict, set, frozenset)):
+            raise TypeError("container_or_object needs to be either an Object having attributes q, r and s or a Tuple of length 3")
+        else:
+            q = getattr(container_or_object, "q")
+            r = getattr(container_or_object, "r")
+            s = getattr(container_or_object, "s")
+            test_type_and_constraints = HexCoords(q, r, s)
+            del test_type_and_constraints
+
+        if return_obj_type.lower() == "tuple":
+            hex_coords = (q, r, s)
+        elif return_obj_type.lower() == "coords":
+            hex_coords = HexCoords(q, r, s)
+        elif return_obj_type.lower() == "list":
+            hex_coords = [q, r, s]
+        elif return_obj_type.lower() == "dict":
+            hex_coords = {"q":q, "r":r, "s":s}
+
+        return hex_coords
+    
+    # other integer than 2 or 3 not supported ------------------------------- #
+    else:
+        raise ValueError("Only 2 or 3 axis coordinate systems supported.")
+
+
+def _numeric_array(values:list) -> array:
+    """
+    Returns values as an array of typecode "q" if all of them are Integers, 
+    else of typecode "d".
+    """
+    for value in values:
+        if value.__class__ is not int:
+            return array("d", values)
+    try:
+        return array("q", values)
+    except OverflowError:
+        return array("d", values)
+
+
+def deep_sizeof(obj:object, seen:set=None) -> int:
+    """
+    Returns the size in bytes of obj and of all Objects contained in it, 
+    following Dictionaries, Lists, Tuples, Sets and frozensets, unlike 
+    sys.getsizeof, which only returns the size of the container itself. 
+    Other Objects are counted without their attributes. Every Object is 
+    counted once, even if referenced several times.
+    
+    Parameters:
+    -----------
+    obj : Object
+        The Object to measure.
+        
+    seen : Set, optional
+        Set of the ids of Objects already counted, updated with the ids of 
+        the Objects counted now. Passing the same Set to several calls counts 
+        Objects shared between them only once.
+        
+    Returns:
+    --------
+    size(Integer): 
+        The deep size of obj in bytes.
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, list|tuple|set|frozenset):
+            stack.extend(item)
+            
+    return size
+
+
+def _footprint(components:dict) -> dict:
+    """
+    Returns the deep size of every component and their total, Objects shared 
+    between components being counted for the first component only.
+    """
+    seen = set()
+    footprint = {name:deep_sizeof(component, seen) for name, component in components.items()}
+    footprint["total"] = sum(footprint.values())
+    return footprint
+
+
+# Hexlogic functions -------------------------------------------------------- #
+def linint(a:int|float, b:int|float, t:int|float) -> int|float:
+    """
+    Linear interpolation returns point at t of distance between point a and 
+    point b on a line.
+    
+    Parameters:
+    -----------
+    a : Integer | Float
+        A real numeric value, representing a point on a line.
+        
+    b : Integer | Float
+        A real numeric value, representing a point on a line.
+        
+    t : Integer | Float
+        Real number denominating the fractional distance between a and b.
+        t * 100 = distance between a and b in percent.
+        
+    Raises:
+    -------
+    TypeError: If a, b or t is not an Integer or Float.
+        
+    Returns:
+    --------
+    linint(real_number): Linear interpolation t part of the way from a to b.
+    """
+    if not isinstance(a, int|float):
+        raise TypeError("a needs to be either of type Integer or type Float.")
+    if not isinstance(b, int|float):
+        raise TypeError("b needs to be either of type Integer or type Float.")
+    if not isinstance(t, int|float):
+        raise TypeError("t needs to be either of type Integer or type Float.")
+    
+    linint = a + (b - a) * t * 1.0
+            
+    return int(linint) if linint.is_integer() else linint
+    
+    
+def rect_linint(xy_a:object|tuple|RectCoords, xy_b:object|tuple|RectCoords, 
+                t:int|float, return_obj_type:str="Tuple") -> tuple|RectCoords|list|dict:
+    """
+    Linear interpolation returns point at t distance between a and b in
+    a rectangular cartesian coordinates system. x and y representing the 
+    respective coordinate along the x and y axis of a rectangular coordinate 
+    system.
+        
+    Parameters:
+    -----------
+    xy_a : Tuple | RectCoords | Object
+        A Tuple or childclass consisting of an Integer or Float for the x and y 
+        value, or an Object having a x and y attribute, the assigned values 
+        being an Integer or Float. 
+        
+    xy_b : Tuple | RectCoords | Object
+        A Tuple or childclass consisting of an Integer or Float for the x and y 
+        value, or an Object having a x and y attribute, the assigned values 
+        being an Integer or Float. 
+        
+    t : Integer | Float
+        Real number denominating the fractional distance between a and b.
+        t * 100 = distance between a and b in percent.
+        
+    return_obj_type : String, optional
+        If 'Coords', returns the rect_linint as RectCoords(Namedtuple), if 
+        'Tuple' as a Tuple of shape (x, y), if 'List' as a List of length 2 and 
+        if 'Dict' returns a Dictionary, with the axis as keys.
+        
+    Raises:
+    -------
+    TypeError: 
+        If xy_a or xy_b is not a Tuple or subclass with 2 values, being Integer 
+        or Float respectively.
+    
+    AttributeError: 
+        If xy_a and/or xy_b is an Object xy_a or xy_b is missing a x or y attribute.
+        
+    Returns:
+    --------
+    rect_linint(Tuple|RectCoords|List|Dictionary): 
+        Linear interpolation t part of the way from a to b.
+    """
+    (x_a, y_a) = container_or_object(xy_a, 2)
+    (x_b, y_b) = container_or_object(xy_b, 2)
+        
+    x = linint(x_a, x_b, t)
+    y = linint(y_a, y_b, t)
+    
+    if return_obj_type.lower() == "tuple":
+        rect_linint = (x, y)
+    elif return_obj_type.lower() == "coords":
+        rect_linint = RectCoords(x, y)
+    elif return_obj_type.lower() == "list":
+        rect_linint = [x, y]
+    elif return_obj_type.lower() == "dict":
+        rect_linint = {"x":x, "y":y}
+        
+    return rect_linint
+    
+
+def cube_linint(obj_a:object|tuple|HexCoords, obj_b:object|tuple|HexCoords, 
+                t:int|float, return_obj_type:str="Tuple") -> tuple|HexCoords|list|dict:
+    """
+    Returns the hextile coordinates of a point situated at t part of the way 
+    from obj_a to obj_b.
+        
+    Parameters:
+    -----------
+    obj_a : Object | Tuple | HexCoords
+        A Tuple consisting of an Integer or Float for the q, r and s value,
+        or an Object having a q, r and s attribute, the assigned values being an 
+        Integer or Float. Needs to adhere to zero constraint.
+        
+    obj_b : Object | Tuple | HexCoords
+        A Tuple consisting of an Integer or Float for the q, r and s value,
+        or an Object having a q, r and s attribute, the assigned values being an 
+        Integer or Float. Needs to adhere to zero constraint.
+        
+    t : Integer | Float
+        Real number denominating the fractional distance between a and b.
+        t * 100 = distance between a and b in percent.
+        
+    return_obj_type : String, optional
+        If 'Coords', returns the rect_linint as HexCoords(Namedtuple), if 
+        'Tuple' as a Tuple of shape (q, r, s), if 'List' as a List of length 3 and 
+        if 'Dict' returns a Dictionary, with the axis as keys.
+        
+    Raises:
+    -------
+    TypeError: 
+        If obj_a or obj_b is not a Tuple or subclass with 3 values, being Integer 
+        or Float respectively.
+        
+    AttributeError: 
+        If at least one of the parameters is an Object and one of the Objects 
+        is missing an q, r or s attribute.
+        
+    ConstraintViolation: 
+        If the q+r+s=0 constraint is violated, by one of the function parameters.
+        
+    Returns:
+    --------
+    linint_coords(Tuple|RectCoords|List|Dictionary): 
+        The hextile coordinates of a point situated at the t part of the way 
+        from obj_a to obj_b.
+    """
+    
+    (q_a, r_a, s_a) = container_or_object(obj_a, 3)
+    (q_b, r_b, s_b) = container_or_object(obj_b, 3)
+    
+    if not isinstance(t, int|float):
+        raise TypeError("t needs to be of type Integer or Float.")
+        
+    q = linint(q_a, q_b, t)
+    r = linint(r_a, r_b, t)
+    s = linint(s_a, s_b, t)
+    
+    if return_obj_type.lower() == "tuple":
+        linint_coords = (q, r, s)
+    elif return_obj_type.lower() == "coords":
+        linint_coords = HexCoords(q, r, s)
+    elif return_obj_type.lower() == "list":
+        linint_coords = [q, r, s]
+    elif return_obj_type.lower() == "dict":
+        linint_coords = {"q":q, "r":r, "s":s}
+        
+    return linint_coords
+
+
+def round_container(container:dict|list|set|tuple|RectCoords,
+                d:int=0) -> dict|list|set|tuple|RectCoords:
+    """
+    Rounds each number in a container to the specified decimal, if None is 
+    specified to the nearest Integer. For Dictionaries rounds each value or
+    each value in a container, assigned as a value. Does not work for nested 
+    Dictionaries.
+    
+    Parameters:
+    -----------
+    container : Dictionary | List | Set | Tuple | RectCoords
+        Built-in container or derived childclass.
+        
+    d : Integer, optional
+        Number of decimals to round to, passed to built-in round function.
+    
+    Raises:
+    -------
+    TypeError: 
+        If a different Object type is passed than a built in container or 
+        derived childclass thereof.
+    
+    Returns:
+    --------
+    container(dict|list|set|tuple|RectCoords): 
+        Returns a container with each Float in it rounded to d decimal points.
+    """
+    # case: container is list|set|tuple rounds every int|float in it -------- #
+    if isinstance(container, list|set|tuple):
+        rndd_lst = [round(x,d) if isinstance(x, float) else x for x in container]
+        if isinstance(container, list):
+            return rndd_lst
+        elif isinstance(container, set):
+            return set(rndd_lst)
+        elif isinstance(container, tuple):
+            return tuple(rndd_lst)
+    # case: container is dict rounds every int|float in it, or nested in ---- #
+    # list|set|tuple -------------------------------------------------------- #
+    elif isinstance(container, dict):
+        for key in container.keys():
+            if isinstance(container[key], float):
+                container[key] = round(container[key],d)
+            elif isinstance(container[key], list|set|tuple):
+                rndd_lst = [round(x,d) if isinstance(x, float) else x for x in container[key]]
+                if isinstance(container[key], list):
+                    container[key] = rndd_lst
+                elif isinstance(container[key], set):
+                    container[key] = set(rndd_lst)
+                elif isinstance(container[key], tuple):
+                    container[key] = tuple(rndd_lst)
+        return container
+    else:
+        raise TypeError("""container needs to be a general purpose built in 
+                        container, Dict, List, Set or Tuple or a childclass""")
+        
+
+def round_hex(qrs:tuple|HexCoords, return_obj_type:str="Tuple") -> tuple|HexCoords|list|dict:
+    """
+    Rounds each of the coordinates to the nearest Integer. 
+        
+    Parameters:
+    -----------
+    qrs : Tuple | HexCoords | List
+        A Tuple or a Namedtuple containing 3 real numerical values.
+        
+    return_obj_type : String, optional
+        If 'Coords', returns the rounded coordinates as HexCoords(Namedtuple), 
+        if 'Tuple' as a Tuple of shape (q, r, s), if 'List' as a List of 
+        length 3 and if 'Dict' returns a Dictionary, with the axis as keys.
+        
+    Raises:
+    -------
+    TypeError:
+        If the Tuple contains different values than Integers or Float.
+        
+    ConstraintViolation: 
+        If the q+r+s=0 constraint is violated and the return is HexCoords.
+        
+    Returns:
+    --------
+    rounded_qrs(Tuple|RectCoords|List|Dictionary): 
+        The input Tuple, each element rounded to the nearest Integer. 
+    """
+    if isinstance(qrs, dict):
+        q_f = qrs["q"]
+        r_f = qrs["r"]
+        s_f = qrs["s"]
+    elif isinstance(qrs, tuple|list):
+        q_f, r_f, s_f = qrs
+    else:
+        raise TypeError("""qrs needs to be a tuple or list of length 3, or a 
+                        dictionary having q, r and s as a key, the values being
+                        of type Integer or Float""")
+        
+    q = round(q_f)
+    r = round(r_f)
+    s = round(s_f)
+
+    q_diff = abs(q - q_f)
+    r_diff = abs(r - r_f)
+    s_diff = abs(s - s_f)
+
+    if q_diff > r_diff and q_diff > s_diff:
+        q = -r-s
+    elif r_diff > s_diff:
+        r = -q-s
+    else:
+        s = -q-r
+        
+    if return_obj_type.lower() == "tuple":
+        rounded_qrs = (q, r, s)
+    elif return_obj_type.lower() == "coords":
+        rounded_qrs = HexCoords(q, r, s)
+    elif return_obj_type.lower() == "list":
+        rounded_qrs = [q, r, s]
+    elif return_obj_type.lower() == "dict":
+        rounded_qrs = {"q":q, "r":r, "s":s}
+        
+    return rounded_qrs
+
+
+def get_xy(obj:object, return_obj_type:str="Tuple") -> tuple|RectCoords|list|dict:
+    """
+    Returns values of attributes x and y of obj as Tuple, RectCoords, List or Dictionary.
+    
+    Parameters:
+    -----------
+    obj : Object
+        An Object having attributes x and y, values being Integer or Float.
+        
+    return_obj_type : String, optional
+        If 'Coords', returns xy as RectCoords(Namedtuple), if 'Tuple' as a 
+        Tuple of shape (x, y), if 'List' as a List of length 2 and if 'Dict' 
+        returns a Dictionary, with the axis as keys.
+        
+    Raises:
+    -------
+    TypeError:
+        If values returned from Object attributes are not Integer or Float.
+        
+    AttributeError: 
+        If obj is missing x or y as attribute.
+        
+    Returns:
+    --------
+    xy(Tuple|RectCoords|List|Dictionary): The values of attributes x, y of obj.
+    """
+    x = getattr(obj, "x")
+    y = getattr(obj, "y")
+    
+    if not isinstance(x, int|float):
+        raise TypeError("obj returned a different type than Integer or Float as value for x")
+                            
+    if not isinstance(y, int|float):
+        raise TypeError("obj returned a different type than Integer or Float as value for y")
+            
+    if return_obj_type.lower() == "tuple":
+        xy = (x, y)
+    elif return_obj_type.lower() == "coords":
+        xy = RectCoords(x, y)
+    elif return_obj_type.lower() == "list":
+        xy = [x, y]
+    elif return_obj_type.lower() == "dict":
+        xy = {"x":x,"y":y}
+        
+    return xy
+
+
+def set_xy(obj:object, x:int|float, y:int|float) -> None:
+    """
+    Set x and y attribute of obj to specified values.
+    
+    Parameters:
+    -----------
+    obj : Object
+        An Object having attributes x and y, values being Integer or Float.
+        
+    x : Integer | Float
+        The value the x-coordinate is to be set to.
+        
+    y : Integer | Float
+        The value the y-coordinate is to be set to.
+        
+    Raises:
+    -------
+    TypeError: 
+        If x or y is not an Integer or Float.
+        
+    Returns:
+    --------
+    None
+    """
+    
+    if not isinstance(x, int|float):
+        raise TypeError("x needs to be of type Integer or Float")
+    if not isinstance(y, int|float):
+        raise TypeError("y needs to be of type Integer or Float")
+
+    setattr(obj, "x", x)
+    setattr(obj, "y", y)
+        
+    
+def get_qrs(obj:object, return_obj_type:str="Tuple") -> tuple|HexCoords|list|dict:
+    """
+    Returns values of attributes q, r and s of obj as Tuple, RectCoords, List or Dictionary.
+        
+    Parameters:
+    -----------
+    obj : object
+        An Object having attributes q, r and s, values being Integer or Float. If 
+        set to return HexCoords, needs to adhere to zero constraint.
+        
+    return_obj_type : String, optional
+        If 'Coords', returns the rect_linint as HexCoords(Namedtuple), if 
+        'Tuple' as a Tuple of shape (q, r, s), if 'List' as a List of length 3 and 
+        if 'Dict' returns a Dictionary, with the axis as keys.
+        
+    Raises:
+    -------
+    TypeError:
+        If q, r or s is not an Integer or Float.
+    
+    AttributeError: 
+        If obj is missing q, r or s as attribute.
+    
+    ConstraintViolation: 
+        If set to return HexCoords and the q+r+s=0 constraint is violated.
+        
+    Returns:
+    --------
+    qrs(Tuple|HexCoords|List|Dictionary): 
+        The values of attributes q, r, s of obj as Tuple, RectCoords, List or Dictionary.
+    """
+    q = getattr(obj, "q")
+    r = getattr(obj, "r")
+    s = getattr(obj, "s")
+    
+    if not isinstance(q, int|float):
+        raise TypeError("obj returned a different type than Integer or Float as value for q")
+        
+    if not isinstance(r, int|float):
+        raise TypeError("obj returned a different type than Integer or Float as value for r")
+        
+    if not isinstance(s, int|float):
+        raise TypeError("obj returned a different type than Integer or Float as value for s")
+            
+    if return_obj_type.lower() == "tuple":
+        qrs = (q, r, s)
+    elif return_obj_type.lower() == "coords":
+        qrs = HexCoords(q, r, s)
+    elif return_obj_type.lower() == "list":
+        qrs = [q, r, s]
+    elif return_obj_type.lower() == "dict":
+        qrs = {"q":q, "r":r, "s":s}
+        
+    return qrs
+    
+
+def set_qrs(obj:object, q:int|float, r:int|float, s:int|float) -> None:
+    """
+    Set q, r and s attribute of obj to specified values. Input needs to adhere 
+    to zero constraint.
+        
+    Parameters:
+    -----------
+    obj : Object
+        An Object intended to be located on a hexagonal grid.
+        
+    q : Integer | Float
+        The value the q-coordinate is to be set to, needs to adhere to zero-
+        constraint.
         
-    b : Integer | Float
-        A real numeric value, representing a point on a line.
+    r : Integer | Float
+        The value the r-coordinate is to be set to, needs to adhere to zero-
+        constraint.
         
-    t : Integer | Float
-        Real number denominating the fractional distance between a and b.
-        t * 100 = distance between a and b in percent.
+    s : Integer | Float
+        The value the s-coordinate is to be set to, needs to adhere to zero-
+        constraint.
         
     Raises:
     -------
-    TypeError: If a, b or t is not an Integer or Float.
+    TypeError: 
+        If q, r or s is not an Integer or Float.
+    
+    ConstraintViolation: 
+        If the q+r+s=0 constraint is violated.
         
     Returns:
     --------
-    linint(real_number): Linear interpolation t part of the way from a to b.
-    """
-    if not isinstance(a, int|float):
-        raise TypeError("a needs to be either of type Integer or type Float.")
-    if not isinstance(b, int|float):
-        raise TypeError("b needs to be either of type Integer or type Float.")
-    if not isinstance(t, int|float):
-        raise TypeError("t needs to be either of type Integer or type Float.")
-    
-    linint = a + (b - a) * t * 1.0
-            
-    return int(linint) if linint.is_integer() else linint
+    None
+    """ 
+    test_type_and_constraints = HexCoords(q, r, s)
+    del test_type_and_constraints
     
+    setattr(obj, "q", q)
+    setattr(obj, "r", r)
+    setattr(obj, "s", s)
     
-def rect_linint(xy_a:object|tuple|RectCoords, xy_b:object|tuple|RectCoords, 
-                t:int|float, return_obj_type:str="Tuple") -> tuple|RectCoords|list|dict:
+
+def offset_to_cube(col_row:tuple|list, offset:str="even-q", 
+                   return_obj_type:str="Tuple") -> tuple|HexCoords|list|dict:
     """
-    Linear interpolation returns point at t distance between a and b in
-    a rectangular cartesian coordinates system. x and y representing the 
-    respective coordinate along the x and y axis of a rectangular coordinate 
-    system.
-        
+    Converts offset coordinates (column, row) of a flat top grid, with 
+    columns along q, to cube coordinates.
+    
     Parameters:
     -----------
-    xy_a : Tuple | RectCoords | Object
-        A Tuple or childclass consisting of an Integer or Float for the x and y 
-        value, or an Object having a x and y attribute, the assigned values 
-        being an Integer or Float. 
-        
-    xy_b : Tuple | RectCoords | Object
-        A Tuple or childclass consisting of an Integer or Float for the x and y 
-        value, or an Object having a x and y attribute, the assigned values 
-        being an Integer or Float. 
-        
-    t : Integer | Float
-        Real number denominating the fractional distance between a and b.
-        t * 100 = distance between a and b in percent.
+    col_row : Tuple | List
+        A Tuple or List consisting of an Integer for the column and the row.
         
+    offset : String, optional
+        'even-q' if even columns are shoved down by half a tile, 'odd-q' if 
+        odd columns are, defaults to 'even-q'.
+    
     return_obj_type : String, optional
-        If 'Coords', returns the rect_linint as RectCoords(Namedtuple), if 
-        'Tuple' as a Tuple of shape (x, y), if 'List' as a List of length 2 and 
-        if 'Dict' returns a Dictionary, with the axis as keys.
-        
+        If 'Coords', returns the cube coordinates as HexCoords(Namedtuple), if 
+        'Tuple' as a Tuple of shape (q, r, s), if 'List' as a List of length 3 
+        and if 'Dict' returns a Dictionary, with the axis as keys.
+            
     Raises:
     -------
     TypeError: 
-        If xy_a or xy_b is not a Tuple or subclass with 2 values, being Integer 
-        or Float respectively.
-    
-    AttributeError: 
-        If xy_a and/or xy_b is an Object xy_a or xy_b is missing a x or y attribute.
+        If col_row is not a Tuple or List of two Integers.
+        
+    ValueError: 
+        If offset is neither 'even-q' nor 'odd-q'.
         
     Returns:
     --------
-    rect_linint(Tuple|RectCoords|List|Dictionary): 
-        Linear interpolation t part of the way from a to b.
+    qrs(Tuple|HexCoords|List|Dictionary): 
+        The cube coordinates of the tile in column col and row row.
     """
-    (x_a, y_a) = container_or_object(xy_a, 2)
-    (x_b, y_b) = container_or_object(xy_b, 2)
-        
-    x = linint(x_a, x_b, t)
-    y = linint(y_a, y_b, t)
+    even = _even_offset(offset)
+    if not isinstance(col_row, tuple|list) or len(col_row) != 2:
+        raise TypeError("col_row needs to be a Tuple or List of length 2.")
+    (col, row) = col_row
+    if not isinstance(col, int) or not isinstance(row, int):
+        raise TypeError("col and row need to be of type Integer.")
+        
+    q = col
+    r = row - ((col + 1) >> 1 if even else col >> 1)
+    s = -q - r
     
     if return_obj_type.lower() == "tuple":
-        rect_linint = (x, y)
+        qrs = (q, r, s)
     elif return_obj_type.lower() == "coords":
-        rect_linint = RectCoords(x, y)
+        qrs = HexCoords(q, r, s)
     elif return_obj_type.lower() == "list":
-        rect_linint = [x, y]
+        qrs = [q, r, s]
     elif return_obj_type.lower() == "dict":
-        rect_linint = {"x":x, "y":y}
+        qrs = {"q":q,"r":r,"s":s}
         
-    return rect_linint
-    
+    return qrs
 
-def cube_linint(obj_a:object|tuple|HexCoords, obj_b:object|tuple|HexCoords, 
-                t:int|float, return_obj_type:str="Tuple") -> tuple|HexCoords|list|dict:
+
+def cube_to_offset(qrs:object|tuple|HexCoords, offset:str="even-q", 
+                   return_obj_type:str="Tuple") -> tuple|list|dict:
     """
-    Returns the hextile coordinates of a point situated at t part of the way 
-    from obj_a to obj_b.
-        
+    Converts cube coordinates to offset coordinates (column, row) of a flat 
+    top grid, with columns along q.
+    
     Parameters:
     -----------
-    obj_a : Object | Tuple | HexCoords
-        A Tuple consisting of an Integer or Float for the q, r and s value,
-        or an Object having a q, r and s attribute, the assigned values being an 
-        Integer or Float. Needs to adhere to zero constraint.
-        
-    obj_b : Object | Tuple | HexCoords
-        A Tuple consisting of an Integer or Float for the q, r and s value,
-        or an Object having a q, r and s attribute, the assigned values being an 
-        Integer or Float. Needs to adhere to zero constraint.
-        
-    t : Integer | Float
-        Real number denominating the fractional distance between a and b.
-        t * 100 = distance between a and b in percent.
+    qrs : Object | Tuple | HexCoords
+        A Tuple consisting of an Integer for the q, r and s value, or an 
+        Object having a q, r and s attribute, the assigned values being 
+        Integers. Needs to adhere to zero constraint.
         
+    offset : String, optional
+        'even-q' if even columns are shoved down by half a tile, 'odd-q' if 
+        odd columns are, defaults to 'even-q'.
+    
     return_obj_type : String, optional
-        If 'Coords', returns the rect_linint as HexCoords(Namedtuple), if 
-        'Tuple' as a Tuple of shape (q, r, s), if 'List' as a List of length 3 and 
-        if 'Dict' returns a Dictionary, with the axis as keys.
-        
+        If 'Tuple' or not defined, returns the offset coordinates as a Tuple 
+        of shape (col, row), if 'List' as a List of length 2 and if 'Dict' 
+        returns a Dictionary, with "col" and "row" as keys.
+            
     Raises:
     -------
     TypeError: 
-        If obj_a or obj_b is not a Tuple or subclass with 3 values, being Integer 
-        or Float respectively.
+        If q, r or s is not an Integer. If a passed Tuple has too many or too 
+        few individual values.
         
     AttributeError: 
-        If at least one of the parameters is an Object and one of the Objects 
-        is missing an q, r or s attribute.
+        If an Object is passed, but is missing the q, r or s attribute.
         
     ConstraintViolation: 
-        If the q+r+s=0 constraint is violated, by one of the function parameters.
+        If the q+r+s=0 constraint is violated.
+        
+    ValueError: 
+        If offset is neither 'even-q' nor 'odd-q'.
         
     Returns:
     --------
-    linint_coords(Tuple|RectCoords|List|Dictionary): 
-        The hextile coordinates of a point situated at the t part of the way 
-        from obj_a to obj_b.
+    col_row(Tuple|List|Dictionary): 
+        The column and row of hexagon qrs.
     """
-    
-    (q_a, r_a, s_a) = container_or_object(obj_a, 3)
-    (q_b, r_b, s_b) = container_or_object(obj_b, 3)
-    
-    if not isinstance(t, int|float):
-        raise TypeError("t needs to be of type Integer or Float.")
+    even = _even_offset(offset)
+    (q, r, s) = container_or_object(qrs, 3)
+    if not isinstance(q, int) or not isinstance(r, int) or not isinstance(s, int):
+        raise TypeError("q, r and s need to be of type Integer, fractional coordinates can be rounded by round_hex.")
         
-    q = linint(q_a, q_b, t)
-    r = linint(r_a, r_b, t)
-    s = linint(s_a, s_b, t)
+    col = q
+    row = r + ((q + 1) >> 1 if even else q >> 1)
     
-    if return_obj_type.lower() == "tuple":
-        linint_coords = (q, r, s)
-    elif return_obj_type.lower() == "coords":
-        linint_coords = HexCoords(q, r, s)
-    elif return_obj_type.lower() == "list":
-        linint_coords = [q, r, s]
-    elif return_obj_type.lower() == "dict":
-        linint_coords = {"q":q, "r":r, "s":s}
-        
-    return linint_coords
+    if return_obj_type.lower() == "list":
+        return [col, row]
+    if return_obj_type.lower() == "dict":
+        return {"col":col, "row":row}
+    return (col, row)
 
 
-def round_container(container:dict|list|set|tuple|RectCoords,
-                d:int=0) -> dict|list|set|tuple|RectCoords:
+def offset_to_cube_batch(cols:list|tuple|array|memoryview, rows:list|tuple|array|memoryview, 
+                         offset:str="even-q") -> tuple:
     """
-    Rounds each number in a container to the specified decimal, if None is 
-    specified to the nearest Integer. For Dictionaries rounds each value or
-    each value in a container, assigned as a value. Does not work for nested 
-    Dictionaries.
+    Converts many offset coordinates at once, the columns and rows being 
+    passed as two parallel sequences, for example arrays or memoryviews of 
+    a network or file buffer. Returns the cube coordinates as three arrays, 
+    without creating a Tuple per tile, so the arrays can be passed on as 
+    buffers, or indexed like the columns of a TileSnapshot.
     
     Parameters:
     -----------
-    container : Dictionary | List | Set | Tuple | RectCoords
-        Built-in container or derived childclass.
+    cols : List | Tuple | array | memoryview
+        The column of each tile, Integers.
+        
+    rows : List | Tuple | array | memoryview
+        The row of each tile, Integers, same length as cols.
+        
+    offset : String, optional
+        'even-q' if even columns are shoved down by half a tile, 'odd-q' if 
+        odd columns are, defaults to 'even-q'.
         
-    d : Integer, optional
-        Number of decimals to round to, passed to built-in round function.
-    
     Raises:
     -------
     TypeError: 
-        If a different Object type is passed than a built in container or 
-        derived childclass thereof.
-    
+        If a column or row is not an Integer.
+        
+    ValueError: 
+        If cols and rows differ in length. If offset is neither 'even-q' nor 
+        'odd-q'.
+        
     Returns:
     --------
-    container(dict|list|set|tuple|RectCoords): 
-        Returns a container with each Float in it rounded to d decimal points.
+    q, r, s(Tuple): 
+        Three arrays of typecode "q" (signed Integer), the cube coordinates 
+        of the tiles in order.
     """
-    # case: container is list|set|tuple rounds every int|float in it -------- #
-    if isinstance(container, list|set|tuple):
-        rndd_lst = [round(x,d) if isinstance(x, float) else x for x in container]
-        if isinstance(container, list):
-            return rndd_lst
-        elif isinstance(container, set):
-            return set(rndd_lst)
-        elif isinstance(container, tuple):
-            return tuple(rndd_lst)
-    # case: container is dict rounds every int|float in it, or nested in ---- #
-    # list|set|tuple -------------------------------------------------------- #
-    elif isinstance(container, dict):
-        for key in container.keys():
-            if isinstance(container[key], float):
-                container[key] = round(container[key],d)
-            elif isinstance(container[key], list|set|tuple):
-                rndd_lst = [round(x,d) if isinstance(x, float) else x for x in container[key]]
-                if isinstance(container[key], list):
-                    container[key] = rndd_lst
-                elif isinstance(container[key], set):
-                    container[key] = set(rndd_lst)
-                elif isinstance(container[key], tuple):
-                    container[key] = tuple(rndd_lst)
-        return container
-    else:
-        raise TypeError("""container needs to be a general purpose built in 
-                        container, Dict, List, Set or Tuple or a childclass""")
+    even = _even_offset(offset)
+    if len(cols) != len(rows):
+        raise ValueError("cols and rows need to be of the same length.")
         
+    q = array("q", cols)
+    if even:
+        r = array("q", [row - ((col + 1) >> 1) for col, row in zip(q, rows)])
+    else:
+        r = array("q", [row - (col >> 1) for col, row in zip(q, rows)])
+    s = array("q", [-a - b for a, b in zip(q, r)])
+    
+    return (q, r, s)
 
-def round_hex(qrs:tuple|HexCoords, return_obj_type:str="Tuple") -> tuple|HexCoords|list|dict:
+
+def cube_to_offset_batch(q:list|tuple|array|memoryview, r:list|tuple|array|memoryview, 
+                         offset:str="even-q") -> tuple:
     """
-    Rounds each of the coordinates to the nearest Integer. 
-        
+    Converts many cube coordinates at once to offset coordinates, q and r 
+    being passed as two parallel sequences, for example the q and r arrays 
+    of a TileSnapshot, s being implied by the zero constraint. Returns the 
+    columns and rows as two arrays, without creating a Tuple per tile.
+    
     Parameters:
     -----------
-    qrs : Tuple | HexCoords | List
-        A Tuple or a Namedtuple containing 3 real numerical values.
+    q : List | Tuple | array | memoryview
+        The q coordinate of each tile, Integers.
         
-    return_obj_type : String, optional
-        If 'Coords', returns the rounded coordinates as HexCoords(Namedtuple), 
-        if 'Tuple' as a Tuple of shape (q, r, s), if 'List' as a List of 
-        length 3 and if 'Dict' returns a Dictionary, with the axis as keys.
+    r : List | Tuple | array | memoryview
+        The r coordinate of each tile, Integers, same length as q.
+        
+    offset : String, optional
+        'even-q' if even columns are shoved down by half a tile, 'odd-q' if 
+        odd columns are, defaults to 'even-q'.
         
     Raises:
     -------
-    TypeError:
-        If the Tuple contains different values than Integers or Float.
+    TypeError: 
+        If q or r contains a value, that is not an Integer.
         
-    ConstraintViolation: 
-        If the q+r+s=0 constraint is violated and the return is HexCoords.
+    ValueError: 
+        If q and r differ in length. If offset is neither 'even-q' nor 
+        'odd-q'.
         
     Returns:
     --------
-    rounded_qrs(Tuple|RectCoords|List|Dictionary): 
-        The input Tuple, each element rounded to the nearest Integer. 
+    cols, rows(Tuple): 
+        Two arrays of typecode "q" (signed Integer), the columns and rows of 
+        the tiles in order.
     """
-    if isinstance(qrs, dict):
-        q_f = qrs["q"]
-        r_f = qrs["r"]
-        s_f = qrs["s"]
-    elif isinstance(qrs, tuple|list):
-        q_f, r_f, s_f = qrs
-    else:
-        raise TypeError("""qrs needs to be a tuple or list of length 3, or a 
-                        dictionary having q, r and s as a key, the values being
-                        of type Integer or Float""")
+    even = _even_offset(offset)
+    if len(q) != len(r):
+        raise ValueError("q and r need to be of the same length.")
         
-    q = round(q_f)
-    r = round(r_f)
-    s = round(s_f)
-
-    q_diff = abs(q - q_f)
-    r_diff = abs(r - r_f)
-    s_diff = abs(s - s_f)
-
-    if q_diff > r_diff and q_diff > s_diff:
-        q = -r-s
-    elif r_diff > s_diff:
-        r = -q-s
+    cols = array("q", q)
+    if even:
+        rows = array("q", [b + ((a + 1) >> 1) for a, b in zip(cols, r)])
     else:
-        s = -q-r
-        
-    if return_obj_type.lower() == "tuple":
-        rounded_qrs = (q, r, s)
-    elif return_obj_type.lower() == "coords":
-        rounded_qrs = HexCoords(q, r, s)
-    elif return_obj_type.lower() == "list":
-        rounded_qrs = [q, r, s]
-    elif return_obj_type.lower() == "dict":
-        rounded_qrs = {"q":q, "r":r, "s":s}
+        rows = array("q", [b + (a >> 1) for a, b in zip(cols, r)])
         
-    return rounded_qrs
+    return (cols, rows)
 
 
-def get_xy(obj:object, return_obj_type:str="Tuple") -> tuple|RectCoords|list|dict:
+def _even_offset(offset:str) -> bool:
+    """
+    Return True for the 'even-q' and False for the 'odd-q' offset layout, 
+    raise a ValueError for any other value.
+    """
+    if not isinstance(offset, str) or offset.lower() not in ("even-q", "odd-q"):
+        raise ValueError("offset needs to be either 'even-q' or 'odd-q'.")
+    return offset.lower() == "even-q"
+    
+
+def hex_to_pixel(qrs:object|tuple|HexCoords, tile_width:int=64, tile_height:int=64, 
+                 return_obj_type:str="Tuple") -> tuple|RectCoords|list|dict:
     """
-    Returns values of attributes x and y of obj as Tuple, RectCoords, List or Dictionary.
+    Converts cube coordinates to pixel coordinates. 
     
     Parameters:
     -----------
-    obj : Object
-        An Object having attributes x and y, values being Integer or Float.
+    qrs : Object | Tuple | HexCoords
+        A Tuple consisting of an Integer or Float for the q, r and s value,
+        or an Object having a q, r and s attribute, the assigned values being an 
+        Integer or Float. Needs to adhere to zero constraint.
         
+    tile_width : Integer, optional
+        Specifies the width of a hexagon tile in pixel.
+    
+    tile_height : Integer, optional
+        Specifies the height of a hexagon tile in pixel.
+    
     return_obj_type : String, optional
-        If 'Coords', returns xy as RectCoords(Namedtuple), if 'Tuple' as a 
-        Tuple of shape (x, y), if 'List' as a List of length 2 and if 'Dict' 
-        returns a Dictionary, with the axis as keys.
-        
+        If 'Coords', returns the rect_linint as HexCoords(Namedtuple), if 
+        'Tuple' as a Tuple of shape (q, r, s), if 'List' as a List of length 3 and 
+        if 'Dict' returns a Dictionary, with the axis as keys.
+            
     Raises:
     -------
-    TypeError:
-        If values returned from Object attributes are not Integer or Float.
+    TypeError: 
+        If q, r or s is not an Integer or a Float. If a passed Tuple has
+        too many or too few individual values.
         
     AttributeError: 
-        If obj is missing x or y as attribute.
+        If an Object is passed, but is missing the coordinates attributes 
+        for the selected dimension.
+        
+    ConstraintViolation: 
+        If the selected coordinate system is 3-dimensional, but the 
+        q+r+s=0 constraint is violated.
         
     Returns:
     --------
-    xy(Tuple|RectCoords|List|Dictionary): The values of attributes x, y of obj.
+    xy(Tuple|RectCoords|List|Dictionary): 
+        The input coordinates of hexagon qrs converted to a 2-axis coordinates 
+        system xy.
     """
-    x = getattr(obj, "x")
-    y = getattr(obj, "y")
+    (q, r, s) = container_or_object(qrs, 3)
     
-    if not isinstance(x, int|float):
-        raise TypeError("obj returned a different type than Integer or Float as value for x")
-                            
-    if not isinstance(y, int|float):
-        raise TypeError("obj returned a different type than Integer or Float as value for y")
-            
+    test_type_and_constraints = HexCoords(q, r, s)
+    del test_type_and_constraints
+        
+    x = round(((4/3)*q - (2/3)*r - (2/3)*s) * tile_width * 0.375)
+    y = round((r - s) * tile_height * 0.5)
+        
     if return_obj_type.lower() == "tuple":
         xy = (x, y)
     elif return_obj_type.lower() == "coords":
@@ -1018,86 +3707,128 @@ def get_xy(obj:object, return_obj_type:str="Tuple") -> tuple|RectCoords|list|dic
         xy = {"x":x,"y":y}
         
     return xy
+    
 
-
-def set_xy(obj:object, x:int|float, y:int|float) -> None:
+def sync_xy(obj_grp:list|set, tile_width:int=64, tile_height:int=64, 
+            offset:object|tuple|RectCoords=(0, 0), layout:HexLayout=None) -> None:
     """
-    Set x and y attribute of obj to specified values.
-    
+    Sets the x and y attributes of every Object in obj_grp to the pixel 
+    coordinates of its q, r and s attributes, as hex_to_pixel plus offset 
+    would, e.g. after loading or scrolling a map. All Objects are validated 
+    in one pass before any of them is changed, afterwards the positions are 
+    converted and written in a second pass, without calling get_qrs, 
+    hex_to_pixel and set_xy per Object.
+        
     Parameters:
     -----------
-    obj : Object
-        An Object having attributes x and y, values being Integer or Float.
+    obj_grp : List | Set | SpriteGroup(Pygame-CE)
+        A container containing Objects having q, r and s attributes, that 
+        need to adhere to the zero constraint.
         
-    x : Integer | Float
-        The value the x-coordinate is to be set to.
+    tile_width : Integer, optional
+        Specifies the width of a hexagon tile in pixel. Ignored if layout is 
+        passed.
+    
+    tile_height : Integer, optional
+        Specifies the height of a hexagon tile in pixel. Ignored if layout is 
+        passed.
         
-    y : Integer | Float
-        The value the y-coordinate is to be set to.
+    offset : Object | Tuple | RectCoords, optional
+        Added to each pixel position, e.g. the negative camera position. Added 
+        to the origin of layout, if layout is passed.
+        
+    layout : HexLayout, optional
+        If passed, its tile size and origin are used for the conversion.
         
     Raises:
     -------
     TypeError: 
-        If x or y is not an Integer or Float.
+        If q, r or s of one of the Objects is not an Integer or a Float.
+        
+    AttributeError: 
+        If one of the Objects is missing a q, r or s attribute.
+        
+    ConstraintViolation: 
+        If the q+r+s=0 constraint is violated by one of the Objects.
         
     Returns:
     --------
     None
     """
+    (o_x, o_y) = container_or_object(offset, 2)
+    if not isinstance(o_x, int|float) or not isinstance(o_y, int|float):
+        raise TypeError("offset needs to consist of Integers or Floats.")
+        
+    if layout is None:
+        layout = HexLayout(tile_width, tile_height, (o_x, o_y))
+    elif o_x or o_y:
+        layout = HexLayout(layout.tile_width, layout.tile_height, 
+                           (layout.origin_x + o_x, layout.origin_y + o_y))
+        
+    # validate every Object before changing any of them --------------------- #
+    objs = list(obj_grp)
+    qrs_lst = [(obj.q, obj.r, obj.s) for obj in objs]
     
-    if not isinstance(x, int|float):
-        raise TypeError("x needs to be of type Integer or Float")
-    if not isinstance(y, int|float):
-        raise TypeError("y needs to be of type Integer or Float")
-
-    setattr(obj, "x", x)
-    setattr(obj, "y", y)
+    if not {c.__class__ for qrs in qrs_lst for c in qrs} <= {int, float}:
+        # complete test of each Object to raise the matching error ---------- #
+        for obj in objs:
+            container_or_object(obj, 3)
+            
+    if any(q + r + s for (q, r, s) in qrs_lst):
+        for obj, (q, r, s) in zip(objs, qrs_lst):
+            if q + r + s != 0:
+                raise ConstraintViolation(str(obj) + ", violates the constraint q+r+s=0.")
         
-    
-def get_qrs(obj:object, return_obj_type:str="Tuple") -> tuple|HexCoords|list|dict:
+    for obj, (x, y) in zip(objs, layout.to_pixel_batch(qrs_lst)):
+        obj.x = x
+        obj.y = y
+        
+
+def pixel_to_hex(xy:object|tuple|RectCoords, tile_width:int=64, tile_height:int=64,
+                 return_obj_type:str="Tuple") -> tuple|HexCoords|list|dict:
     """
-    Returns values of attributes q, r and s of obj as Tuple, RectCoords, List or Dictionary.
+    Converts pixel coordinates to cube coordinates.
         
     Parameters:
     -----------
-    obj : object
-        An Object having attributes q, r and s, values being Integer or Float. If 
-        set to return HexCoords, needs to adhere to zero constraint.
+    xy : Object | Tuple | RectCoords
+        A Tuple consisting of an Integer or Float for the x and y value,
+        or an Object having a x and y attribute, the assigned values being 
+        an Integer or Float.
         
+    tile_width : Integer, optional
+        Specifies the width of a hexagon tile in pixel.
+    
+    tile_height : Integer, optional
+        Specifies the height of a hexagon tile in pixel.
+    
     return_obj_type : String, optional
-        If 'Coords', returns the rect_linint as HexCoords(Namedtuple), if 
-        'Tuple' as a Tuple of shape (q, r, s), if 'List' as a List of length 3 and 
-        if 'Dict' returns a Dictionary, with the axis as keys.
+        If 'Coords', returns the coordinates as HexCoords(Namedtuple), if 
+        'Tuple' as a Tuple of shape (q, r, s), if 'List' as a List of length 3 
+        and if 'Dict' returns a Dictionary, with the axis as keys.
         
     Raises:
     -------
-    TypeError:
-        If q, r or s is not an Integer or Float.
-    
+    TypeError: 
+        If x or y is not an Integer or a Float. If a passed Tuple has
+        too many or too few individual values.
+        
     AttributeError: 
-        If obj is missing q, r or s as attribute.
-    
-    ConstraintViolation: 
-        If set to return HexCoords and the q+r+s=0 constraint is violated.
+        If an Object is passed, but is missing the x or y coordinate attribute.
         
     Returns:
     --------
-    qrs(Tuple|HexCoords|List|Dictionary): 
-        The values of attributes q, r, s of obj as Tuple, RectCoords, List or Dictionary.
+    qrs(Tuple|RectCoords|List|Dictionary): 
+        The input cartesian coordinates Tuple of xy converted to a 
+        cube coordinates system qrs.
     """
-    q = getattr(obj, "q")
-    r = getattr(obj, "r")
-    s = getattr(obj, "s")
-    
-    if not isinstance(q, int|float):
-        raise TypeError("obj returned a different type than Integer or Float as value for q")
+
+    x, y = container_or_object(xy, 2)
         
-    if not isinstance(r, int|float):
-        raise TypeError("obj returned a different type than Integer or Float as value for r")
+    q = round((x / 2) / tile_width * (8 / 3))
+    r = round((y / 2 - x / 4) / tile_height * 2)
+    s = round(-q-r)
         
-    if not isinstance(s, int|float):
-        raise TypeError("obj returned a different type than Integer or Float as value for s")
-            
     if return_obj_type.lower() == "tuple":
         qrs = (q, r, s)
     elif return_obj_type.lower() == "coords":
@@ -1108,170 +3839,328 @@ def get_qrs(obj:object, return_obj_type:str="Tuple") -> tuple|HexCoords|list|dic
         qrs = {"q":q, "r":r, "s":s}
         
     return qrs
-    
 
-def set_qrs(obj:object, q:int|float, r:int|float, s:int|float) -> None:
+    
+def pick_hex(xy:object|tuple|RectCoords, tile_width:int=64, tile_height:int=64,
+             return_obj_type:str="Tuple") -> tuple|HexCoords|list|dict:
     """
-    Set q, r and s attribute of obj to specified values. Input needs to adhere 
-    to zero constraint.
+    Returns the cube coordinates of the hexagon containing the pixel xy, 
+    correct up to the corners of each hexagon, in contrast to pixel_to_hex, 
+    which rounds q and r independently. Integer pixels are looked up in a 
+    periodic label raster, precomputed once per tile size, that maps the 
+    pixel offset within one period of the grid to the hexagon containing it. 
+    Pixels with a fractional part are classified with the same exact integer 
+    arithmetic used to build the raster.
         
     Parameters:
     -----------
-    obj : Object
-        An Object intended to be located on a hexagonal grid.
-        
-    q : Integer | Float
-        The value the q-coordinate is to be set to, needs to adhere to zero-
-        constraint.
-        
-    r : Integer | Float
-        The value the r-coordinate is to be set to, needs to adhere to zero-
-        constraint.
+    xy : Object | Tuple | RectCoords
+        A Tuple consisting of an Integer or Float for the x and y value,
+        or an Object having a x and y attribute, the assigned values being 
+        an Integer or Float.
         
-    s : Integer | Float
-        The value the s-coordinate is to be set to, needs to adhere to zero-
-        constraint.
+    tile_width : Integer, optional
+        Specifies the width of a hexagon tile in pixel.
+    
+    tile_height : Integer, optional
+        Specifies the height of a hexagon tile in pixel.
+    
+    return_obj_type : String, optional
+        If 'Coords', returns the coordinates as HexCoords(Namedtuple), if 
+        'Tuple' as a Tuple of shape (q, r, s), if 'List' as a List of length 3 
+        and if 'Dict' returns a Dictionary, with the axis as keys.
         
     Raises:
     -------
     TypeError: 
-        If q, r or s is not an Integer or Float.
-    
-    ConstraintViolation: 
-        If the q+r+s=0 constraint is violated.
+        If x or y is not an Integer or a Float. If a passed Tuple has
+        too many or too few individual values. If tile_width or tile_height 
+        is not an Integer.
+        
+    ValueError: 
+        If tile_width or tile_height is not positive.
+        
+    AttributeError: 
+        If an Object is passed, but is missing the x or y coordinate attribute.
         
     Returns:
     --------
-    None
-    """ 
-    test_type_and_constraints = HexCoords(q, r, s)
-    del test_type_and_constraints
+    qrs(Tuple|HexCoords|List|Dictionary): 
+        The cube coordinates of the hexagon containing xy.
+    """
+    x, y = container_or_object(xy, 2)
     
-    setattr(obj, "q", q)
-    setattr(obj, "r", r)
-    setattr(obj, "s", s)
+    if not isinstance(x, int|float) or not isinstance(y, int|float):
+        raise TypeError("x and y need to be of type Integer or Float.")
+    
+    q, r = _pick(x, y, pick_raster(tile_width, tile_height))
+        
+    rot = return_obj_type.lower()
     
+    if rot == "tuple":
+        qrs = (q, r, -q-r)
+    elif rot == "coords":
+        qrs = HexCoords(q, r, -q-r)
+    elif rot == "list":
+        qrs = [q, r, -q-r]
+    elif rot == "dict":
+        qrs = {"q":q, "r":r, "s":-q-r}
+        
+    return qrs
 
-def hex_to_pixel(qrs:object|tuple|HexCoords, tile_width:int=64, tile_height:int=64, 
-                 return_obj_type:str="Tuple") -> tuple|RectCoords|list|dict:
+
+def pick_hex_batch(xys:list|tuple, tile_width:int=64, tile_height:int=64) -> list:
     """
-    Converts cube coordinates to pixel coordinates. 
-    
+    Returns a List containing the cube coordinates of the hexagon containing 
+    each pixel in xys, as Tuples of shape (q, r, s), in the same order. 
+    Identical to calling pick_hex for each pixel, but the label raster is 
+    fetched once.
+        
     Parameters:
     -----------
-    qrs : Object | Tuple | HexCoords
-        A Tuple consisting of an Integer or Float for the q, r and s value,
-        or an Object having a q, r and s attribute, the assigned values being an 
-        Integer or Float. Needs to adhere to zero constraint.
+    xys : List | Tuple | Iterable
+        An Iterable of Tuples of shape (x, y), the values being an Integer or 
+        Float.
         
     tile_width : Integer, optional
         Specifies the width of a hexagon tile in pixel.
     
     tile_height : Integer, optional
         Specifies the height of a hexagon tile in pixel.
-    
-    return_obj_type : String, optional
-        If 'Coords', returns the rect_linint as HexCoords(Namedtuple), if 
-        'Tuple' as a Tuple of shape (q, r, s), if 'List' as a List of length 3 and 
-        if 'Dict' returns a Dictionary, with the axis as keys.
-            
+        
     Raises:
     -------
     TypeError: 
-        If q, r or s is not an Integer or a Float. If a passed Tuple has
-        too many or too few individual values.
+        If tile_width or tile_height is not an Integer.
         
-    AttributeError: 
-        If an Object is passed, but is missing the coordinates attributes 
-        for the selected dimension.
+    ValueError: 
+        If tile_width or tile_height is not positive.
         
-    ConstraintViolation: 
-        If the selected coordinate system is 3-dimensional, but the 
-        q+r+s=0 constraint is violated.
+    Returns:
+    --------
+    qrs_lst(List): 
+        A List of Tuples of shape (q, r, s).
+    """
+    raster = pick_raster(tile_width, tile_height)
+    
+    qrs_lst = list()
+    for (x, y) in xys:
+        q, r = _pick(x, y, raster)
+        qrs_lst.append((q, r, -q-r))
+        
+    return qrs_lst
+
+
+@lru_cache(maxsize=16)
+def pick_raster(tile_width:int=64, tile_height:int=64) -> tuple:
+    """
+    Returns the periodic label raster used by pick_hex for a tile size, cached 
+    per tile size. The hexagon grid repeats itself every 3 * tile_width pixels 
+    along the x-axis (q + 4, r - 2) and every tile_height pixels along the 
+    y-axis (r + 1), so one period of 3 * tile_width * tile_height pixels 
+    describes every pixel of the grid.
+        
+    Parameters:
+    -----------
+    tile_width : Integer, optional
+        Specifies the width of a hexagon tile in pixel.
+    
+    tile_height : Integer, optional
+        Specifies the height of a hexagon tile in pixel.
+        
+    Raises:
+    -------
+    TypeError: 
+        If tile_width or tile_height is not an Integer.
+        
+    ValueError: 
+        If tile_width or tile_height is not positive.
         
     Returns:
     --------
-    xy(Tuple|RectCoords|List|Dictionary): 
-        The input coordinates of hexagon qrs converted to a 2-axis coordinates 
-        system xy.
+    raster(Tuple): 
+        A Tuple of shape (tile_width, tile_height, labels_q, labels_r), the 
+        labels being arrays of signed chars, indexed by y * 3 * tile_width + x, 
+        containing the q and r coordinate of the hexagon containing pixel 
+        (x, y) of the period.
+    """
+    if not isinstance(tile_width, int) or not isinstance(tile_height, int):
+        raise TypeError("tile_width and tile_height need to be of type Integer.")
+    if tile_width < 1 or tile_height < 1:
+        raise ValueError("tile_width and tile_height need to be positive.")
+    
+    labels_q = array("b")
+    labels_r = array("b")
+    
+    for y in range(0, tile_height):
+        for x in range(0, 3 * tile_width):
+            q, r = _exact_pick(x, y, tile_width, tile_height)
+            labels_q.append(q)
+            labels_r.append(r)
+            
+    return (tile_width, tile_height, labels_q, labels_r)
+
+
+def _exact_pick(x:int, y:int, tile_width:int, tile_height:int) -> tuple:
+    """
+    Cube rounding of pixel (x, y) in Integer arithmetic, all fractional cube 
+    coordinates being scaled by d = 3 * tile_width * tile_height. Ties are 
+    resolved in the same order as round_hex.
     """
-    (q, r, s) = container_or_object(qrs, 3)
+    d = 3 * tile_width * tile_height
+    q_f = 4 * x * tile_height
+    r_f = 3 * y * tile_width - 2 * x * tile_height
+    s_f = -q_f - r_f
     
-    test_type_and_constraints = HexCoords(q, r, s)
-    del test_type_and_constraints
-        
-    x = round(((4/3)*q - (2/3)*r - (2/3)*s) * tile_width * 0.375)
-    y = round((r - s) * tile_height * 0.5)
-        
-    if return_obj_type.lower() == "tuple":
-        xy = (x, y)
-    elif return_obj_type.lower() == "coords":
-        xy = RectCoords(x, y)
-    elif return_obj_type.lower() == "list":
-        xy = [x, y]
-    elif return_obj_type.lower() == "dict":
-        xy = {"x":x,"y":y}
+    # round half up to the nearest multiple of d ---------------------------- #
+    q = (2 * q_f + d) // (2 * d)
+    r = (2 * r_f + d) // (2 * d)
+    s = (2 * s_f + d) // (2 * d)
+    
+    q_diff = abs(q * d - q_f)
+    r_diff = abs(r * d - r_f)
+    s_diff = abs(s * d - s_f)
+    
+    if q_diff > r_diff and q_diff > s_diff:
+        q = -r-s
+    elif r_diff > s_diff:
+        r = -q-s
         
-    return xy
+    return (q, r)
+
+
+def _pick(x:int|float, y:int|float, raster:tuple) -> tuple:
+    """
+    Returns (q, r) of the hexagon containing pixel (x, y), looked up in raster 
+    if x and y are Integers.
+    """
+    (tile_width, tile_height, labels_q, labels_r) = raster
+    period_x = 3 * tile_width
     
+    if x.__class__ is int and y.__class__ is int:
+        b_x, o_x = divmod(x, period_x)
+        b_y, o_y = divmod(y, tile_height)
+        i = o_y * period_x + o_x
+        return (4 * b_x + labels_q[i], b_y - 2 * b_x + labels_r[i])
+    
+    # fractional pixels, scale to Integers by the denominators -------------- #
+    (x_n, x_d) = float(x).as_integer_ratio()
+    (y_n, y_d) = float(y).as_integer_ratio()
+    return _exact_pick(x_n * y_d, y_n * x_d, tile_width * x_d * y_d, tile_height * x_d * y_d)
 
-def pixel_to_hex(xy:object|tuple|RectCoords, tile_width:int=64, tile_height:int=64,
-                 return_obj_type:str="Tuple") -> tuple|HexCoords|list|dict:
+
+def in_rect(rect:object|tuple, tile_width:int=64, tile_height:int=64, 
+            return_obj_type:str="Tuple", clip_coords:set|None=None):
     """
-    Converts pixel coordinates to cube coordinates.
+    Generator yielding the cube coordinates of every hexagon overlapping a 
+    rectangle in pixel coordinates, e.g. the camera of a scrolling map. Rows 
+    are yielded from top to bottom, each row from left to right, a row being 
+    all hexagons with the same center y, which is a stable order for drawing. 
+    The hexagons are enumerated directly from the rectangle, so the cost is 
+    proportional to the number of visible hexagons, not the size of the map. 
+    A hexagon is considered overlapping if its bounding box of tile_width 
+    times tile_height pixels, centered on hex_to_pixel, overlaps the rectangle. 
+    The rounded centers of hex_to_pixel are used, so hexagons at the border 
+    are the same as when testing hex_to_pixel of every hexagon, also for 
+    tile sizes like 33, whose unrounded centers are fractional.
         
     Parameters:
     -----------
-    xy : Object | Tuple | RectCoords
-        A Tuple consisting of an Integer or Float for the x and y value,
-        or an Object having a x and y attribute, the assigned values being 
-        an Integer or Float.
+    rect : Tuple | Rect(Pygame-CE)
+        A Tuple of shape (x, y, width, height), the values being an Integer or 
+        Float, or an Object having x, y, width and height attributes. The right 
+        and bottom border at x + width and y + height are exclusive.
         
     tile_width : Integer, optional
         Specifies the width of a hexagon tile in pixel.
     
     tile_height : Integer, optional
         Specifies the height of a hexagon tile in pixel.
-    
+        
     return_obj_type : String, optional
-        If 'Coords', returns the coordinates as HexCoords(Namedtuple), if 
-        'Tuple' as a Tuple of shape (q, r, s), if 'List' as a List of length 3 
-        and if 'Dict' returns a Dictionary, with the axis as keys.
+        If 'Coords', yields the coordinates as HexCoords(Namedtuple), if 
+        'Tuple' as a Tuple of shape (q, r, s), if 'List' as List of shape 
+        [q, r, s] and if 'Dict' in shape {"q":q, "r":r, "s":s}.
+        
+    clip_coords : Set | Dictionary, optional
+        A container of (q, r, s) Tuples supporting membership tests, e.g. all 
+        coordinates of a map. If passed, only coordinates contained in it are 
+        yielded.
         
     Raises:
     -------
     TypeError: 
-        If x or y is not an Integer or a Float. If a passed Tuple has
-        too many or too few individual values.
+        If rect is neither a Tuple of length 4 nor an Object, or its values 
+        are not Integers or Floats.
         
     AttributeError: 
-        If an Object is passed, but is missing the x or y coordinate attribute.
+        If an Object is passed, but is missing the x, y, width or height 
+        attribute.
         
-    Returns:
-    --------
-    qrs(Tuple|RectCoords|List|Dictionary): 
-        The input cartesian coordinates Tuple of xy converted to a 
-        cube coordinates system qrs.
+    Yields:
+    -------
+    qrs(Tuple|HexCoords|List|Dictionary): 
+        The cube coordinates of the hexagons overlapping rect.
     """
+    if isinstance(rect, tuple|list):
+        if len(rect) != 4:
+            raise TypeError("rect needs to be either an Object having attributes x, y, width and height or a Tuple of length 4")
+        (x, y, width, height) = rect
+    elif isinstance(rect, (int, float, complex, str, range, bytes, 
+                           bytearray, memoryview, bool, dict, set, frozenset)):
+        raise TypeError("rect needs to be either an Object having attributes x, y, width and height or a Tuple of length 4")
+    else:
+        x = getattr(rect, "x")
+        y = getattr(rect, "y")
+        width = getattr(rect, "width")
+        height = getattr(rect, "height")
+        
+    for value in (x, y, width, height):
+        if not isinstance(value, int|float):
+            raise TypeError("x, y, width and height of rect need to be of type Integer or Float.")
+            
+    # centers at x = 0.75 * tile_width * q, y = tile_height * (2r + q) / 2, - #
+    # widened by one, as hex_to_pixel rounds the centers -------------------- #
+    q_min = floor((x - tile_width / 2) / (0.75 * tile_width))
+    q_max = ceil((x + width + tile_width / 2) / (0.75 * tile_width))
+    k_min = floor(2 * y / tile_height - 1)
+    k_max = ceil(2 * (y + height) / tile_height + 1)
+    
+    return _in_rect(q_min, q_max, k_min, k_max, (x, y, width, height), tile_width, tile_height, 
+                    return_obj_type.lower(), clip_coords)
 
-    x, y = container_or_object(xy, 2)
-        
-    q = round((x / 2) / tile_width * (8 / 3))
-    r = round((y / 2 - x / 4) / tile_height * 2)
-    s = round(-q-r)
-        
-    if return_obj_type.lower() == "tuple":
-        qrs = (q, r, s)
-    elif return_obj_type.lower() == "coords":
-        qrs = HexCoords(q, r, s)
-    elif return_obj_type.lower() == "list":
-        qrs = [q, r, s]
-    elif return_obj_type.lower() == "dict":
-        qrs = {"q":q, "r":r, "s":s}
-        
-    return qrs
 
-    
+def _in_rect(q_min:int, q_max:int, k_min:int, k_max:int, rect:tuple, tile_width:int, 
+             tile_height:int, rot:str, clip_coords:set|None):
+    """
+    Generator behind in_rect, yields rows k = 2r + q from k_min to k_max, in 
+    each row the columns q_min to q_max with the same parity as k, whose 
+    bounding box around the rounded center of hex_to_pixel overlaps rect.
+    """
+    (x, y, width, height) = rect
+    (half_width, half_height) = (tile_width / 2, tile_height / 2)
+    for k in range(k_min, k_max+1):
+        for q in range(q_min + (q_min - k) % 2, q_max+1, 2):
+            r = (k - q) // 2
+            s = -q-r
+            # same expressions as hex_to_pixel ------------------------------ #
+            center_x = round(((4/3)*q - (2/3)*r - (2/3)*s) * tile_width * 0.375)
+            center_y = round((r - s) * tile_height * 0.5)
+            if not (center_x - half_width < x + width and center_x + half_width > x 
+                    and center_y - half_height < y + height and center_y + half_height > y):
+                continue
+            if clip_coords is not None and (q, r, s) not in clip_coords:
+                continue
+            if rot == "tuple":
+                yield (q, r, s)
+            elif rot == "coords":
+                yield HexCoords(q, r, s)
+            elif rot == "list":
+                yield [q, r, s]
+            elif rot == "dict":
+                yield {"q":q, "r":r, "s":s}
+                
+                
 def get_angle(obj_a:object|tuple|RectCoords|HexCoords, obj_b:object|tuple|RectCoords|HexCoords, 
               expected_len_a:int=3, expected_len_b:int=3, unit:str="deg") -> float:
     """
@@ -1406,32 +4295,347 @@ def neighbors(qrs:object|tuple|HexCoords, return_obj_type:str="Tuple") -> set:
                  [q-1,r+1,s], 
                  [q,r+1,s-1])
         
-    elif return_obj_type.lower() == "dict":
-        nbors = {0:{"q":q+1, "r":r, "s":s-1}, 
-                 1:{"q":q+1, "r":r-1, "s":s}, 
-                 2:{"q":q, "r":r-1, "s":s+1}, 
-                 3:{"q":q-1, "r":r, "s":s+1}, 
-                 4:{"q":q-1, "r":r+1, "s":s}, 
-                 5:{"q":q, "r":r+1, "s":s-1}}
+    elif return_obj_type.lower() == "dict":
+        nbors = {0:{"q":q+1, "r":r, "s":s-1}, 
+                 1:{"q":q+1, "r":r-1, "s":s}, 
+                 2:{"q":q, "r":r-1, "s":s+1}, 
+                 3:{"q":q-1, "r":r, "s":s+1}, 
+                 4:{"q":q-1, "r":r+1, "s":s}, 
+                 5:{"q":q, "r":r+1, "s":s-1}}
+        
+    return nbors
+    
+
+def distance(obj_a:object|tuple|HexCoords, obj_b:object|tuple|HexCoords) -> int|float:
+    """
+    Returns distance from one Object to another in a cube coordinate system.
+        
+    Parameters:
+    -----------
+    obj_a : Object | Tuple | Object
+        A Tuple consisting of an Integer or Float for the q, r and s value,
+        or an Object having a q, r and s attribute, the assigned values being an 
+        Integer or Float. Needs to adhere to zero constraint.
+        
+    obj_b : Object | Tuple | Object
+        A Tuple consisting of an Integer or Float for the q, r and s value,
+        or an Object having a q, r and s attribute, the assigned values being an 
+        Integer or Float. Needs to adhere to zero constraint.
+        
+    Raises:
+    -------
+    TypeError: 
+        If q, r or s is not an Integer or a Float. If a passed Tuple has
+        too many or too few individual values.
+        
+    AttributeError: 
+        If an Object is passed, but is missing the q, r or s coordinate attributes.
+        
+    ConstraintViolation: 
+        If the q+r+s=0 constraint is violated.
+        
+    Returns:
+    --------
+    ab_dist(Integer|Float): The distance between obj_a and obj_b in hexagon tiles.
+    """
+    (a_q, a_r, a_s) = container_or_object(obj_a, 3)
+    (b_q, b_r, b_s) = container_or_object(obj_b, 3)
+        
+    q_diff = abs(a_q - b_q)
+    r_diff = abs(a_r - b_r)
+    s_diff = abs(a_s - b_s)
+    ab_dist = float_to_int(max(q_diff, r_diff, s_diff))
+        
+    return ab_dist
+    
+
+def in_range(obj:object|tuple|HexCoords, n:int, return_obj_type:str="Tuple", 
+             clip_coords:set|None=None) -> set:
+    """
+    Returns a Set containing the cube coordinates of every hexagon in distance 
+    n from obj. The coordinates are generated from a cached template of offsets 
+    for radius n, which is translated to obj, instead of testing every 
+    candidate in a cube for the zero constraint.
+        
+    Parameters:
+    -----------
+    obj : Object | Tuple | HexCoords
+        A Tuple consisting of an Integer or Float for the q, r and s value,
+        or an Object having a q, r and s attribute, the assigned values being an 
+        Integer or Float. Needs to adhere to zero constraint.
+        
+    n : Integer
+        An Integer limiting the distance to n moves from the obj.
+        
+    return_obj_type : String, optional
+        If 'Coords', returns the coordinates in the set as HexCoords(Namedtuple), 
+        if 'Tuple' as a Tuple of shape (q, r, s), if 'List' as List of shape 
+        [q, r, s] and if 'Dict' in shape {"q":q, "r":r, "s":s}.
+        
+    clip_coords : Set | Dictionary, optional
+        A container of (q, r, s) Tuples supporting membership tests, e.g. all 
+        coordinates of a map. If passed, only coordinates contained in it are 
+        returned, coordinates outside of it are never materialised.
+        
+    Raises:
+    -------
+    TypeError: 
+        If q, r or s is not an Integer or a Float. If a passed Tuple has
+        too many or too few individual values.
+        
+    AttributeError: 
+        If an Object is passed, but is missing the q, r or s coordinates 
+        attributes.
+        
+    ConstraintViolation: 
+        If the q+r+s=0 constraint is violated.
+        
+    Returns:
+    --------
+    hex_in_range(Set): 
+        A Set containing all cube coordinates within distance n from obj.
+    """
+    (o_q, o_r, o_s) = container_or_object(obj, 3)
+    
+    if not isinstance(n, int|float):
+        raise TypeError("n needs to be an Integer, fractional distances not supported")
+    elif isinstance(n, float):
+        if not n.is_integer():
+            raise TypeError("n needs to be an Integer, fractional distances not supported")
+            
+    rot = return_obj_type.lower()
+    
+    # translate the cached offsets of radius n to the center coordinates ---- #
+    if clip_coords is None:
+        hex_in_range = [(o_q+q, o_r+r, o_s+s) for (q, r, s) in range_offsets(int(n))]
+    else:
+        # membership is tested per offset, no unclipped List is built ------- #
+        hex_in_range = [(o_q+q, o_r+r, o_s+s) for (q, r, s) in range_offsets(int(n)) 
+                        if (o_q+q, o_r+r, o_s+s) in clip_coords]
+    
+    if rot == "tuple":
+        return set(hex_in_range)
+    elif rot == "coords":
+        return {HexCoords(q, r, s) for (q, r, s) in hex_in_range}
+    elif rot == "list":
+        return [[q, r, s] for (q, r, s) in hex_in_range]
+    elif rot == "dict":
+        return [{"q":q, "r":r, "s":s} for (q, r, s) in hex_in_range]
+    # unknown return_obj_type, an empty List as before the offset templates - #
+    return list()
+    
+
+@lru_cache(maxsize=64)
+def range_offsets(n:int) -> tuple:
+    """
+    Returns a Tuple containing the offsets (dq, dr, ds) of every hexagon within 
+    distance n from (0, 0, 0), ordered by dq and then dr. Generated directly 
+    in O(n²) by limiting dr to the values satisfying the zero constraint and 
+    cached per radius, so repeated calls only translate the offsets.
+        
+    Parameters:
+    -----------
+    n : Integer
+        An Integer limiting the distance to n moves from (0, 0, 0). Negative 
+        values return an empty Tuple.
+        
+    Returns:
+    --------
+    offsets(Tuple): 
+        A Tuple containing Tuples of shape (dq, dr, ds).
+    """
+    offsets = list()
+    
+    for q in range(-n, n+1):
+        for r in range(max(-n, -q-n), min(n, -q+n)+1):
+            offsets.append((q, r, -q-r))
+            
+    return tuple(offsets)
+    
+
+def ring(center:object|tuple|HexCoords, k:int, return_obj_type:str="Tuple"):
+    """
+    Generator yielding the cube coordinates of every hexagon in exactly 
+    distance k from center, walking around the ring once. Nothing is 
+    allocated beyond the current coordinate, so callers can stop at the 
+    first match.
+        
+    Parameters:
+    -----------
+    center : Object | Tuple | HexCoords
+        A Tuple consisting of an Integer or Float for the q, r and s value,
+        or an Object having a q, r and s attribute, the assigned values being an 
+        Integer or Float. Needs to adhere to zero constraint.
+        
+    k : Integer
+        The distance of the ring from center. 0 yields center only.
+        
+    return_obj_type : String, optional
+        If 'Coords', yields the coordinates as HexCoords(Namedtuple), if 
+        'Tuple' as a Tuple of shape (q, r, s), if 'List' as List of shape 
+        [q, r, s] and if 'Dict' in shape {"q":q, "r":r, "s":s}.
+        
+    Raises:
+    -------
+    TypeError: 
+        If q, r or s is not an Integer or a Float. If a passed Tuple has
+        too many or too few individual values. If k is not an Integer.
+        
+    AttributeError: 
+        If an Object is passed, but is missing the q, r or s coordinates 
+        attributes.
+        
+    ConstraintViolation: 
+        If the q+r+s=0 constraint is violated.
+        
+    Yields:
+    -------
+    qrs(Tuple|HexCoords|List|Dictionary): 
+        The cube coordinates of the hexagons on the ring, 6 * k in total.
+    """
+    (c_q, c_r, c_s) = container_or_object(center, 3)
+    
+    if not isinstance(k, int|float):
+        raise TypeError("k needs to be an Integer, fractional distances not supported")
+    elif isinstance(k, float):
+        if not k.is_integer():
+            raise TypeError("k needs to be an Integer, fractional distances not supported")
+    
+    return _ring(c_q, c_r, c_s, int(k), return_obj_type.lower())
+
+
+def _ring(c_q:int|float, c_r:int|float, c_s:int|float, k:int, rot:str):
+    """
+    Generator behind ring and spiral, expects validated input, so the checks in 
+    ring are executed on call instead of on the first iteration.
+    """
+    if k < 0:
+        return
+    
+    if k == 0:
+        ring_coords = ((c_q, c_r, c_s),)
+    else:
+        # start at direction 4 (-q, +r) and walk k steps in each direction -- #
+        ring_coords = _ring_walk(c_q - k, c_r + k, c_s, k)
+    
+    for (q, r, s) in ring_coords:
+        if rot == "tuple":
+            yield (q, r, s)
+        elif rot == "coords":
+            yield HexCoords(q, r, s)
+        elif rot == "list":
+            yield [q, r, s]
+        elif rot == "dict":
+            yield {"q":q, "r":r, "s":s}
+            
+
+def _ring_walk(q:int|float, r:int|float, s:int|float, k:int):
+    """
+    Generator yielding the Tuples of a ring with distance k, starting at q, r, s 
+    and walking k steps along each of the six directions, in the order used by 
+    neighbors.
+    """
+    for (d_q, d_r, d_s) in ((1, 0, -1), (1, -1, 0), (0, -1, 1), 
+                            (-1, 0, 1), (-1, 1, 0), (0, 1, -1)):
+        for _ in range(k):
+            yield (q, r, s)
+            q += d_q
+            r += d_r
+            s += d_s
+            
+            
+def spiral(center:object|tuple|HexCoords, max_k:int, return_obj_type:str="Tuple"):
+    """
+    Generator yielding the cube coordinates of every hexagon within distance 
+    max_k from center in order of increasing distance, ring after ring, 
+    starting with center. Covers the same hexagons as in_range, without 
+    materialising the whole area.
+        
+    Parameters:
+    -----------
+    center : Object | Tuple | HexCoords
+        A Tuple consisting of an Integer or Float for the q, r and s value,
+        or an Object having a q, r and s attribute, the assigned values being an 
+        Integer or Float. Needs to adhere to zero constraint.
+        
+    max_k : Integer
+        The distance of the outermost ring from center.
+        
+    return_obj_type : String, optional
+        If 'Coords', yields the coordinates as HexCoords(Namedtuple), if 
+        'Tuple' as a Tuple of shape (q, r, s), if 'List' as List of shape 
+        [q, r, s] and if 'Dict' in shape {"q":q, "r":r, "s":s}.
+        
+    Raises:
+    -------
+    TypeError: 
+        If q, r or s is not an Integer or a Float. If a passed Tuple has
+        too many or too few individual values. If max_k is not an Integer.
+        
+    AttributeError: 
+        If an Object is passed, but is missing the q, r or s coordinates 
+        attributes.
+        
+    ConstraintViolation: 
+        If the q+r+s=0 constraint is violated.
         
-    return nbors
+    Yields:
+    -------
+    qrs(Tuple|HexCoords|List|Dictionary): 
+        The cube coordinates of the hexagons within distance max_k, ordered by 
+        distance from center.
+    """
+    (c_q, c_r, c_s) = container_or_object(center, 3)
+    
+    if not isinstance(max_k, int|float):
+        raise TypeError("max_k needs to be an Integer, fractional distances not supported")
+    elif isinstance(max_k, float):
+        if not max_k.is_integer():
+            raise TypeError("max_k needs to be an Integer, fractional distances not supported")
     
+    return _spiral(c_q, c_r, c_s, int(max_k), return_obj_type.lower())
 
-def distance(obj_a:object|tuple|HexCoords, obj_b:object|tuple|HexCoords) -> int|float:
+
+def _spiral(c_q:int|float, c_r:int|float, c_s:int|float, max_k:int, rot:str):
     """
-    Returns distance from one Object to another in a cube coordinate system.
+    Generator behind spiral, expects validated input.
+    """
+    for k in range(0, max_k+1):
+        yield from _ring(c_q, c_r, c_s, k, rot)
+        
+
+def line_draw(obj_a:object|tuple|HexCoords, obj_b:object|tuple|HexCoords, 
+              return_obj_type:str="Tuple", nudge:bool=False) -> tuple:
+    """
+    Draws a line from one hexagon to another, returns a Tuple containing the 
+    hexagons with the center closest to the line. Both endpoints are validated 
+    once, afterwards the line is rasterised by stepping along it with a fixed 
+    increment and rounding each sample in place, without calling cube_linint 
+    and round_hex per step.
         
     Parameters:
     -----------
-    obj_a : Object | Tuple | Object
+    obj_a : Object | Tuple | HexCoords
         A Tuple consisting of an Integer or Float for the q, r and s value,
-        or an Object having a q, r and s attribute, the assigned values being an 
-        Integer or Float. Needs to adhere to zero constraint.
+        or an Object having a q, r and s attribute, the assigned values being 
+        an Integer or Float. Needs to adhere to zero constraint.
         
-    obj_b : Object | Tuple | Object
+    obj_a : Object | Tuple | HexCoords
         A Tuple consisting of an Integer or Float for the q, r and s value,
-        or an Object having a q, r and s attribute, the assigned values being an 
-        Integer or Float. Needs to adhere to zero constraint.
+        or an Object having a q, r and s attribute, the assigned values being 
+        an Integer or Float. Needs to adhere to zero constraint.
+        
+    return_obj_type : String, optional
+        If 'Coords', returns the coordinates in the set as HexCoords(Namedtuple), 
+        if 'Tuple' as a Tuple of shape (q, r, s), if 'List' as List of shape 
+        [q, r, s] and if 'Dict' in shape {"q":q, "r":r, "s":s}.
+        
+    nudge : Boolean, optional
+        If True, both endpoints are shifted by (1e-6, 1e-6, -2e-6) before 
+        sampling, so lines running exactly along the edge between two hexagons 
+        consistently pick the same side, instead of alternating between both 
+        sides depending on floating point error. Defaults to False, which 
+        keeps the tiles returned by previous versions.
         
     Raises:
     -------
@@ -1440,40 +4644,97 @@ def distance(obj_a:object|tuple|HexCoords, obj_b:object|tuple|HexCoords) -> int|
         too many or too few individual values.
         
     AttributeError: 
-        If an Object is passed, but is missing the q, r or s coordinate attributes.
+        If an Object is passed, but is missing the q, r or s coordinates 
+        attributes.
         
     ConstraintViolation: 
         If the q+r+s=0 constraint is violated.
         
     Returns:
     --------
-    ab_dist(Integer|Float): The distance between obj_a and obj_b in hexagon tiles.
+    hex_line_coords(Tuple): 
+        A Tuple containing all cube cordinates from obj_a to obj_b inclusive.
     """
-    (a_q, a_r, a_s) = container_or_object(obj_a, 3)
-    (b_q, b_r, b_s) = container_or_object(obj_b, 3)
+    (q_a, r_a, s_a) = container_or_object(obj_a, 3)
+    (q_b, r_b, s_b) = container_or_object(obj_b, 3)
+    
+    ab_dist = float_to_int(max(abs(q_a - q_b), abs(r_a - r_b), abs(s_a - s_b)))
+    
+    if nudge:
+        q_a, r_a, s_a = q_a + 1e-6, r_a + 1e-6, s_a - 2e-6
+        q_b, r_b, s_b = q_b + 1e-6, r_b + 1e-6, s_b - 2e-6
+    
+    # per step increment, sampling is identical to cube_linint -------------- #
+    d_q = q_b - q_a
+    d_r = r_b - r_a
+    d_s = s_b - s_a
+    step = 1.0 / ab_dist if ab_dist else 0
         
-    q_diff = abs(a_q - b_q)
-    r_diff = abs(a_r - b_r)
-    s_diff = abs(a_s - b_s)
-    ab_dist = float_to_int(max(q_diff, r_diff, s_diff))
+    hex_line_lst = list()
         
-    return ab_dist
+    for i in range(0, ab_dist + 1):
+        t = step * i
+        q_f = q_a + d_q * t * 1.0
+        r_f = r_a + d_r * t * 1.0
+        s_f = s_a + d_s * t * 1.0
+        
+        # rounding identical to round_hex ----------------------------------- #
+        q = round(q_f)
+        r = round(r_f)
+        s = round(s_f)
+        
+        q_diff = abs(q - q_f)
+        r_diff = abs(r - r_f)
+        s_diff = abs(s - s_f)
+        
+        if q_diff > r_diff and q_diff > s_diff:
+            q = -r-s
+        elif r_diff > s_diff:
+            r = -q-s
+        else:
+            s = -q-r
+            
+        hex_line_lst.append((q, r, s))
+        
+    rot = return_obj_type.lower()
+    
+    if rot == "tuple":
+        hex_line_coords = tuple(hex_line_lst)
+    elif rot == "coords":
+        hex_line_coords = tuple(HexCoords(q, r, s) for (q, r, s) in hex_line_lst)
+    elif rot == "list":
+        hex_line_coords = tuple([q, r, s] for (q, r, s) in hex_line_lst)
+    elif rot == "dict":
+        hex_line_coords = tuple({"q":q, "r":r, "s":s} for (q, r, s) in hex_line_lst)
+        
+    return hex_line_coords
     
 
-def in_range(obj:object|tuple|HexCoords, n:int, return_obj_type:str="Tuple") -> set:
+def field_of_view(origin:object|tuple|HexCoords, radius:int, blockers:set|dict|Callable, 
+                  return_obj_type:str="Tuple") -> set:
     """
-    Returns a Set containing the cube coordinates of every hexagon in distance 
-    n from obj.
+    Returns a Set containing the cube coordinates of every hexagon within 
+    radius of origin, that can be seen from origin. Uses symmetric 
+    shadowcasting, adapted to hexagons: each of the six sextants around origin 
+    is scanned row by row, a row being the hexagons in the same distance, while 
+    the slopes of the shadows cast by blocking hexagons narrow the visible part 
+    of the following rows. Each hexagon is visited at most once per sextant, 
+    blocked ones are visible themselves, but hide the hexagons behind them.
         
     Parameters:
     -----------
-    obj : Object | Tuple | HexCoords
+    origin : Object | Tuple | HexCoords
         A Tuple consisting of an Integer or Float for the q, r and s value,
         or an Object having a q, r and s attribute, the assigned values being an 
         Integer or Float. Needs to adhere to zero constraint.
         
-    n : Integer
-        An Integer limiting the distance to n moves from the obj.
+    radius : Integer
+        An Integer limiting the distance of visible hexagons from origin.
+        
+    blockers : Set | Dictionary | Callable
+        Either a container of (q, r, s) Tuples of all hexagons blocking the 
+        line of sight, or a Callable taking a (q, r, s) Tuple and returning 
+        True if the hexagon blocks the line of sight.
         
     return_obj_type : String, optional
         If 'Coords', returns the coordinates in the set as HexCoords(Namedtuple), 
@@ -1484,7 +4745,7 @@ def in_range(obj:object|tuple|HexCoords, n:int, return_obj_type:str="Tuple") ->
     -------
     TypeError: 
         If q, r or s is not an Integer or a Float. If a passed Tuple has
-        too many or too few individual values.
+        too many or too few individual values. If radius is not an Integer.
         
     AttributeError: 
         If an Object is passed, but is missing the q, r or s coordinates 
@@ -1495,64 +4756,57 @@ def in_range(obj:object|tuple|HexCoords, n:int, return_obj_type:str="Tuple") ->
         
     Returns:
     --------
-    hex_in_range(Set): 
-        A Set containing all cube coordinates within distance n from obj.
+    visible(Set): 
+        A Set containing all cube coordinates visible from origin, including 
+        origin.
     """
-    (o_q, o_r, o_s) = container_or_object(obj, 3)
+    o_qrs = container_or_object(origin, 3)
     
-    if not isinstance(n, int|float):
-        raise TypeError("n needs to be an Integer, fractional distances not supported")
-    elif isinstance(n, float):
-        if not n.is_integer():
-            raise TypeError("n needs to be an Integer, fractional distances not supported")
+    if not isinstance(radius, int|float):
+        raise TypeError("radius needs to be an Integer, fractional distances not supported")
+    elif isinstance(radius, float):
+        if not radius.is_integer():
+            raise TypeError("radius needs to be an Integer, fractional distances not supported")
             
+    visible = _shadowcast(o_qrs, int(radius), _blocked_lookup(blockers))
+    
     rot = return_obj_type.lower()
-
-    hex_in_range = list()
-        
-    for q in range(-n, n+1):
-        for r in range(-n, n+1):
-            for s in range(-n, n+1):
-                if q + r + s == 0:
-                    if rot == "tuple":
-                        hex_in_range.append((o_q+q, o_r+r, o_s+s))
-                    elif rot == "coords":
-                        hex_in_range.append(HexCoords(o_q+q, o_r+r, o_s+s))
-                    elif rot == "list":
-                        hex_in_range.append([o_q+q, o_r+r, o_s+s])
-                    elif rot == "dict":
-                        hex_in_range.append({"q":o_q+q, "r":o_r+r, "s":o_s+s})
-                
-    return set(hex_in_range) if rot == "tuple" or rot == "coords" else hex_in_range
+    
+    if rot == "tuple":
+        return visible
+    elif rot == "coords":
+        return {HexCoords(q, r, s) for (q, r, s) in visible}
+    elif rot == "list":
+        return [[q, r, s] for (q, r, s) in visible]
+    elif rot == "dict":
+        return [{"q":q, "r":r, "s":s} for (q, r, s) in visible]
     
 
-def line_draw(obj_a:object|tuple|HexCoords, obj_b:object|tuple|HexCoords, return_obj_type:str="Tuple") -> tuple:
+def field_of_view_batch(origins:list|set, radius:int, blockers:set|dict|Callable) -> dict:
     """
-    Draws a line from one hexagon to another, returns a Tuple containing the 
-    hexagons with the center closest to the line.
+    Field of view for many observers sharing one blocker map. If blockers is a 
+    Callable, its result is memorised per hexagon, so it is called at most 
+    once per hexagon for all observers combined.
         
     Parameters:
     -----------
-    obj_a : Object | Tuple | HexCoords
-        A Tuple consisting of an Integer or Float for the q, r and s value,
-        or an Object having a q, r and s attribute, the assigned values being 
-        an Integer or Float. Needs to adhere to zero constraint.
+    origins : List | Set | SpriteGroup(Pygame-CE)
+        A container containing Objects or Tuples with q, r and s coordinates, 
+        that need to adhere to the zero constraint.
         
-    obj_a : Object | Tuple | HexCoords
-        A Tuple consisting of an Integer or Float for the q, r and s value,
-        or an Object having a q, r and s attribute, the assigned values being 
-        an Integer or Float. Needs to adhere to zero constraint.
+    radius : Integer
+        An Integer limiting the distance of visible hexagons from each origin.
         
-    return_obj_type : String, optional
-        If 'Coords', returns the coordinates in the set as HexCoords(Namedtuple), 
-        if 'Tuple' as a Tuple of shape (q, r, s), if 'List' as List of shape 
-        [q, r, s] and if 'Dict' in shape {"q":q, "r":r, "s":s}.
+    blockers : Set | Dictionary | Callable
+        Either a container of (q, r, s) Tuples of all hexagons blocking the 
+        line of sight, or a Callable taking a (q, r, s) Tuple and returning 
+        True if the hexagon blocks the line of sight.
         
     Raises:
     -------
     TypeError: 
         If q, r or s is not an Integer or a Float. If a passed Tuple has
-        too many or too few individual values.
+        too many or too few individual values. If radius is not an Integer.
         
     AttributeError: 
         If an Object is passed, but is missing the q, r or s coordinates 
@@ -1563,41 +4817,110 @@ def line_draw(obj_a:object|tuple|HexCoords, obj_b:object|tuple|HexCoords, return
         
     Returns:
     --------
-    hex_line_coords(Tuple): 
-        A Tuple containing all cube cordinates from obj_a to obj_b inclusive.
+    visible_dict(Dictionary): 
+        A Dictionary mapping the (q, r, s) Tuple of each origin to the Set 
+        of coordinates visible from it.
     """
-    (q_a, r_a, s_a) = container_or_object(obj_a, 3)
-    (q_b, r_b, s_b) = container_or_object(obj_b, 3)
+    if not isinstance(radius, int|float):
+        raise TypeError("radius needs to be an Integer, fractional distances not supported")
+    elif isinstance(radius, float):
+        if not radius.is_integer():
+            raise TypeError("radius needs to be an Integer, fractional distances not supported")
     
-    inp_a = HexCoords(q_a, r_a, s_a)
-    inp_b = HexCoords(q_b, r_b, s_b)
+    is_blocked = _blocked_lookup(blockers)
     
-    ab_dist = distance(inp_a, inp_b)
-        
-    hex_line_lst = list()
-        
-    for i in range(0, ab_dist + 1):
-        
-        try:
-            qrs_f = cube_linint(obj_a, obj_b, 1.0/ab_dist * i)
+    # memorise predicate results across all observers ----------------------- #
+    if callable(blockers):
+        memo = dict()
+        predicate = is_blocked
+        
+        def is_blocked(qrs):
+            try:
+                return memo[qrs]
+            except KeyError:
+                blocked = memo[qrs] = predicate(qrs)
+                return blocked
             
-        except ZeroDivisionError:
-            qrs_f = cube_linint(obj_a, obj_b, 0)
+    visible_dict = dict()
+    
+    for origin in origins:
+        o_qrs = container_or_object(origin, 3)
+        if o_qrs not in visible_dict:
+            visible_dict[o_qrs] = _shadowcast(o_qrs, int(radius), is_blocked)
             
-        item = round_hex(qrs_f)
+    return visible_dict
+    
+
+def _blocked_lookup(blockers:set|dict|Callable) -> Callable:
+    """
+    Returns a Callable testing whether a (q, r, s) Tuple blocks the line of 
+    sight, for blockers being either a Callable or a container of Tuples.
+    """
+    if callable(blockers):
+        return blockers
+    elif hasattr(blockers, "__contains__"):
+        return blockers.__contains__
+    else:
+        raise TypeError("blockers needs to be a Callable or a container of (q, r, s) Tuples")
         
-        if return_obj_type.lower() == "tuple":
-            hex_line_lst.append(item)
-        elif return_obj_type.lower() == "coords":
-            hex_line_lst.append(HexCoords(item[0], item[1], item[2]))
-        elif return_obj_type.lower() == "list":
-            hex_line_lst.append([item[0], item[1], item[2]])
-        elif return_obj_type.lower() == "dict":
-            hex_line_lst.append({"q":item[0], "r":item[1], "s":item[2]})
+
+def _shadowcast(o_qrs:tuple, radius:int, is_blocked:Callable) -> set:
+    """
+    Symmetric shadowcasting over the six sextants around o_qrs. Within sextant 
+    i, the hexagon at depth d and column j (0 <= j <= d) is located at 
+    o_qrs + d * direction[i] + j * direction[i+2]. Slopes are stored as 
+    Integer fractions (numerator, denominator), to keep comparisons exact.
+    """
+    (o_q, o_r, o_s) = o_qrs
+    visible = {o_qrs}
+    
+    if radius < 1:
+        return visible
+    
+    directions = ((1, 0, -1), (1, -1, 0), (0, -1, 1), 
+                  (-1, 0, 1), (-1, 1, 0), (0, 1, -1))
     
-    hex_line_coords = tuple(hex_line_lst)
+    for i in range(0, 6):
+        (a_q, a_r, a_s) = directions[i]
+        (b_q, b_r, b_s) = directions[(i + 2) % 6]
         
-    return hex_line_coords
+        # rows pending a scan: (depth, start_n, start_m, end_n, end_m) ------ #
+        rows = [(1, 0, 1, 1, 1)]
+        
+        while rows:
+            (d, st_n, st_m, en_n, en_m) = rows.pop()
+            
+            # columns with their center inside [start, end], ties inward ---- #
+            min_j = (2 * d * st_n + st_m) // (2 * st_m)
+            max_j = -((en_m - 2 * d * en_n) // (2 * en_m))
+            
+            prev_blocked = None
+            
+            for j in range(min_j, max_j + 1):
+                qrs = (o_q + d * a_q + j * b_q, 
+                       o_r + d * a_r + j * b_r, 
+                       o_s + d * a_s + j * b_s)
+                blocked = is_blocked(qrs)
+                
+                # blocked hexagons are always visible, open ones only if ---- #
+                # their center lies within the visible slopes --------------- #
+                if blocked or (j * st_m >= d * st_n and j * en_m <= d * en_n):
+                    visible.add(qrs)
+                    
+                if prev_blocked and not blocked:
+                    # shadow ends, left edge of this hexagon starts light --- #
+                    st_n, st_m = 2 * j - 1, 2 * d
+                    
+                if prev_blocked is False and blocked and d < radius:
+                    # shadow starts, scan the lit part up to here ----------- #
+                    rows.append((d + 1, st_n, st_m, 2 * j - 1, 2 * d))
+                    
+                prev_blocked = blocked
+                
+            if prev_blocked is False and d < radius:
+                rows.append((d + 1, st_n, st_m, en_n, en_m))
+                
+    return visible
     
 
 def dist_lim_flood_fill(start_obj:object|tuple|HexCoords, n:int, obj_grp:list|set, 
@@ -1616,13 +4939,16 @@ def dist_lim_flood_fill(start_obj:object|tuple|HexCoords, n:int, obj_grp:list|se
     n : Integer
         The number of moves from start_obj Object to fill.
         
-    obj_grp : List | Set | SpriteGroup(Pygame-CE)
+    obj_grp : List | Set | SpriteGroup(Pygame-CE) | TileSnapshot
         A container containing Objects in a cube coordinate system (tiles in tilemap).
-        They need to adhere to the zero constraint.
+        They need to adhere to the zero constraint. Or a TileSnapshot of such 
+        a container.
         
     movement_var : String, optional
         Variable name of the variable, which Objects in obj_grp have, that stores 
-        the movement cost. If the value is -1 the object is blocked.
+        the movement cost. If the value is -1 the object is blocked. If obj_grp 
+        is a TileSnapshot, the name of the extracted attribute, if it was not 
+        extracted, no tile is blocked.
         
     Raises:
     -------
@@ -1655,12 +4981,21 @@ def dist_lim_flood_fill(start_obj:object|tuple|HexCoords, n:int, obj_grp:list|se
                                start coordinates, needs to be and Integer or a Float
                                without a fractal part.""")
                                
-    for obj in obj_grp:
-        for coord in ["q", "r", "s"]:
-            if not hasattr(obj, coord):
-                raise AttributeError(str(obj) + ", is missing the " + str(coord) + " attribute.")
-            if not isinstance(getattr(obj, coord), int or float):
-                raise TypeError(coord, "of obj", obj, "must be either an Integer or Float.")
+    # movement_var of each tile, attributes are accessed once --------------- #
+    if isinstance(obj_grp, TileSnapshot):
+        if movement_var in obj_grp.columns:
+            column = obj_grp.columns[movement_var]
+            tile_costs = {qrs:column[row] for qrs, row in obj_grp.index.items()}
+        else:
+            tile_costs = dict()
+    else:
+        for obj in obj_grp:
+            for coord in ["q", "r", "s"]:
+                if not hasattr(obj, coord):
+                    raise AttributeError(str(obj) + ", is missing the " + str(coord) + " attribute.")
+                if not isinstance(getattr(obj, coord), int or float):
+                    raise TypeError(coord, "of obj", obj, "must be either an Integer or Float.")
+        tile_costs = {(obj.q, obj.r, obj.s):getattr(obj, movement_var, 1) for obj in obj_grp}
         
     visited = set()
     visited.add(start)
@@ -1671,18 +5006,422 @@ def dist_lim_flood_fill(start_obj:object|tuple|HexCoords, n:int, obj_grp:list|se
         for i in range(1,n+1):
             fringes.append([])
             for coords in fringes[i-1]:
-                for j in range(0,6):
-                    nbor_coords = neighbors(coords)[j]
-                    # get corresponding object to nbor_coords from obj_grp -- #
-                    nbor_obj = None
-                    for obj in obj_grp:
-                            if (obj.q, obj.r, obj.s) == nbor_coords:
-                                nbor_obj = obj
-                    blocked = getattr(nbor_obj, movement_var, 1) == -1
+                for nbor_coords in neighbors(coords):
+                    blocked = tile_costs.get(nbor_coords, 1) == -1
                     if nbor_coords not in visited:
                         if not blocked:
                             visited.add(nbor_coords)
                             fringes[i].append(nbor_coords)
     
     return visited
+    
+
+# tilemap loading ----------------------------------------------------------- #
+# binary tilemap record: q (int32), r (int32), movement_cost (float64) ------ #
+TILE_RECORD = struct.Struct("<iid")
+
+
+def load_tilemap(source:str|os.PathLike|object, file_format:str=None, 
+                 progress:Callable=None, progress_every:int=4096) -> GraphMatrix:
+    """
+    Streams the tiles of a tilemap file into a GraphMatrix, one record at a 
+    time, each tile being linked with its neighbors read before, so neither 
+    the whole file nor an Object per tile is held in memory. Peak memory 
+    stays proportional to the resulting GraphMatrix. A tile read again 
+    replaces the earlier one, its movement cost and whether it is in 
+    matrix_coords following the later record. Three formats are supported, 
+    one tile per record:
+    
+    'csv' : A header naming the columns q, r, optionally s and optionally 
+            movement_cost (1 if missing), followed by one row per tile.
+    'jsonl' : One JSON Object per line, with the keys q, r, optionally s and 
+              optionally movement_cost (1 if missing), blank lines skipped.
+    'bin' : Consecutive records of q and r as little endian signed 32 bit 
+            Integers and movement_cost as a little endian 64 bit Float, 
+            16 bytes each, see TILE_RECORD.
+    
+    Parameters:
+    -----------
+    source : String | PathLike | File
+        Path of the tilemap file, or a file opened in binary mode.
+        
+    file_format : String, optional
+        'csv', 'jsonl' or 'bin'. If not passed, inferred from the file 
+        extension of source, '.csv', '.jsonl' or '.ndjson' and '.bin'.
+        
+    progress : Callable, optional
+        Called as progress(tiles, bytes_read, total_bytes) every 
+        progress_every tiles and once after the last tile, total_bytes being 
+        None if the size of source is unknown.
+        
+    progress_every : Integer, optional
+        Number of tiles between two calls of progress, defaults to 4096.
+        
+    Raises:
+    -------
+    TypeError: 
+        If q, r or s of a record is not an Integer, or movement_cost is not 
+        an Integer or a Float. If progress_every is not an Integer.
+        
+    ValueError: 
+        If file_format is not supported or can't be inferred, if a record is 
+        malformed or missing q or r, if a binary file ends with an incomplete 
+        record, or if progress_every is not positive.
+        
+    ConstraintViolation: 
+        If a record contains s and the q+r+s=0 constraint is violated.
+        
+    Returns:
+    --------
+    GraphMatrix(object): 
+        Two-dimensional, directed, weighted graph, stored in a Dictionary.
+    """
+    if file_format is None:
+        name = source if isinstance(source, str|os.PathLike) else getattr(source, "name", "")
+        extension = os.path.splitext(str(name))[1].lower()
+        file_format = {".csv":"csv", ".jsonl":"jsonl", ".ndjson":"jsonl", ".bin":"bin"}.get(extension)
+    if not isinstance(file_format, str) or file_format.lower() not in ("csv", "jsonl", "bin"):
+        raise ValueError("file_format needs to be 'csv', 'jsonl' or 'bin'.")
+    if not isinstance(progress_every, int) or isinstance(progress_every, bool):
+        raise TypeError("progress_every needs to be of type Integer.")
+    if progress_every <= 0:
+        raise ValueError("progress_every needs to be positive.")
+        
+    if isinstance(source, str|os.PathLike):
+        with open(source, "rb") as file:
+            return _load_tilemap(file, file_format.lower(), progress, progress_every)
+    return _load_tilemap(source, file_format.lower(), progress, progress_every)
+
+
+def _load_tilemap(file:object, file_format:str, progress:Callable|None, 
+                  progress_every:int) -> GraphMatrix:
+    """
+    Link the records of file one by one into a new GraphMatrix, reporting 
+    progress, see load_tilemap.
+    """
+    try:
+        total_bytes = os.fstat(file.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        total_bytes = None
+    read = [0]
+    
+    if file_format == "bin":
+        records = _binary_records(file, read)
+    else:
+        lines = _counted_lines(file, read)
+        if file_format == "csv":
+            records = _csv_records(lines)
+        else:
+            records = _jsonl_records(lines)
+            
+    graph = GraphMatrix(())
+    tile_costs = dict()
+    tiles = 0
+    
+    for tile, cost in records:
+        graph._link_tile(tile, cost, tile_costs)
+        tiles += 1
+        if progress is not None and tiles % progress_every == 0:
+            progress(tiles, read[0], total_bytes)
+            
+    if progress is not None:
+        progress(tiles, read[0], total_bytes)
+        
+    return graph
+
+
+def _counted_lines(file:object, read:list):
+    """
+    Yield the lines of a binary file decoded as UTF-8, adding the number of 
+    bytes read to read[0].
+    """
+    for line in file:
+        read[0] += len(line)
+        yield line.decode("utf-8")
+        
+
+def _tile_record(q:object, r:object, s:object, cost:object, record:int) -> tuple:
+    """
+    Validate the values of record number record and return it as 
+    ((q, r, s), movement_cost), s being derived from q and r if None.
+    """
+    if not isinstance(q, int) or not isinstance(r, int):
+        raise TypeError("q and r of record " + str(record) + " need to be of type Integer.")
+    if s is None:
+        s = -q - r
+    elif not isinstance(s, int):
+        raise TypeError("s of record " + str(record) + " needs to be of type Integer.")
+    elif q + r + s != 0:
+        raise ConstraintViolation("Record " + str(record) + " violates the q+r+s=0 constraint.")
+    if not isinstance(cost, int|float) or isinstance(cost, bool):
+        raise TypeError("movement_cost of record " + str(record) + " needs to be of type Integer or Float.")
+    return ((q, r, s), cost)
+
+
+def _csv_records(lines):
+    """
+    Yield the tiles of CSV lines with a header row as ((q, r, s), 
+    movement_cost).
+    """
+    reader = csv.reader(lines)
+    header = [name.strip() for name in next(reader, ())]
+    if "q" not in header or "r" not in header:
+        raise ValueError("The header of a CSV tilemap needs to contain the columns q and r.")
+    i_q = header.index("q")
+    i_r = header.index("r")
+    i_s = header.index("s") if "s" in header else None
+    i_cost = header.index("movement_cost") if "movement_cost" in header else None
+    
+    for record, row in enumerate(reader, 1):
+        if not row:
+            continue
+        try:
+            q = int(row[i_q])
+            r = int(row[i_r])
+            s = None if i_s is None else int(row[i_s])
+            cost = 1 if i_cost is None else float_to_int(float(row[i_cost]))
+        except (ValueError, IndexError):
+            raise ValueError("Record " + str(record) + " of the CSV tilemap is malformed: " + str(row)) from None
+        yield _tile_record(q, r, s, cost, record)
+        
+
+def _jsonl_records(lines):
+    """
+    Yield the tiles of JSON Lines as ((q, r, s), movement_cost).
+    """
+    for record, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            tile = json.loads(line)
+            q = tile["q"]
+            r = tile["r"]
+        except (ValueError, KeyError, TypeError):
+            raise ValueError("Record " + str(record) + " of the JSON Lines tilemap is malformed: " + line.strip()) from None
+        yield _tile_record(q, r, tile.get("s"), tile.get("movement_cost", 1), record)
+        
+
+def _binary_records(file:object, read:list, chunk_records:int=4096):
+    """
+    Yield the tiles of a file of TILE_RECORD records as ((q, r, s), 
+    movement_cost), reading up to chunk_records records at a time and adding 
+    the number of bytes read to read[0]. Short reads, as from pipes, sockets 
+    or raw streams, may end within a record, whose bytes are kept and 
+    completed by the next read; only an incomplete record at the end of the 
+    file raises a ValueError.
+    """
+    size = TILE_RECORD.size
+    tail = b""
+    while True:
+        chunk = file.read(size * chunk_records)
+        if not chunk:
+            if tail:
+                raise ValueError("The binary tilemap ends with an incomplete record.")
+            return
+        read[0] += len(chunk)
+        data = tail + chunk if tail else chunk
+        complete = len(data) - len(data) % size
+        tail = data[complete:]
+        for q, r, cost in TILE_RECORD.iter_unpack(memoryview(data)[:complete]):
+            yield ((q, r, -q - r), float_to_int(cost))
+
+
+# profiling hooks ----------------------------------------------------------- #
+# name -> [calls, cumulative seconds], kept after disabling ----------------- #
+_profile_counters = dict()
+# name -> (owner, attribute, original, wrapper) ----------------------------- #
+_profile_originals = dict()
+
+
+def _profiled(name:str, func:Callable) -> Callable:
+    """
+    Return a wrapper of func, counting its calls and their cumulative time 
+    in _profile_counters[name].
+    """
+    counter = _profile_counters.setdefault(name, [0, 0.0])
+    
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        started = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            counter[0] += 1
+            counter[1] += perf_counter() - started
+            
+    # keep the cache interface of lru_cache decorated functions ------------- #
+    for attribute in ("cache_info", "cache_clear"):
+        if hasattr(func, attribute):
+            setattr(wrapper, attribute, getattr(func, attribute))
+    return wrapper
+
+
+def _rebind_modules(replacements:dict) -> None:
+    """
+    Replaces every module attribute outside of HexLogic, that is one of the 
+    functions in replacements, {id(function):(function, replacement)}, 
+    compared by identity.
+    """
+    module = sys.modules[__name__]
+    for other in list(sys.modules.values()):
+        if other is module or not hasattr(other, "__dict__"):
+            continue
+        for key, value in list(vars(other).items()):
+            entry = replacements.get(id(value))
+            if entry is not None and value is entry[0]:
+                setattr(other, key, entry[1])
+
+
+def profiling_targets() -> list:
+    """
+    Returns the names of all functions and methods, that enable_profiling 
+    can wrap: the public functions of this module and the public methods, 
+    classmethods, staticmethods and constructors of its classes, like 
+    'neighbors', 'GraphMatrix.a_star_algorithm', 'GraphMatrix.from_cost_grid' 
+    or 'GraphMatrix.__init__'. Classes without their own __init__, like the 
+    Namedtuples RectCoords and HexCoords, have no constructor target.
+    """
+    module = sys.modules[__name__]
+    targets = list()
+    for name, obj in vars(module).items():
+        if name.startswith("_") or getattr(obj, "__module__", None) != __name__:
+            continue
+        if isinstance(obj, type):
+            for method_name, method in vars(obj).items():
+                if method_name.startswith("_") and method_name != "__init__":
+                    continue
+                if isinstance(method, classmethod|staticmethod) or (callable(method) and not isinstance(method, type)):
+                    targets.append(name + "." + method_name)
+        elif callable(obj) and name not in _PROFILING_FUNCTIONS:
+            targets.append(name)
+    return targets
+
+
+def enable_profiling(names:list|tuple|set=None) -> None:
+    """
+    Wraps the public functions and methods of HexLogic, or only the ones in 
+    names, see profiling_targets, with call counters and cumulative timers. 
+    Calls from inside HexLogic, like neighbors called by GraphMatrix, 
+    are counted as well as calls through modules, that imported the 
+    functions by name. Times are cumulative, including the time spent in 
+    nested HexLogic calls, for functions returning generators only the 
+    creation of the generator is timed. Calling enable_profiling again 
+    replaces the wrapped selection, counters are kept until 
+    reset_profiling. While disabled, the original functions are in place, 
+    so there is no overhead at all.
+    
+    Parameters:
+    -----------
+    names : List | Tuple | Set, optional
+        Names of the functions and methods to wrap, all if None.
+        
+    Raises:
+    -------
+    ValueError: 
+        If a name is not part of profiling_targets.
+        
+    Returns:
+    --------
+    None
+    """
+    targets = profiling_targets()
+    if names is None:
+        names = targets
+    unknown = set(names) - set(targets)
+    if unknown:
+        raise ValueError("Can't profile " + ", ".join(sorted(unknown)) + ", see profiling_targets.")
+    disable_profiling()
+    
+    module = sys.modules[__name__]
+    wrappers = dict()
+    for name in names:
+        if "." in name:
+            (class_name, attribute) = name.split(".")
+            owner = getattr(module, class_name)
+        else:
+            (owner, attribute) = (module, name)
+        # classmethods and staticmethods are wrapped within the descriptor -- #
+        original = vars(owner)[attribute] if owner is not module else getattr(owner, attribute)
+        if isinstance(original, classmethod|staticmethod):
+            wrapper = type(original)(_profiled(name, original.__func__))
+        else:
+            wrapper = _profiled(name, original)
+        setattr(owner, attribute, wrapper)
+        _profile_originals[name] = (owner, attribute, original, wrapper)
+        if owner is module:
+            wrappers[id(original)] = (original, wrapper)
+            
+    # rebind functions, other modules imported from HexLogic by name -------- #
+    _rebind_modules(wrappers)
+
+
+def disable_profiling() -> None:
+    """
+    Restores all functions and methods wrapped by enable_profiling, also in 
+    modules, that imported a wrapper by name while profiling was enabled. 
+    The counters are kept until reset_profiling.
+    """
+    module = sys.modules[__name__]
+    originals = dict()
+    for name, (owner, attribute, original, wrapper) in _profile_originals.items():
+        setattr(owner, attribute, original)
+        if owner is module:
+            originals[id(wrapper)] = (wrapper, original)
+    _profile_originals.clear()
+    _rebind_modules(originals)
+    
+    
+def profiling_enabled() -> bool:
+    """
+    Returns True while functions are wrapped by enable_profiling.
+    """
+    return bool(_profile_originals)
+
+
+def reset_profiling() -> None:
+    """
+    Sets all call counters and timers back to zero.
+    """
+    for counter in _profile_counters.values():
+        counter[0] = 0
+        counter[1] = 0.0
+        
+        
+def profiling_stats() -> dict:
+    """
+    Returns a Dictionary mapping the name of every profiled function called 
+    at least once to a Dictionary {"calls":calls, "seconds":seconds, 
+    "mean":seconds per call}, ordered by seconds, highest first.
+    """
+    rows = [(name, calls, seconds) for name, (calls, seconds) in _profile_counters.items() if calls]
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return {name:{"calls":calls, "seconds":seconds, "mean":seconds / calls} for name, calls, seconds in rows}
+
+
+def profiling_text(path:str|os.PathLike=None) -> str:
+    """
+    Returns the profiling counters in the Prometheus text exposition format, 
+    as the counters hexlogic_calls_total and hexlogic_seconds_total, labeled 
+    by function. If path is passed, the text is also written to it, to be 
+    collected for example by a node exporter textfile collector.
+    """
+    stats = profiling_stats()
+    lines = ["# HELP hexlogic_calls_total Calls of HexLogic functions.", 
+             "# TYPE hexlogic_calls_total counter"]
+    lines += ['hexlogic_calls_total{function="' + name + '"} ' + str(row["calls"]) for name, row in stats.items()]
+    lines += ["# HELP hexlogic_seconds_total Cumulative seconds spent in HexLogic functions.", 
+              "# TYPE hexlogic_seconds_total counter"]
+    lines += ['hexlogic_seconds_total{function="' + name + '"} ' + repr(row["seconds"]) for name, row in stats.items()]
+    text = "\n".join(lines) + "\n"
+    
+    if path is not None:
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+    return text
+
+
+# profiling functions never wrap themselves --------------------------------- #
+_PROFILING_FUNCTIONS = ("profiling_targets", "enable_profiling", "disable_profiling", 
+                        "profiling_enabled", "reset_profiling", "profiling_stats", 
+                        "profiling_text")
 
@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:12:40 2026
+
+Benchmark suite timing the public HexLogic functions on hexagonal maps of
+growing radius, using the built-in library only. Every case is timed in
+several samples, each sample calling the function often enough to be measured
+reliably, and summarised by the median and the 95th percentile per call.
+
+Run from the repository root:
+    python -m tests.hexlogic_benchmark --radii 5 25 50 --json results.json
+
+With --memory, every case is additionally run once under tracemalloc to
+record its peak memory, and the deep size of the GraphMatrix is recorded:
+    python -m tests.hexlogic_benchmark --radii 50 100 --memory --json mem.json
+
+Compare result files of a baseline and a current version, exiting with 1 if
+any case regressed beyond the threshold:
+    python -m tests.hexlogic_benchmark --baseline base.json --current new.json
+
+@author: Maximilian Hauser
+"""
+
+# import section ------------------------------------------------------------ #
+# add parent directory ------------------------------------------------------ #
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+# imports from parent directory --------------------------------------------- #
+from src.hexlogic import hexlogic as hl
+
+# built-in libraries -------------------------------------------------------- #
+import argparse
+import json
+import platform
+import random
+import statistics
+import timeit
+import tracemalloc
+from datetime import datetime, timezone
+from math import ceil, erfc, sqrt
+from collections.abc import Callable
+from types import SimpleNamespace
+
+
+# benchmark maps ------------------------------------------------------------ #
+def benchmark_map(radius:int, seed:int=0) -> list:
+    """
+    Returns a List of tiles, having q, r, s and movement_cost attributes,
+    covering all coordinates within radius of (0, 0, 0). Movement costs are
+    drawn from 1, 2 and 3, about 10% of the tiles being blocked (-1), except
+    for the line from (-radius, 0, radius) to (radius, 0, -radius), so a path
+    between both ends always exists. The same radius and seed always return
+    the same map.
+    """
+    rng = random.Random(seed)
+    corridor = set(hl.line_draw((-radius, 0, radius), (radius, 0, -radius)))
+    tiles = list()
+    for (q, r, s) in sorted(hl.in_range((0, 0, 0), radius)):
+        if (q, r, s) not in corridor and rng.random() < 0.1:
+            movement_cost = -1
+        else:
+            movement_cost = rng.choice((1, 2, 3))
+        tiles.append(SimpleNamespace(q=q, r=r, s=s, movement_cost=movement_cost))
+    return tiles
+
+
+def benchmark_cases(radius:int, seed:int=0, names:tuple|list=None) -> dict:
+    """
+    Returns a Dictionary mapping the name of each benchmark case to a
+    callable without arguments, running the case once on the map of radius.
+    Functions converting or measuring a single coordinate are applied to all
+    tiles of the map, so every case scales with radius. The contraction
+    hierarchy queried by hierarchy_path is built here, outside the timing,
+    unless names is given without hierarchy_path.
+    """
+    tiles = benchmark_map(radius, seed)
+    coords = [(tile.q, tile.r, tile.s) for tile in tiles]
+    pixels = [hl.hex_to_pixel(qrs) for qrs in coords]
+    graph = hl.GraphMatrix(tiles)
+    start = (-radius, 0, radius)
+    goal = (radius, 0, -radius)
+    if not names or "hierarchy_path" in names:
+        graph.build_hierarchy()
+
+    return {
+        "GraphMatrix": lambda: hl.GraphMatrix(tiles),
+        "a_star_algorithm": lambda: graph.a_star_algorithm(start, goal),
+        "hierarchy_path": lambda: graph.hierarchy_path(start, goal),
+        "dist_lim_flood_fill": lambda: hl.dist_lim_flood_fill((0, 0, 0), radius, tiles),
+        "in_range": lambda: hl.in_range((0, 0, 0), radius),
+        "line_draw": lambda: hl.line_draw(start, goal),
+        "hex_to_pixel": lambda: [hl.hex_to_pixel(qrs) for qrs in coords],
+        "pixel_to_hex": lambda: [hl.pixel_to_hex(xy) for xy in pixels],
+        "distance": lambda: [hl.distance((0, 0, 0), qrs) for qrs in coords],
+        }
+
+
+# timing -------------------------------------------------------------------- #
+def percentile(values:list, p:int|float) -> float:
+    """
+    Returns the p-th percentile of values, by the nearest-rank method.
+    """
+    ordered = sorted(values)
+    return ordered[max(ceil(p / 100 * len(ordered)), 1) - 1]
+
+
+def time_case(func:Callable, repeat:int=7, min_sample_time:float=0.05,
+              max_case_time:float=30.0) -> dict:
+    """
+    Times func in up to repeat samples, each sample calling func as often as
+    needed to last at least min_sample_time seconds. Stops taking samples
+    once max_case_time seconds have been spent, after at least one sample.
+    Garbage collection is disabled while timing, as in timeit. Returns the
+    seconds per call of every sample and their median, 95th percentile and
+    minimum.
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    elapsed = timer.timeit(number)
+    spent = elapsed
+    while elapsed < min_sample_time and spent < max_case_time:
+        number *= 2 if elapsed <= 0 else max(2, min(10, ceil(min_sample_time / elapsed)))
+        elapsed = timer.timeit(number)
+        spent += elapsed
+
+    samples = list()
+    while len(samples) < repeat and (not samples or spent < max_case_time):
+        elapsed = timer.timeit(number)
+        spent += elapsed
+        samples.append(elapsed / number)
+
+    return {"number":number,
+            "samples":samples,
+            "median":statistics.median(samples),
+            "p95":percentile(samples, 95),
+            "min":min(samples)}
+
+
+def peak_memory(func:Callable) -> int:
+    """
+    Calls func once under tracemalloc and returns the peak of memory
+    allocated during the call in bytes, including its return value.
+    """
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        result = func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak - baseline
+
+
+def run_benchmarks(radii:tuple|list=(5, 10, 25, 50, 100, 200), names:tuple|list=None,
+                   repeat:int=7, min_sample_time:float=0.05, max_case_time:float=30.0,
+                   seed:int=0, report:Callable=None, memory:bool=False) -> dict:
+    """
+    Runs all benchmark cases, or the ones listed in names, for every radius
+    and returns the results as a Dictionary, ready to be written as JSON.
+    report is called with the result of every case once it is timed. If
+    memory is True, every case is run once more, untimed, to record its
+    peak memory in bytes as peak_bytes, and the GraphMatrix case records
+    the memory_footprint of the graph it builds as footprint.
+    """
+    results = list()
+    for radius in radii:
+        cases = benchmark_cases(radius, seed, names)
+        tiles = len(hl.range_offsets(radius))
+        for name, func in cases.items():
+            if names and name not in names:
+                continue
+            result = {"name":name, "radius":radius, "tiles":tiles}
+            result.update(time_case(func, repeat, min_sample_time, max_case_time))
+            if memory:
+                result["peak_bytes"] = peak_memory(func)
+                if name == "GraphMatrix":
+                    result["footprint"] = func().memory_footprint()
+            results.append(result)
+            if report is not None:
+                report(result)
+
+    return {"schema":1,
+            "created":datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "machine":{"python":platform.python_version(),
+                       "implementation":platform.python_implementation(),
+                       "platform":platform.platform(),
+                       "processor":platform.machine()},
+            "config":{"radii":list(radii),
+                      "repeat":repeat,
+                      "min_sample_time":min_sample_time,
+                      "max_case_time":max_case_time,
+                      "seed":seed,
+                      "memory":memory},
+            "results":results}
+
+
+def format_result(result:dict) -> str:
+    """
+    Returns one line of the human readable report for result.
+    """
+    line = "{:<20} r={:<4} tiles={:<7} median={:>12.3f} us  p95={:>12.3f} us  samples={}".format(
+        result["name"], result["radius"], result["tiles"],
+        result["median"] * 1e6, result["p95"] * 1e6, len(result["samples"]))
+    if "peak_bytes" in result:
+        line += "  peak={:.1f} KiB".format(result["peak_bytes"] / 1024)
+    if "footprint" in result:
+        line += "  graph={:.1f} KiB".format(result["footprint"]["total"] / 1024)
+    return line
+
+
+# regression gate ----------------------------------------------------------- #
+def load_results(paths:list|tuple) -> dict:
+    """
+    Reads the JSON result files in paths and returns a Dictionary mapping
+    (name, radius) of every case to the samples of all files pooled, so
+    repeated runs of the same version strengthen the comparison.
+    """
+    pooled = dict()
+    for path in paths:
+        with open(path, encoding="utf-8") as file:
+            results = json.load(file)
+        for result in results["results"]:
+            pooled.setdefault((result["name"], result["radius"]), list()).extend(result["samples"])
+    return pooled
+
+
+def mann_whitney_p(baseline:list, current:list) -> float:
+    """
+    Returns the one-sided p-value of the Mann-Whitney U test, by normal
+    approximation with continuity correction, for current being slower than
+    baseline. Makes no assumption about the distribution of the timings, so
+    single outliers caused by the machine hardly affect it.
+    """
+    n_b = len(baseline)
+    n_c = len(current)
+    u = 0.0
+    for c in current:
+        for b in baseline:
+            if c > b:
+                u += 1
+            elif c == b:
+                u += 0.5
+    mean = n_b * n_c / 2
+    sd = sqrt(n_b * n_c * (n_b + n_c + 1) / 12)
+    return 0.5 * erfc((u - mean - 0.5) / sd / sqrt(2))
+
+
+def compare_results(baseline:dict, current:dict, threshold:float=0.1, alpha:float=0.05,
+                    min_samples:int=3) -> list:
+    """
+    Compares the pooled samples of baseline and current, as returned by
+    load_results, case by case. A case regressed if the median of current
+    exceeds the median of baseline by more than threshold (0.1 = 10%) and,
+    if both sides have at least min_samples samples, the Mann-Whitney U test
+    finds current slower at significance level alpha. It improved under the
+    mirrored conditions. Cases missing on one side are reported as 'missing'
+    or 'new'. Returns one Dictionary per case, sorted by name and radius.
+    """
+    rows = list()
+    for key in sorted(baseline.keys() | current.keys()):
+        row = {"name":key[0], "radius":key[1]}
+        if key not in current:
+            row["status"] = "missing"
+        elif key not in baseline:
+            row["status"] = "new"
+        else:
+            base = baseline[key]
+            curr = current[key]
+            row["baseline"] = statistics.median(base)
+            row["current"] = statistics.median(curr)
+            row["change"] = row["current"] / row["baseline"] - 1
+            enough = len(base) >= min_samples and len(curr) >= min_samples
+            row["p_slower"] = mann_whitney_p(base, curr) if enough else None
+            row["p_faster"] = mann_whitney_p(curr, base) if enough else None
+            if row["change"] > threshold and (not enough or row["p_slower"] < alpha):
+                row["status"] = "regressed"
+            elif row["change"] < -threshold and (not enough or row["p_faster"] < alpha):
+                row["status"] = "improved"
+            else:
+                row["status"] = "unchanged"
+        rows.append(row)
+    return rows
+
+
+def format_comparison(row:dict) -> str:
+    """
+    Returns one line of the human readable comparison report for row.
+    """
+    if "change" not in row:
+        return "{:<20} r={:<4} {}".format(row["name"], row["radius"], row["status"])
+    p_value = row["p_slower"] if row["change"] >= 0 else row["p_faster"]
+    return "{:<20} r={:<4} {:>12.3f} us -> {:>12.3f} us  {:>+8.1f}%  p={:<6}  {}".format(
+        row["name"], row["radius"], row["baseline"] * 1e6, row["current"] * 1e6,
+        row["change"] * 100, "n/a" if p_value is None else "{:.4f}".format(p_value),
+        row["status"].upper() if row["status"] == "regressed" else row["status"])
+
+
+# command line interface ---------------------------------------------------- #
+def main(argv:list=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m tests.hexlogic_benchmark",
+                                     description="Time the public HexLogic functions on maps of growing radius.")
+    parser.add_argument("--radii", type=int, nargs="+", default=[5, 10, 25, 50, 100, 200],
+                        help="map radii to benchmark (default: 5 10 25 50 100 200)")
+    parser.add_argument("--only", nargs="+", default=None, metavar="NAME",
+                        help="benchmark only these cases")
+    parser.add_argument("--repeat", type=int, default=7,
+                        help="samples per case (default: 7)")
+    parser.add_argument("--min-sample-time", type=float, default=0.05,
+                        help="minimum seconds per sample (default: 0.05)")
+    parser.add_argument("--max-case-time", type=float, default=30.0,
+                        help="seconds after which a case stops taking samples (default: 30)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the benchmark maps (default: 0)")
+    parser.add_argument("--memory", action="store_true",
+                        help="also record peak memory per case with tracemalloc")
+    parser.add_argument("--json", default=None, metavar="PATH",
+                        help="write the results as JSON to PATH, '-' for stdout")
+    parser.add_argument("--baseline", nargs="+", default=None, metavar="PATH",
+                        help="compare result files instead of benchmarking, pooling repeated runs")
+    parser.add_argument("--current", nargs="+", default=None, metavar="PATH",
+                        help="result files compared against --baseline")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="slowdown of the median in percent tolerated (default: 10)")
+    parser.add_argument("--alpha", type=float, default=0.05,
+                        help="significance level of the Mann-Whitney U test (default: 0.05)")
+    args = parser.parse_args(argv)
+    
+    # regression gate, exit code 1 if any case regressed -------------------- #
+    if args.baseline or args.current:
+        if not args.baseline or not args.current:
+            parser.error("--baseline and --current need to be passed together")
+        rows = compare_results(load_results(args.baseline), load_results(args.current),
+                               args.threshold / 100, args.alpha)
+        rows = [row for row in rows if not args.only or row["name"] in args.only]
+        for row in rows:
+            print(format_comparison(row))
+        regressed = sum(row["status"] == "regressed" for row in rows)
+        print("{} of {} cases regressed beyond {}%".format(regressed, len(rows), args.threshold))
+        return 1 if regressed else 0
+
+    # keep stdout clean for JSON, if written there -------------------------- #
+    out = sys.stderr if args.json == "-" else sys.stdout
+    results = run_benchmarks(args.radii, args.only, args.repeat, args.min_sample_time,
+                             args.max_case_time, args.seed,
+                             report=lambda result: print(format_result(result), file=out, flush=True),
+                             memory=args.memory)
+
+    if args.json == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    elif args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
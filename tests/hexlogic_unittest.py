@@ -16,9 +16,17 @@ from src.hexlogic import hexlogic as hl
 from src.hexlogic.hexlogic import RectCoords as RectCoords
 from src.hexlogic.hexlogic import HexCoords as HexCoords
 from src.hexlogic.hexlogic import ConstraintViolation as ConstraintViolation
+from tests import hexlogic_benchmark as hb
 
 # built-in libraries -------------------------------------------------------- #
+import contextlib
+import io
+import json
+import os
+import tempfile
+import types
 import unittest
+from array import array
 from unittest.mock import Mock
 
 
@@ -132,6 +140,63 @@ class TestHexCoords(unittest.TestCase):
         del self.hc_test_obj_4
         
         
+# Test TileSnapshot --------------------------------------------------------- #
+class TestTileSnapshot(unittest.TestCase):
+    
+    def setUp(self):
+        self.test_grp_0 = testgrp_generator((0, 0, 0), 1, ((1, -1, 0, {"movement_cost":"1"} ), ))
+        self.test_grp_1 = testgrp_generator((0, 0, 0), 1, ((1, -1, 0, {"movement_cost":"del"} ), ))
+        self.test_grp_2 = testgrp_generator((0, 0, 0), 1, ((1, -1, 0, {"q":2} ), ))
+        self.test_grp_3 = testgrp_generator((0, 0, 0), 2, ((1, -1, 0, {"movement_cost":-1} ), 
+                                                          (0, 1, -1, {"movement_cost":2.5} ) ))
+        
+    def test_error(self):
+        with self.assertRaises(TypeError):
+            hl.TileSnapshot(self.test_grp_0)
+        with self.assertRaises(AttributeError):
+            hl.TileSnapshot(self.test_grp_1)
+        with self.assertRaises(ConstraintViolation):
+            hl.TileSnapshot(self.test_grp_2)
+            
+    def test_attributes(self):
+        snapshot = hl.TileSnapshot(self.test_grp_3)
+        self.assertEqual(len(snapshot), 19)
+        self.assertEqual((snapshot.q.typecode, snapshot.columns["movement_cost"].typecode), ("q", "d"))
+        self.assertEqual({(snapshot.q[i], snapshot.r[i], snapshot.s[i]) for i in range(len(snapshot))}, hl.in_range((0, 0, 0), 2))
+        self.assertEqual(snapshot.get((1, -1, 0), "movement_cost"), -1)
+        self.assertEqual(snapshot.get((0, 1, -1), "movement_cost"), 2.5)
+        self.assertEqual(snapshot.get((5, 0, -5), "movement_cost", 1), 1)
+        self.assertEqual(hl.TileSnapshot(self.test_grp_3, attributes=()).columns, dict())
+        
+    def test_bulk_algorithms(self):
+        snapshot = hl.TileSnapshot(self.test_grp_3)
+        graph_matrix = hl.GraphMatrix(self.test_grp_3)
+        self.assertEqual(hl.GraphMatrix(snapshot).matrix_dict, graph_matrix.matrix_dict)
+        self.assertEqual(hl.GraphMatrix(snapshot).matrix_coords, graph_matrix.matrix_coords)
+        self.assertEqual(hl.dist_lim_flood_fill((0, 0, 0), 2, snapshot), hl.dist_lim_flood_fill((0, 0, 0), 2, self.test_grp_3))
+        self.assertEqual(hl.dist_lim_flood_fill((0, 0, 0), 1, snapshot, movement_var="height"), hl.in_range((0, 0, 0), 1))
+        
+    def test_mixed_cost_types(self):
+        # a plain tile group keeps the type of every movement cost ---------- #
+        graph_matrix = hl.GraphMatrix(self.test_grp_3)
+        self.assertIs(type(graph_matrix.get_movement_cost((0, 0, 0), (1, 0, -1))), int)
+        self.assertIs(type(graph_matrix.get_movement_cost((0, 0, 0), (1, -1, 0))), int)
+        self.assertIs(type(graph_matrix.get_movement_cost((0, 0, 0), (0, 1, -1))), float)
+        for tile in self.test_grp_3:
+            if (tile.q, tile.r, tile.s) == (1, 0, -1):
+                tile.movement_cost = True
+        self.assertIs(hl.GraphMatrix(self.test_grp_3).get_movement_cost((0, 0, 0), (1, 0, -1)), True)
+        # a snapshot holds mixed movement costs as Floats ------------------- #
+        snapshot_matrix = hl.GraphMatrix(hl.TileSnapshot(self.test_grp_3))
+        self.assertIs(type(snapshot_matrix.get_movement_cost((0, 0, 0), (1, -1, 0))), float)
+        
+    def tearDown(self):
+        testgrp_teardown(self.test_grp_0)
+        testgrp_teardown(self.test_grp_1)
+        testgrp_teardown(self.test_grp_2)
+        testgrp_teardown(self.test_grp_3)
+        
+        
 # Test GraphMatrix ---------------------------------------------------------- #
 class TestGraphMatrix(unittest.TestCase):
     
@@ -206,6 +271,50 @@ class TestGraphMatrix(unittest.TestCase):
     def test_init_attributes(self):
         self.assertEqual(self.test_matrix_3.matrix_dict, self.control_dict)
         
+    def test_memory_footprint(self):
+        footprint = self.test_matrix_4.memory_footprint()
+        self.assertEqual(set(footprint), {"matrix_dict", "matrix_coords", "stats", "total"})
+        self.assertEqual(footprint["total"], footprint["matrix_dict"] + footprint["matrix_coords"] + footprint["stats"])
+        self.assertEqual(footprint["total"], hl.deep_sizeof((self.test_matrix_4.matrix_dict, self.test_matrix_4.matrix_coords, 
+                                                             self.test_matrix_4.stats)) - sys.getsizeof((0, 0, 0)))
+        self.assertGreater(footprint["matrix_dict"], sys.getsizeof(self.test_matrix_4.matrix_dict))
+        self.assertEqual(hl.GraphMatrix(()).memory_footprint()["matrix_dict"], sys.getsizeof(dict()))
+        
+    def test_from_cost_grid(self):
+        grid = [[1, 2, -1, 1], [3, None, 1, 2.5], [1, 1, 4, 1]]
+        for offset, shift in (("even-q", 1), ("odd-q", -1)):
+            # reference built from Objects at the same cube coordinates ----- #
+            tile_grp = list()
+            for row in range(3):
+                for col in range(4):
+                    if grid[row][col] is not None:
+                        obj = Mock()
+                        obj.q = col
+                        obj.r = row - (col + shift * (col & 1)) // 2
+                        obj.s = -obj.q - obj.r
+                        obj.movement_cost = grid[row][col]
+                        tile_grp.append(obj)
+            control_matrix = hl.GraphMatrix(tile_grp)
+            test_matrix = hl.GraphMatrix.from_cost_grid(grid, offset)
+            self.assertEqual(test_matrix.matrix_dict, control_matrix.matrix_dict)
+            self.assertEqual(test_matrix.matrix_coords, control_matrix.matrix_coords)
+            
+        flat = array("q", [1, 2, -1, 1, 3, 1, 1, 2, 1, 1, 4, 1])
+        self.assertEqual(hl.GraphMatrix.from_cost_grid(flat, "odd-q", width=4).matrix_dict, 
+                         hl.GraphMatrix.from_cost_grid([flat[0:4], flat[4:8], flat[8:12]], "odd-q").matrix_dict)
+        self.assertEqual(hl.GraphMatrix.from_cost_grid(memoryview(flat).cast("B").cast("q", (3, 4)), "odd-q").matrix_dict, 
+                         hl.GraphMatrix.from_cost_grid(flat, "odd-q", width=4).matrix_dict)
+        self.assertEqual(hl.GraphMatrix.from_cost_grid(bytes(6), width=3).get_movement_cost((0, 0, 0), (0, 1, -1)), 0)
+        
+        with self.assertRaises(TypeError):
+            hl.GraphMatrix.from_cost_grid([[1, "2"]])
+        with self.assertRaises(TypeError):
+            hl.GraphMatrix.from_cost_grid(flat)
+        with self.assertRaises(ValueError):
+            hl.GraphMatrix.from_cost_grid(flat, width=5)
+        with self.assertRaises(ValueError):
+            hl.GraphMatrix.from_cost_grid(grid, "even-r")
+        
     def test_update_entry(self):
         # only tests matrix_coords functionality ---------------------------- #
         self.assertNotIn((0, -6, 6), self.test_matrix_4.matrix_coords)
@@ -234,12 +343,156 @@ class TestGraphMatrix(unittest.TestCase):
     
     def test_a_star_algorithm_inout(self):
         self.assertEqual(self.test_matrix_4.a_star_algorithm((0, 5, -5), (0, -5, 5)),
-                         [(0, 5, -5), (1, 4, -5), (2, 3, -5), (3, 2, -5), (3, 1, -4), 
+                         [(0, 5, -5), (0, 4, -4), (0, 3, -3), (1, 2, -3), (2, 1, -3), 
                           (3, 0, -3), (3, -1, -2), (2, -1, -1), (1, -1, 0), (0, -1, 1), 
                           (-1, 0, 1), (-2, 1, 1), (-3, 2, 1), (-4, 2, 2), (-4, 1, 3), 
-                          (-3, 0, 3), (-2, -1, 3), (-1, -2, 3), (0, -3, 3), (0, -4, 4), 
+                          (-4, 0, 4), (-4, -1, 5), (-3, -2, 5), (-2, -3, 5), (-1, -4, 5), 
                           (0, -5, 5)])
     
+    def test_a_star_algorithm_queues(self):
+        # bucket queue and binary heap find the same paths ------------------ #
+        bucket_path = self.test_matrix_4.a_star_algorithm((0, 5, -5), (0, -5, 5))
+        self.assertEqual(self.test_matrix_4._integer_cost_bound(), 1)
+        self.assertEqual(self.test_matrix_4.a_star_algorithm((0, 5, -5), (0, -5, 5), cost_bound=0), bucket_path)
+        self.assertEqual(self.test_matrix_4.a_star_algorithm((0, 5, -5), (0, -5, 5), cost_bound=3), bucket_path)
+        
+        # weighted costs, Float costs fall back to the heap ----------------- #
+        weighted = hl.GraphMatrix.from_cost_grid([[1 + (col * 7 + row * 3) % 5 for col in range(12)] 
+                                                  for row in range(12)])
+        self.assertEqual(weighted._integer_cost_bound(), 5)
+        (start, goal) = (hl.offset_to_cube((0, 0), "even-q"), hl.offset_to_cube((11, 11), "even-q"))
+        stats = hl.SearchStats()
+        bucket_path = weighted.a_star_algorithm(start, goal, stats=stats)
+        cost = stats.path_cost
+        self.assertEqual(cost, sum(weighted.get_movement_cost(a, b) for (a, b) in zip(bucket_path, bucket_path[1:])))
+        heap_path = weighted.a_star_algorithm(start, goal, cost_bound=0, stats=stats)
+        self.assertEqual((heap_path, stats.path_cost), (bucket_path, cost))
+        weighted.update_entry(bucket_path[0], bucket_path[1], 0.5)
+        self.assertEqual(weighted._integer_cost_bound(), 0)
+        weighted.a_star_algorithm(start, goal, stats=stats)
+        self.assertLess(stats.path_cost, cost)
+        
+        # movement costs above the hint are rejected ------------------------ #
+        with self.assertRaises(ValueError):
+            weighted.a_star_algorithm(start, goal, cost_bound=1)
+    
+    def test_a_star_algorithm_line_shortcut(self):
+        # unobstructed line of lowest cost steps is returned without search - #
+        stats = hl.SearchStats()
+        trace = hl.SearchTrace()
+        self.test_matrix_4.collect_stats = True
+        path = self.test_matrix_4.a_star_algorithm((0, 5, -5), (5, -3, -2), stats=stats, trace=trace)
+        self.assertEqual(path, list(hl.line_draw((0, 5, -5), (5, -3, -2))))
+        self.assertEqual((stats.shortcuts, stats.nodes_expanded, stats.path_cost), (1, 0, 8))
+        self.assertEqual((len(trace), trace.found), (0, True))
+        searched = self.test_matrix_4.a_star_algorithm((0, 5, -5), (5, -3, -2), stats=stats, line_shortcut=False)
+        self.assertEqual((len(searched), stats.shortcuts, stats.path_cost), (len(path), 0, 8))
+        
+        # lines crossing walls or dearer tiles fall through to A* ----------- #
+        self.test_matrix_4.a_star_algorithm((0, 5, -5), (0, -5, 5), stats=stats)
+        self.assertEqual((stats.shortcuts, stats.path_cost), (0, 20))
+        self.test_matrix_4.update_entry((2, 2, -4), (2, 1, -3), 3)
+        path = self.test_matrix_4.a_star_algorithm((0, 5, -5), (5, -3, -2), stats=stats)
+        self.assertEqual((stats.shortcuts, stats.path_cost), (0, 8))
+        self.assertNotEqual(path[3:5], [(2, 2, -4), (2, 1, -3)])
+        self.assertEqual(self.test_matrix_4.stats.shortcuts, 1)
+        self.assertEqual(self.test_matrix_4.stats.shortcut_rate(), 1 / 4)
+        self.assertEqual(hl.SearchStats().shortcut_rate(), 0.0)
+    
+    def test_a_star_algorithm_line_shortcut_tie(self):
+        # shortcut and A* break the tie differently at equal cost ----------- #
+        graph = hl.GraphMatrix.from_cost_grid([[1] * 6] * 6)
+        cost = lambda path: sum(graph.matrix_dict[a][b] for a, b in zip(path, path[1:]))
+        shortcut = graph.a_star_algorithm((0, 0, 0), (1, 2, -3))
+        searched = graph.a_star_algorithm((0, 0, 0), (1, 2, -3), line_shortcut=False)
+        self.assertEqual(shortcut, list(hl.line_draw((0, 0, 0), (1, 2, -3))))
+        self.assertNotEqual(shortcut, searched)
+        self.assertEqual((shortcut[0], shortcut[-1]), (searched[0], searched[-1]))
+        self.assertEqual((len(shortcut), cost(shortcut)), (len(searched), cost(searched)))
+        self.assertEqual(cost(shortcut), 3)
+    
+    def test_a_star_nearest(self):
+        # nearest goal behind the wall is not the nearest by distance ------- #
+        goals = [(0, -5, 5), (4, -5, 1), (5, 0, -5)]
+        (goal, path) = self.test_matrix_4.a_star_nearest((0, 5, -5), goals)
+        costs = {g:len(self.test_matrix_4.a_star_algorithm((0, 5, -5), g)) for g in goals}
+        self.assertEqual(len(path), min(costs.values()))
+        self.assertEqual(costs[goal], len(path))
+        self.assertEqual((path[0], path[-1]), ((0, 5, -5), goal))
+        
+        stats = hl.SearchStats()
+        trace = hl.SearchTrace()
+        (goal, path) = self.test_matrix_4.a_star_nearest((0, 5, -5), [(0, -5, 5), (-5, 5, 0)], 
+                                                         return_obj_type="Coords", stats=stats, trace=trace)
+        self.assertEqual(goal, HexCoords(-5, 5, 0))
+        self.assertIsInstance(path[0], HexCoords)
+        self.assertEqual(len(path), len(self.test_matrix_4.a_star_algorithm((0, 5, -5), (-5, 5, 0))))
+        self.assertEqual((stats.path_cost, trace.goal, trace.found), (len(path) - 1, (-5, 5, 0), True))
+        self.assertEqual(self.test_matrix_4.a_star_nearest((0, 5, -5), [(0, 5, -5)], return_obj_type="Dict"), 
+                         ({"q":0, "r":5, "s":-5}, [{"q":0, "r":5, "s":-5}]))
+        
+        # unreachable or inaccessible goals --------------------------------- #
+        self.assertIsNone(self.test_matrix_4.a_star_nearest((0, 5, -5), [(0, -7, 7)]))
+        self.assertIsNone(self.test_matrix_4.a_star_nearest((0, 5, -5), []))
+        self.assertIsNone(self.test_matrix_4.a_star_nearest((0, 5, -5), [(0, -6, 6)], test_accessibility=True))
+        with self.assertRaises(ConstraintViolation):
+            self.test_matrix_4.a_star_nearest((0, 5, -5), [(1, -5, 5)])
+    
+    def test_a_star_algorithm_stats(self):
+        stats = hl.SearchStats()
+        path = self.test_matrix_4.a_star_algorithm((0, 5, -5), (0, -5, 5), stats=stats)
+        self.assertEqual((stats.searches, stats.paths_found, stats.path_cost), (1, 1, len(path) - 1))
+        self.assertGreaterEqual(stats.nodes_expanded, len(path) - 1)
+        self.assertGreaterEqual(stats.nodes_pushed, stats.nodes_expanded)
+        self.assertGreaterEqual(stats.nodes_pushed, stats.frontier_max)
+        self.assertGreater(stats.elapsed, 0)
+        # aggregated counters only while collect_stats ---------------------- #
+        self.test_matrix_4.a_star_algorithm((0, 5, -5), (0, -5, 5))
+        self.assertEqual(self.test_matrix_4.stats.searches, 0)
+        self.test_matrix_4.collect_stats = True
+        self.test_matrix_4.a_star_algorithm((0, 5, -5), (0, -5, 5))
+        self.test_matrix_4.a_star_algorithm((0, 5, -5), (0, -6, 6), test_accessibility=True)
+        self.assertIsNone(self.test_matrix_4.a_star_algorithm((0, 5, -5), (0, -7, 7), stats=stats))
+        aggregate = self.test_matrix_4.stats.as_dict()
+        self.assertEqual((aggregate["searches"], aggregate["paths_found"], aggregate["path_cost"]), (3, 1, len(path) - 1))
+        self.assertEqual((stats.paths_found, stats.path_cost), (0, None))
+        self.assertEqual(aggregate["frontier_max"], stats.frontier_max)
+        self.test_matrix_4.reset_stats()
+        self.assertEqual(self.test_matrix_4.stats.as_dict()["searches"], 0)
+    
+    def test_a_star_algorithm_trace(self):
+        trace = hl.SearchTrace()
+        stats = hl.SearchStats()
+        path = self.test_matrix_4.a_star_algorithm((0, 5, -5), (0, -5, 5), stats=stats, trace=trace)
+        self.assertEqual((trace.start, trace.goal, trace.found), ((0, 5, -5), (0, -5, 5), True))
+        self.assertEqual(len(trace), stats.nodes_expanded)
+        self.assertEqual(next(trace.expansions()), (0, (0, 5, -5), 0, 10))
+        self.assertEqual(trace.q.typecode, "q")
+        self.assertTrue({(q, r, s) for (order, (q, r, s), g, f) in trace.expansions()} >= set(path[:-1]))
+        for (order, qrs, g, f) in trace.expansions():
+            self.assertEqual(f, g + hl.distance(qrs, (0, -5, 5)))
+        
+        # JSON Lines export ------------------------------------------------- #
+        file = io.StringIO()
+        trace.to_jsonl(file)
+        lines = [json.loads(line) for line in file.getvalue().splitlines()]
+        self.assertEqual(lines[0], {"type":"search", "start":[0, 5, -5], "goal":[0, -5, 5], "found":True, 
+                                    "expanded":len(trace), "frontier":len(trace.frontier_q)})
+        self.assertEqual(len(lines), 1 + len(trace) + len(trace.frontier_q))
+        self.assertEqual(lines[1], {"type":"expand", "order":0, "q":0, "r":5, "s":-5, "g":0, "f":10})
+        self.assertEqual({line["type"] for line in lines[1 + len(trace):]}, {"frontier"} if len(trace.frontier_q) else set())
+        
+        # heatmap ----------------------------------------------------------- #
+        heatmap = trace.heatmap(value="order")
+        self.assertEqual(heatmap[0], hl.hex_to_pixel((0, 5, -5)) + (0.0,))
+        self.assertEqual(max(cell[2] for cell in heatmap), 1.0)
+        self.assertEqual(len(trace.heatmap(value="count")), len({qrs for (order, qrs, g, f) in trace.expansions()}))
+        with self.assertRaises(ValueError):
+            trace.heatmap(value="h")
+            
+        self.assertIsNone(self.test_matrix_4.a_star_algorithm((0, 5, -5), (0, -7, 7), trace=trace))
+        self.assertEqual((trace.found, len(trace.frontier_q), trace.heatmap(32, 32)[0][:2]), (False, 0, (0, 160)))
+    
     def tearDown(self):
         testgrp_teardown(self.test_grp_0)
         testgrp_teardown(self.test_grp_1)
@@ -248,6 +501,238 @@ class TestGraphMatrix(unittest.TestCase):
         testgrp_teardown(self.test_grp_4)
         
 
+# Test ContractionHierarchy ------------------------------------------------- #
+class TestContractionHierarchy(unittest.TestCase):
+    
+    def setUp(self):
+        # weighted grid with holes, None being no tile ---------------------- #
+        self.grid = [[None if (col * 5 + row * 3) % 11 == 0 else 1 + (col * 7 + row * 3) % 4 
+                      for col in range(9)] for row in range(9)]
+        self.graph = hl.GraphMatrix.from_cost_grid(self.grid)
+        self.hierarchy = self.graph.build_hierarchy()
+        self.tiles = sorted(self.hierarchy.index)
+        
+    def test_error(self):
+        with self.assertRaises(ConstraintViolation):
+            self.graph.hierarchy_path((1, 1, 1), (0, 0, 0))
+            
+        with self.assertRaises(ValueError):
+            hl.ContractionHierarchy.from_json(io.StringIO('{"format":"other"}'))
+    
+    def test_hierarchy_path(self):
+        # same path costs as a_star_algorithm ------------------------------- #
+        a_star_stats = hl.SearchStats()
+        stats = hl.SearchStats()
+        for start in self.tiles[::7]:
+            for goal in self.tiles[::5]:
+                a_star_path = self.graph.a_star_algorithm(start, goal, stats=a_star_stats)
+                path = self.graph.hierarchy_path(start, goal, stats=stats)
+                self.assertEqual(stats.path_cost, a_star_stats.path_cost)
+                self.assertEqual((path[0], path[-1]), (a_star_path[0], a_star_path[-1]))
+                self.assertEqual(sum(self.graph.get_movement_cost(a, b) for (a, b) in zip(path, path[1:])), stats.path_cost)
+        self.assertEqual(self.hierarchy.shortest_path(self.tiles[0], self.tiles[0]), (0, [self.tiles[0]]))
+        self.assertIsNone(self.hierarchy.shortest_path(self.tiles[0], (50, -50, 0)))
+        self.assertIsInstance(self.graph.hierarchy_path(self.tiles[0], self.tiles[-1], return_obj_type="Coords")[0], HexCoords)
+        
+        # unreachable goal -------------------------------------------------- #
+        island = hl.GraphMatrix.from_cost_grid([[1, 1, None, None, 1, 1]])
+        island.build_hierarchy()
+        self.assertIsNone(island.hierarchy_path((0, 0, 0), (5, -3, -2)))
+        
+    def test_discard(self):
+        (start, goal) = (self.tiles[0], self.tiles[-1])
+        self.graph.update_entry(start, self.graph.hierarchy_path(start, goal)[1], 1)
+        self.assertIsNone(self.graph.hierarchy)
+        # without hierarchy a_star_algorithm answers ------------------------ #
+        self.assertEqual(self.graph.hierarchy_path(start, goal), self.graph.a_star_algorithm(start, goal))
+        self.graph.build_hierarchy()
+        self.graph.del_entry(self.tiles[1], self.tiles[2])
+        self.assertIsNone(self.graph.hierarchy)
+        
+    def test_json(self):
+        file = io.StringIO()
+        self.hierarchy.to_json(file)
+        file.seek(0)
+        loaded = hl.ContractionHierarchy.from_json(file)
+        self.assertEqual((loaded.coords, list(loaded.rank), loaded.edges), 
+                         (self.hierarchy.coords, list(self.hierarchy.rank), self.hierarchy.edges))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "hierarchy.json")
+            self.hierarchy.to_json(path)
+            loaded = hl.ContractionHierarchy.from_json(path)
+        self.assertEqual(loaded.shortest_path(self.tiles[0], self.tiles[-1]), 
+                         self.hierarchy.shortest_path(self.tiles[0], self.tiles[-1]))
+        self.assertEqual(set(loaded.memory_footprint()), {"coords", "rank", "edges", "up", "total"})
+        
+    def tearDown(self):
+        del self.graph
+        del self.hierarchy
+        
+        
+# Test LineOfSight ---------------------------------------------------------- #
+class TestLineOfSight(unittest.TestCase):
+    
+    def setUp(self):
+        self.los = hl.LineOfSight({(1, 0, -1), HexCoords(0, -2, 2)})
+        self.los_directed = hl.LineOfSight({(1, 0, -1)}, symmetric=False)
+        
+    def test_error(self):
+        with self.assertRaises(TypeError):
+            hl.LineOfSight([(1, 0)])
+            self.los.can_see((0, 0, 0), (1, "0", -1))
+            
+        with self.assertRaises(ConstraintViolation):
+            self.los.set_blocked((1, 1, 1))
+    
+    def test_can_see(self):
+        self.assertFalse(self.los.can_see((0, 0, 0), (3, 0, -3)))
+        self.assertFalse(self.los.can_see((3, 0, -3), (0, 0, 0)))
+        self.assertTrue(self.los.can_see((0, 0, 0), (1, 0, -1)))
+        self.assertTrue(self.los.can_see((0, 0, 0), (0, 3, -3)))
+        self.assertEqual(len(self.los.cache), 3)
+        self.assertFalse(self.los_directed.can_see((0, 0, 0), (3, 0, -3)))
+        self.assertFalse(self.los_directed.can_see((3, 0, -3), (0, 0, 0)))
+        self.assertEqual(len(self.los_directed.cache), 2)
+        
+    def test_set_blocked(self):
+        self.los.can_see((0, 0, 0), (3, 0, -3))
+        self.los.can_see((0, 0, 0), (0, 3, -3))
+        self.los.can_see((-1, 0, 1), (-1, 3, -2))
+        # unchanged state does not invalidate ------------------------------- #
+        self.los.set_blocked((1, 0, -1))
+        self.assertEqual((len(self.los.cache), self.los.version), (3, 0))
+        # only pairs whose line passes the hexagon are invalidated ---------- #
+        self.los.set_blocked((1, 0, -1), False)
+        self.assertEqual((len(self.los.cache), self.los.version), (2, 1))
+        self.assertNotIn((1, 0, -1), self.los.reverse_index)
+        self.assertTrue(self.los.can_see((0, 0, 0), (3, 0, -3)))
+        self.los.set_blocked((0, 1, -1))
+        self.assertFalse(self.los.can_see((0, 0, 0), (0, 3, -3)))
+        self.assertTrue(self.los.can_see((-1, 0, 1), (-1, 3, -2)))
+        for qrs, keys in self.los.reverse_index.items():
+            for key in keys:
+                self.assertIn(qrs, self.los.cache[key][1])
+        self.los.clear()
+        self.assertEqual((self.los.cache, self.los.reverse_index), (dict(), dict()))
+        
+    def tearDown(self):
+        del self.los
+        del self.los_directed
+        
+        
+# Test HexSpatialHash ------------------------------------------------------- #
+class TestHexSpatialHash(unittest.TestCase):
+    
+    def setUp(self):
+        self.test_grp = testgrp_generator((0, 0, 0), 2)
+        self.spatial_hash = hl.HexSpatialHash(self.test_grp)
+        self.unit = Mock()
+        self.unit.q = 9
+        self.unit.r = 9
+        self.unit.s = 9
+        
+    def test_error(self):
+        with self.assertRaises(TypeError):
+            self.spatial_hash.objects_in_range((0, 0, 0), 1.5)
+            
+        with self.assertRaises(ConstraintViolation):
+            self.spatial_hash.insert(self.unit)
+            
+        with self.assertRaises(KeyError):
+            self.spatial_hash.move(self.unit, (0, 0, 0))
+            self.spatial_hash.remove(self.unit)
+    
+    def test_inout(self):
+        self.assertEqual(len(self.spatial_hash), 19)
+        self.assertEqual([(obj.q, obj.r, obj.s) for obj in self.spatial_hash.objects_at((1, -1, 0))], [(1, -1, 0)])
+        self.spatial_hash.insert(self.unit, (1, -1, 0))
+        self.assertEqual(len(self.spatial_hash.objects_at((1, -1, 0))), 2)
+        self.spatial_hash.move(self.unit, HexCoords(5, 0, -5))
+        self.assertEqual(self.spatial_hash.objects_at((5, 0, -5)), [self.unit])
+        self.assertEqual(len(self.spatial_hash.objects_at((1, -1, 0))), 1)
+        self.assertEqual(self.unit.q, 9)
+        self.spatial_hash.remove(self.unit)
+        self.assertNotIn(self.unit, self.spatial_hash)
+        self.assertNotIn((5, 0, -5), self.spatial_hash.cells)
+        
+    def test_k_nearest(self):
+        self.spatial_hash.insert(self.unit, (7, -7, 0))
+        nearest = self.spatial_hash.k_nearest((2, -2, 0), 4)
+        self.assertEqual([hl.distance((2, -2, 0), obj) for obj in nearest], [0, 1, 1, 1])
+        nearest = self.spatial_hash.k_nearest((0, 0, 0), 30)
+        self.assertEqual(len(nearest), 20)
+        self.assertIs(nearest[-1], self.unit)
+        self.assertEqual(set(self.spatial_hash.k_nearest((0, 0, 0), 30, max_radius=1)), set(self.spatial_hash.objects_in_range((0, 0, 0), 1)))
+        nearest = self.spatial_hash.k_nearest((0, 0, 0), 2, predicate=lambda obj: obj.q == 2)
+        self.assertEqual(len(nearest), 2)
+        self.assertTrue({(obj.q, obj.r, obj.s) for obj in nearest} < {(2, -2, 0), (2, -1, -1), (2, 0, -2)})
+        self.assertEqual(self.spatial_hash.k_nearest((0, 0, 0), 0), [])
+        
+    def test_sync_qrs(self):
+        spatial_hash = hl.HexSpatialHash(sync_qrs=True)
+        spatial_hash.insert(self.unit, (0, 1, -1))
+        spatial_hash.move(self.unit, (2, -1, -1))
+        self.assertEqual((self.unit.q, self.unit.r, self.unit.s), (2, -1, -1))
+        
+    def test_objects_in_range(self):
+        for center, n in (((0, 0, 0), 1), ((2, -1, -1), 1), ((1, 0, -1), 3), ((-4, 0, 4), 1)):
+            control = hl.in_range(center, n) & hl.in_range((0, 0, 0), 2)
+            self.assertEqual({(obj.q, obj.r, obj.s) for obj in self.spatial_hash.objects_in_range(center, n)}, control)
+            
+    def tearDown(self):
+        testgrp_teardown(self.test_grp)
+        del self.spatial_hash
+        del self.unit
+        
+        
+# Test HexLayout ------------------------------------------------------------ #
+class TestHexLayout(unittest.TestCase):
+    
+    def setUp(self):
+        self.layout = hl.HexLayout(33, 29, origin=(100, -50), cache_size=5)
+        self.coords = list(hl.in_range((0, 0, 0), 4))
+        
+    def test_error(self):
+        with self.assertRaises(TypeError):
+            hl.HexLayout(64.0, 64)
+            hl.HexLayout(origin=(0, "0"))
+            hl.HexLayout(cache_size=None)
+        with self.assertRaises(ValueError):
+            hl.HexLayout(64, -64)
+        with self.assertRaises(ConstraintViolation):
+            self.layout.to_pixel((1, 1, 1))
+    
+    def test_inout(self):
+        for qrs in self.coords:
+            (x, y) = hl.hex_to_pixel(qrs, 33, 29)
+            self.assertEqual(self.layout.to_pixel(qrs), (x + 100, y - 50))
+            self.assertEqual(self.layout.to_hex((x + 100, y - 50)), hl.pick_hex((x, y), 33, 29))
+        self.assertEqual(self.layout.to_pixel(HexCoords(2, -1, -1), return_obj_type="Coords"), hl.RectCoords(149, -50))
+        self.assertEqual(self.layout.to_hex((149, -50), return_obj_type="Dict"), {"q":2, "r":-1, "s":-1})
+        # half pixel center, rounded down by hex_to_pixel ------------------- #
+        (x, y) = hl.hex_to_pixel((-58, -60, 118), 33, 29)
+        self.assertEqual(self.layout.to_pixel((-58, -60, 118)), (x + 100, y - 50))
+        self.assertEqual(self.layout.to_pixel_batch([(-58, -60, 118)]), [(x + 100, y - 50)])
+        
+    def test_cache(self):
+        for qrs in self.coords:
+            self.layout.to_pixel(qrs)
+        self.assertEqual(list(self.layout.cache.keys()), self.coords[-5:])
+        self.assertEqual(self.layout.cache[self.coords[-1]], self.layout.to_pixel(self.coords[-1]))
+        self.layout.clear_cache()
+        self.assertEqual(self.layout.cache, dict())
+        
+    def test_batch(self):
+        layout = hl.HexLayout(33, 29, origin=(100, -50), validate=False)
+        xys = layout.to_pixel_batch(self.coords)
+        self.assertEqual(xys, [self.layout.to_pixel(qrs) for qrs in self.coords])
+        self.assertEqual(layout.to_hex_batch(xys), self.coords)
+        
+    def tearDown(self):
+        del self.layout
+        del self.coords
+        
+        
 # Test FloatOrInt ----------------------------------------------------------- #
 class TestFloatToInt(unittest.TestCase):
     
@@ -338,6 +823,32 @@ class TestTupleOrObject(unittest.TestCase):
         del self.obj_1
         
 
+# TestDeepSizeof ------------------------------------------------------------ #
+class TestDeepSizeof(unittest.TestCase):
+    
+    def test_deep_sizeof(self):
+        shared = (1000, 2000)
+        self.assertEqual(hl.deep_sizeof(shared), sys.getsizeof(shared) + sys.getsizeof(1000) + sys.getsizeof(2000))
+        self.assertEqual(hl.deep_sizeof([shared, shared]), sys.getsizeof([shared, shared]) + hl.deep_sizeof(shared))
+        self.assertEqual(hl.deep_sizeof({"a":shared}), sys.getsizeof({"a":shared}) + sys.getsizeof("a") + hl.deep_sizeof(shared))
+        seen = set()
+        hl.deep_sizeof(shared, seen)
+        self.assertEqual(hl.deep_sizeof({shared}, seen), sys.getsizeof({shared}))
+        
+    def test_memory_footprint(self):
+        los = hl.LineOfSight({(1, 0, -1)})
+        los.can_see((0, 0, 0), (3, 0, -3))
+        self.assertGreater(los.memory_footprint()["reverse_index"], 0)
+        spatial_hash = hl.HexSpatialHash()
+        spatial_hash.insert(Mock(), (0, 0, 0))
+        self.assertEqual(set(spatial_hash.memory_footprint()), {"cells", "positions", "total"})
+        layout = hl.HexLayout(cache_size=8)
+        empty = layout.memory_footprint()["cache"]
+        layout.to_pixel((1, 0, -1))
+        self.assertGreater(layout.memory_footprint()["cache"], empty)
+        self.assertEqual(set(hl.TileSnapshot(()).memory_footprint()), {"coordinates", "columns", "index", "total"})
+        
+        
 # TestLinint ---------------------------------------------------------------- #
 class TestLinint(unittest.TestCase):
     
@@ -723,6 +1234,47 @@ class TestSetqrs(unittest.TestCase):
         del self.obj_0
 
 
+# TestOffsetConversion ------------------------------------------------------ #
+class TestOffsetConversion(unittest.TestCase):
+    
+    def test_scalar(self):
+        self.assertEqual(hl.offset_to_cube((1, 0)), (1, -1, 0))
+        self.assertEqual(hl.offset_to_cube((1, 0), "odd-q"), (1, 0, -1))
+        self.assertEqual(hl.offset_to_cube((-3, 2), "Even-Q", "Coords"), HexCoords(-3, 3, 0))
+        self.assertEqual(hl.offset_to_cube([-3, 2], "odd-q", "Dict"), {"q":-3, "r":4, "s":-1})
+        self.assertEqual(hl.cube_to_offset((1, -1, 0)), (1, 0))
+        self.assertEqual(hl.cube_to_offset(HexCoords(-3, 4, -1), "odd-q", "Dict"), {"col":-3, "row":2})
+        for offset in ("even-q", "odd-q"):
+            for qrs in hl.in_range((0, 0, 0), 4):
+                self.assertEqual(hl.offset_to_cube(hl.cube_to_offset(qrs, offset), offset), qrs)
+                
+    def test_batch(self):
+        cols = array("q", range(-5, 6))
+        rows = array("q", [3, -1, 0, 7, 2, 2, -4, 1, 0, 5, 6])
+        for offset in ("even-q", "odd-q"):
+            (q, r, s) = hl.offset_to_cube_batch(memoryview(cols), rows, offset)
+            self.assertEqual((q.typecode, r.typecode, s.typecode), ("q", "q", "q"))
+            self.assertEqual(list(zip(q, r, s)), [hl.offset_to_cube(cr, offset) for cr in zip(cols, rows)])
+            self.assertEqual(hl.cube_to_offset_batch(q, r, offset), (cols, rows))
+        self.assertEqual(hl.offset_to_cube_batch([], []), (array("q"), array("q"), array("q")))
+        
+    def test_error(self):
+        with self.assertRaises(ValueError):
+            hl.offset_to_cube((0, 0), "even-r")
+        with self.assertRaises(TypeError):
+            hl.offset_to_cube((0.5, 0))
+        with self.assertRaises(TypeError):
+            hl.offset_to_cube((0, 0, 0))
+        with self.assertRaises(TypeError):
+            hl.cube_to_offset((0.5, -0.5, 0))
+        with self.assertRaises(ConstraintViolation):
+            hl.cube_to_offset((1, 1, 1))
+        with self.assertRaises(ValueError):
+            hl.offset_to_cube_batch([1, 2], [1])
+        with self.assertRaises(TypeError):
+            hl.cube_to_offset_batch([1.5], [1])
+            
+            
 # TestHexToPixel ------------------------------------------------------------ #
 class TestHexToPixel(unittest.TestCase):
     
@@ -786,6 +1338,41 @@ class TestHexToPixel(unittest.TestCase):
         del self.obj_5
 
 
+# TestSyncXY ---------------------------------------------------------------- #
+class TestSyncXY(unittest.TestCase):
+    
+    def setUp(self):
+        self.test_grp_0 = testgrp_generator((0, 0, 0), 2, ((1, -1, 0, {"r":"-1"} ), ))
+        self.test_grp_1 = testgrp_generator((0, 0, 0), 2, ((1, -1, 0, {"s":"del"} ), ))
+        self.test_grp_2 = testgrp_generator((0, 0, 0), 2, ((1, -1, 0, {"s":1} ), ))
+        self.test_grp_3 = testgrp_generator((2, -1, -1), 3)
+        
+    def test_error(self):
+        with self.assertRaises(TypeError):
+            hl.sync_xy(self.test_grp_0)
+        with self.assertRaises(AttributeError):
+            hl.sync_xy(self.test_grp_1)
+        with self.assertRaises(ConstraintViolation):
+            hl.sync_xy(self.test_grp_2)
+        # nothing is written if one of the Objects is invalid --------------- #
+        self.assertFalse(any(isinstance(obj.x, int) for obj in self.test_grp_2))
+        
+    def test_inout(self):
+        hl.sync_xy(self.test_grp_3, 48, 40)
+        for obj in self.test_grp_3:
+            self.assertEqual((obj.x, obj.y), hl.hex_to_pixel(obj, 48, 40))
+        hl.sync_xy(self.test_grp_3, offset=(-10, 20), layout=hl.HexLayout(33, 29, origin=(1, 1)))
+        for obj in self.test_grp_3:
+            (x, y) = hl.hex_to_pixel(obj, 33, 29)
+            self.assertEqual((obj.x, obj.y), (x - 9, y + 21))
+            
+    def tearDown(self):
+        testgrp_teardown(self.test_grp_0)
+        testgrp_teardown(self.test_grp_1)
+        testgrp_teardown(self.test_grp_2)
+        testgrp_teardown(self.test_grp_3)
+        
+
 # TestPixelToHex ------------------------------------------------------------ #
 class TestPixelToHex(unittest.TestCase):
     
@@ -840,6 +1427,79 @@ class TestPixelToHex(unittest.TestCase):
         del self.obj_4
         del self.obj_5
 
+# TestPickHex --------------------------------------------------------------- #
+class TestPickHex(unittest.TestCase):
+    
+    def test_error(self):
+        with self.assertRaises(TypeError):
+            hl.pick_hex((1, "2"))
+            hl.pick_hex((1, 2), tile_width=64.0)
+        with self.assertRaises(ValueError):
+            hl.pick_hex((1, 2), tile_height=0)
+        with self.assertRaises(AttributeError):
+            hl.pick_hex(Mock(spec=["x"]))
+    
+    def test_inout(self):
+        # centers of hexagons are picked as the hexagon itself -------------- #
+        for qrs in hl.in_range((0, 0, 0), 4):
+            self.assertEqual(hl.pick_hex(hl.hex_to_pixel(qrs)), qrs)
+            self.assertEqual(hl.pick_hex(hl.hex_to_pixel(qrs, 48, 40), 48, 40), qrs)
+        # pixel close to a corner, pixel_to_hex returns (0, 0, 0) ----------- #
+        self.assertEqual(hl.pick_hex((2, 33)), (0, 1, -1))
+        self.assertEqual(hl.pick_hex((2.0, 33.0), return_obj_type="Coords"), HexCoords(0, 1, -1))
+        self.assertEqual(hl.pick_hex((-1000, 777), return_obj_type="Dict"), hl.pick_hex((-1000.0, 777.0), return_obj_type="Dict"))
+        self.assertEqual(hl.pick_hex((17.5, -31.25), 33, 29, return_obj_type="List"), [1, -2, 1])
+        
+    def test_batch(self):
+        xys = [(x, y) for x in range(-200, 200, 7) for y in range(-150, 150, 11)]
+        self.assertEqual(hl.pick_hex_batch(xys, 33, 29), [hl.pick_hex(xy, 33, 29) for xy in xys])
+        self.assertEqual(len(hl.pick_raster(33, 29)[2]), 3 * 33 * 29)
+        
+
+# TestInRect ---------------------------------------------------------------- #
+class TestInRect(unittest.TestCase):
+    
+    def setUp(self):
+        self.rect = Mock()
+        self.rect.x = -40
+        self.rect.y = -20
+        self.rect.width = 80
+        self.rect.height = 40
+        
+    def test_error(self):
+        with self.assertRaises(TypeError):
+            hl.in_rect((0, 0, 10))
+            hl.in_rect((0, 0, "10", 10))
+        with self.assertRaises(AttributeError):
+            hl.in_rect(Mock(spec=["x", "y", "width"]))
+    
+    def test_inout(self):
+        self.assertEqual(list(hl.in_rect((-1, -1, 2, 2))), [(0, 0, 0)])
+        self.assertEqual(list(hl.in_rect(self.rect)), [(-1, 0, 1), (1, -1, 0), (0, 0, 0), (-1, 1, 0), (1, 0, -1)])
+        self.assertEqual(list(hl.in_rect(self.rect, return_obj_type="Dict", clip_coords={(0, 0, 0), (1, 0, -1)})), [{"q":0, "r":0, "s":0}, {"q":1, "r":0, "s":-1}])
+        # every hexagon of the map, whose bounding box overlaps ------------- #
+        for rect in ((0, 0, 300, 200), (-123.5, 77.25, 64, 64), (500, -500, 1, 1)):
+            control = set()
+            for qrs in hl.in_range((0, 0, 0), 20):
+                (x, y) = hl.hex_to_pixel(qrs, 48, 40)
+                if x + 24 > rect[0] and x - 24 < rect[0] + rect[2] and y + 20 > rect[1] and y - 20 < rect[1] + rect[3]:
+                    control.add(qrs)
+            self.assertEqual(set(hl.in_rect(rect, 48, 40)), control)
+        # odd sizes, whose unrounded centers are fractional ----------------- #
+        for (width, height) in ((33, 29), (35, 31)):
+            for rect in ((0, 0, 300, 200), (-123.5, 77.25, 64, 64), (24, 14, 1, 1), (25, 15, 17, 3)):
+                control = set()
+                for qrs in hl.in_range((0, 0, 0), 20):
+                    (x, y) = hl.hex_to_pixel(qrs, width, height)
+                    if (x + width / 2 > rect[0] and x - width / 2 < rect[0] + rect[2] 
+                        and y + height / 2 > rect[1] and y - height / 2 < rect[1] + rect[3]):
+                        control.add(qrs)
+                self.assertEqual(set(hl.in_rect(rect, width, height)), control)
+            
+    def tearDown(self):
+        del self.rect
+        
+
 # TestGetAngle -------------------------------------------------------------- #
 class TestGetAngle(unittest.TestCase):
     
@@ -1026,6 +1686,22 @@ class TestInRange(unittest.TestCase):
         self.assertEqual(hl.in_range((0,0,0), 1, return_obj_type="Coords"), {HexCoords(-1, 0, 1), HexCoords(0, -1, 1), HexCoords(1, 0, -1), HexCoords(0, 0, 0), HexCoords(-1, 1, 0), HexCoords(1, -1, 0), HexCoords(0, 1, -1)})
         self.assertEqual(hl.in_range((3,0,-3), 1, return_obj_type="List"), [[2, 0, -2], [2, 1, -3], [3, -1, -2], [3, 0, -3], [3, 1, -4], [4, -1, -3], [4, 0, -4]])
         self.assertEqual(hl.in_range((-3,3,0), 1, return_obj_type="Dict"), [{"q":-4, "r":3, "s":1}, {"q":-4, "r":4, "s":0}, {"q":-3, "r":2, "s":1}, {"q":-3, "r":3, "s":0}, {"q":-3, "r":4, "s":-1}, {"q":-2, "r":2, "s":0}, {"q":-2, "r":3, "s":-1}])
+        self.assertEqual(hl.in_range((0,0,0), 1, clip_coords={(0, 0, 0), (1, -1, 0), (5, -5, 0)}), {(0, 0, 0), (1, -1, 0)})
+        self.assertEqual(hl.in_range((0,0,0), 0), {(0, 0, 0)})
+        self.assertEqual(hl.in_range((0,0,0), -1), set())
+        self.assertEqual(hl.in_range((0,0,0), 1, return_obj_type="Unknown"), [])
+        
+        # clip_coords is only asked for the coordinates within range -------- #
+        clip = Mock()
+        clip.__contains__ = Mock(side_effect=lambda qrs: qrs == (1, -1, 0))
+        self.assertEqual(hl.in_range((0,0,0), 1, return_obj_type="List", clip_coords=clip), [[1, -1, 0]])
+        self.assertEqual(clip.__contains__.call_count, 7)
+        
+    def test_range_offsets(self):
+        for n in range(0, 6):
+            control = {(q, r, s) for q in range(-n, n+1) for r in range(-n, n+1) for s in range(-n, n+1) if q + r + s == 0}
+            self.assertEqual(set(hl.range_offsets(n)), control)
+            self.assertEqual(len(hl.range_offsets(n)), 3 * n * (n + 1) + 1)
         
     def tearDown(self):
         del self.obj_0
@@ -1033,6 +1709,46 @@ class TestInRange(unittest.TestCase):
         del self.obj_2
 
 
+# TestRing ------------------------------------------------------------------ #
+class TestRing(unittest.TestCase):
+    
+    def test_error(self):
+        with self.assertRaises(TypeError):
+            hl.ring((0, 0, 0), 1.5)
+            
+        with self.assertRaises(ConstraintViolation):
+            hl.ring((1, 0, -2), 1)
+    
+    def test_inout(self):
+        self.assertEqual(list(hl.ring((0, 0, 0), 0)), [(0, 0, 0)])
+        self.assertEqual(list(hl.ring((0, 0, 0), 1)), [(-1, 1, 0), (0, 1, -1), (1, 0, -1), (1, -1, 0), (0, -1, 1), (-1, 0, 1)])
+        self.assertEqual(list(hl.ring((0, 0, 0), -1)), [])
+        self.assertEqual(next(hl.ring((1, -1, 0), 1, return_obj_type="Dict")), {"q":0, "r":0, "s":0})
+        for k in range(1, 5):
+            ring_lst = list(hl.ring((2, -3, 1), k))
+            self.assertEqual(len(ring_lst), 6 * k)
+            self.assertEqual(set(ring_lst), hl.in_range((2, -3, 1), k) - hl.in_range((2, -3, 1), k - 1))
+    
+
+# TestSpiral ---------------------------------------------------------------- #
+class TestSpiral(unittest.TestCase):
+    
+    def test_error(self):
+        with self.assertRaises(TypeError):
+            hl.spiral((0, 0, 0), "2")
+            
+        with self.assertRaises(ConstraintViolation):
+            hl.spiral((1, 0, -2), 1)
+    
+    def test_inout(self):
+        spiral_lst = list(hl.spiral((-1, 0, 1), 3))
+        self.assertEqual(spiral_lst[0], (-1, 0, 1))
+        self.assertEqual(len(spiral_lst), len(set(spiral_lst)))
+        self.assertEqual(set(spiral_lst), hl.in_range((-1, 0, 1), 3))
+        self.assertEqual([hl.distance((-1, 0, 1), qrs) for qrs in spiral_lst], sorted(hl.distance((-1, 0, 1), qrs) for qrs in spiral_lst))
+        self.assertEqual(list(hl.spiral((0, 0, 0), 0, return_obj_type="Coords")), [HexCoords(0, 0, 0)])
+    
+
 # TestLineDraw -------------------------------------------------------------- #
 class TestLineDraw(unittest.TestCase):
     
@@ -1100,6 +1816,10 @@ class TestLineDraw(unittest.TestCase):
         self.assertEqual(hl.line_draw((0, 3, -3), (2, 0, -2), return_obj_type="List"), ([0, 3, -3], [1, 2, -3], [1, 1, -2], [2, 0, -2]))
         self.assertEqual(hl.line_draw((0, 3, -3), (2, 0, -2), return_obj_type="Coords"), (HexCoords(0, 3, -3), HexCoords(1, 2, -3), HexCoords(1, 1, -2), HexCoords(2, 0, -2)))
         self.assertEqual(hl.line_draw((0, 3, -3), (2, 0, -2), return_obj_type="Dict"), ({"q":0, "r":3, "s":-3}, {"q":1, "r":2, "s":-3}, {"q":1, "r":1, "s":-2}, {"q":2, "r":0, "s":-2}))
+        # ambiguous ties with and without epsilon nudge --------------------- #
+        self.assertEqual(hl.line_draw((0, 0, 0), (1, 1, -2)), ((0, 0, 0), (0, 1, -1), (1, 1, -2)))
+        self.assertEqual(hl.line_draw((0, 0, 0), (1, 1, -2), nudge=True), ((0, 0, 0), (1, 0, -1), (1, 1, -2)))
+        self.assertEqual(hl.line_draw((1, -1, 0), (1, -1, 0)), ((1, -1, 0),))
         
     def tearDown(self):
         del self.obj_0
@@ -1112,6 +1832,53 @@ class TestLineDraw(unittest.TestCase):
         del self.obj_7
 
 
+# TestFieldOfView ----------------------------------------------------------- #
+class TestFieldOfView(unittest.TestCase):
+    
+    def setUp(self):
+        self.blockers = {(1, 0, -1), (-2, 2, 0), (0, -3, 3)}
+        
+    def test_error(self):
+        with self.assertRaises(TypeError):
+            hl.field_of_view((0, 0, 0), 2.5, self.blockers)
+            hl.field_of_view((0, 0, 0), 2, 5)
+            
+        with self.assertRaises(ConstraintViolation):
+            hl.field_of_view((1, 0, 0), 2, self.blockers)
+    
+    def test_inout(self):
+        # without blockers the field of view equals in_range ---------------- #
+        for radius in range(0, 5):
+            self.assertEqual(hl.field_of_view((1, -1, 0), radius, set()), hl.in_range((1, -1, 0), radius))
+        # a blocker is visible itself, but hides the hexagons behind it ----- #
+        self.assertEqual(hl.in_range((0, 0, 0), 3) - hl.field_of_view((0, 0, 0), 3, {(1, 0, -1)}), 
+                         {(2, 0, -2), (2, 1, -3), (3, -1, -2), (3, 0, -3)})
+        self.assertEqual(hl.field_of_view((0, 0, 0), 3, self.blockers), 
+                         hl.field_of_view((0, 0, 0), 3, lambda qrs: qrs in self.blockers))
+        self.assertEqual(hl.field_of_view((0, 0, 0), 1, self.blockers, return_obj_type="Coords"), 
+                         hl.in_range((0, 0, 0), 1, return_obj_type="Coords"))
+        
+    def test_symmetry(self):
+        floors = hl.in_range((0, 0, 0), 4) - self.blockers
+        fovs = hl.field_of_view_batch(floors, 4, self.blockers)
+        for a in floors:
+            for b in fovs[a] & floors:
+                self.assertIn(a, fovs[b])
+                
+    def test_batch(self):
+        calls = list()
+        def is_blocked(qrs):
+            calls.append(qrs)
+            return qrs in self.blockers
+        fovs = hl.field_of_view_batch([(0, 0, 0), HexCoords(1, -1, 0)], 3, is_blocked)
+        self.assertEqual(fovs[(0, 0, 0)], hl.field_of_view((0, 0, 0), 3, self.blockers))
+        self.assertEqual(fovs[(1, -1, 0)], hl.field_of_view((1, -1, 0), 3, self.blockers))
+        self.assertEqual(len(calls), len(set(calls)))
+        
+    def tearDown(self):
+        del self.blockers
+        
+
 # TestDistLimFloodFill ------------------------------------------------------ #
 class TestDistLimFloodFill(unittest.TestCase):
     """
@@ -1185,6 +1952,269 @@ class TestDistLimFloodFill(unittest.TestCase):
         testgrp_teardown(self.test_grp_4)
     
 
+# TestLoadTilemap ----------------------------------------------------------- #
+class TestLoadTilemap(unittest.TestCase):
+    
+    def setUp(self):
+        self.test_grp = testgrp_generator((0, 0, 0), 3, ((1, -1, 0, {"movement_cost":-1} ), 
+                                                        (0, 2, -2, {"movement_cost":2.5} ), 
+                                                        (-2, 1, 1, {"movement_cost":3} ) ))
+        self.control_matrix = hl.GraphMatrix(self.test_grp)
+        tiles = [(obj.q, obj.r, obj.s, obj.movement_cost) for obj in self.test_grp]
+        self.csv = ("q,r,s,movement_cost\n" + "".join(f"{q},{r},{s},{c}\n" for q, r, s, c in tiles)).encode()
+        self.jsonl = "".join(f'{{"q":{q},"r":{r},"movement_cost":{c}}}\n' for q, r, s, c in tiles).encode()
+        self.bin = b"".join(hl.TILE_RECORD.pack(q, r, c) for q, r, s, c in tiles)
+        
+    def test_formats(self):
+        for file_format in ("csv", "jsonl", "bin"):
+            test_matrix = hl.load_tilemap(io.BytesIO(getattr(self, file_format)), file_format)
+            self.assertEqual(test_matrix.matrix_dict, self.control_matrix.matrix_dict)
+            self.assertEqual(test_matrix.matrix_coords, self.control_matrix.matrix_coords)
+        test_matrix = hl.load_tilemap(io.BytesIO(b"r,q\n0,0\n0,1\n"), "CSV")
+        self.assertEqual(test_matrix.matrix_dict, {(0, 0, 0):{(1, 0, -1):1}, (1, 0, -1):{(0, 0, 0):1}})
+        
+    def test_short_reads(self):
+        # a stream returning at most 5 bytes per read, like a pipe ---------- #
+        stream = io.BytesIO(self.bin)
+        short = Mock()
+        short.read = lambda size: stream.read(min(size, 5))
+        del short.fileno
+        test_matrix = hl.load_tilemap(short, "bin")
+        self.assertEqual(test_matrix.matrix_dict, self.control_matrix.matrix_dict)
+        stream = io.BytesIO(self.bin[:-1])
+        with self.assertRaises(ValueError):
+            hl.load_tilemap(short, "bin")
+            
+    def test_duplicates(self):
+        # the later record of a tile replaces the earlier one --------------- #
+        test_matrix = hl.load_tilemap(io.BytesIO(b"q,r,movement_cost\n0,0,1\n1,0,1\n0,0,-1\n"), "csv")
+        self.assertEqual(test_matrix.matrix_coords, {(1, 0, -1)})
+        self.assertEqual(test_matrix.matrix_dict[(1, 0, -1)], {(0, 0, 0):-1})
+        test_matrix = hl.load_tilemap(io.BytesIO(b"q,r,movement_cost\n0,0,-1\n1,0,1\n0,0,2\n"), "csv")
+        self.assertEqual(test_matrix.matrix_coords, {(0, 0, 0), (1, 0, -1)})
+        
+    def test_path_and_progress(self):
+        calls = list()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "map.bin")
+            with open(path, "wb") as file:
+                file.write(self.bin)
+            test_matrix = hl.load_tilemap(path, progress=lambda *args: calls.append(args), progress_every=10)
+        self.assertEqual(test_matrix.matrix_dict, self.control_matrix.matrix_dict)
+        self.assertEqual(calls, [(10, 592, 592), (20, 592, 592), (30, 592, 592), (37, 592, 592)])
+        
+        calls.clear()
+        hl.load_tilemap(io.BytesIO(self.jsonl), "jsonl", progress=lambda *args: calls.append(args), progress_every=20)
+        self.assertEqual([call[0] for call in calls], [20, 37])
+        self.assertEqual(calls[-1][1:], (len(self.jsonl), None))
+        
+    def test_error(self):
+        with self.assertRaises(ValueError):
+            hl.load_tilemap(io.BytesIO(self.csv))
+        with self.assertRaises(ValueError):
+            hl.load_tilemap(io.BytesIO(self.csv), "xml")
+        with self.assertRaises(ValueError):
+            hl.load_tilemap(io.BytesIO(self.csv), "csv", progress_every=0)
+        with self.assertRaises(ValueError):
+            hl.load_tilemap(io.BytesIO(b"q,s\n0,0\n"), "csv")
+        with self.assertRaises(ValueError):
+            hl.load_tilemap(io.BytesIO(b"q,r\n0,a\n"), "csv")
+        with self.assertRaises(ConstraintViolation):
+            hl.load_tilemap(io.BytesIO(b'{"q":0,"r":0,"s":1}\n'), "jsonl")
+        with self.assertRaises(TypeError):
+            hl.load_tilemap(io.BytesIO(b'{"q":0.5,"r":0}\n'), "jsonl")
+        with self.assertRaises(ValueError):
+            hl.load_tilemap(io.BytesIO(b'{"q":0}\n'), "jsonl")
+        with self.assertRaises(ValueError):
+            hl.load_tilemap(io.BytesIO(self.bin[:-1]), "bin")
+            
+    def tearDown(self):
+        testgrp_teardown(self.test_grp)
+        
+        
+# TestProfiling ------------------------------------------------------------- #
+class TestProfiling(unittest.TestCase):
+    
+    def setUp(self):
+        self.neighbors = hl.neighbors
+        self.a_star_algorithm = hl.GraphMatrix.a_star_algorithm
+        self.graph_matrix = hl.GraphMatrix.from_cost_grid([[1] * 4 for _ in range(4)])
+        hl.reset_profiling()
+        
+    def test_targets(self):
+        targets = hl.profiling_targets()
+        self.assertIn("neighbors", targets)
+        self.assertIn("GraphMatrix.a_star_algorithm", targets)
+        self.assertNotIn("enable_profiling", targets)
+        self.assertNotIn("_ring", targets)
+        with self.assertRaises(ValueError):
+            hl.enable_profiling(["neighbours"])
+        
+    def test_toggle(self):
+        self.assertFalse(hl.profiling_enabled())
+        hl.enable_profiling(["neighbors", "distance", "range_offsets", "GraphMatrix.a_star_algorithm"])
+        self.assertTrue(hl.profiling_enabled())
+        self.assertIsNot(hl.neighbors, self.neighbors)
+        self.assertEqual(hl.neighbors.__name__, "neighbors")
+        self.assertTrue(hasattr(hl.range_offsets, "cache_info"))
+        
+        path = self.graph_matrix.a_star_algorithm((0, 0, 0), (3, -1, -2))
+        for qrs in path:
+            hl.neighbors(qrs)
+        stats = hl.profiling_stats()
+        self.assertEqual(stats["GraphMatrix.a_star_algorithm"]["calls"], 1)
+        self.assertEqual(stats["neighbors"]["calls"], len(path))
+        self.assertGreaterEqual(stats["GraphMatrix.a_star_algorithm"]["seconds"], stats["neighbors"]["mean"])
+        self.assertNotIn("range_offsets", stats)
+        
+        # counters are kept when disabled, functions restored --------------- #
+        hl.disable_profiling()
+        self.assertFalse(hl.profiling_enabled())
+        self.assertIs(hl.neighbors, self.neighbors)
+        self.assertIs(hl.GraphMatrix.a_star_algorithm, self.a_star_algorithm)
+        calls = hl.profiling_stats()["neighbors"]["calls"]
+        hl.neighbors((0, 0, 0))
+        self.assertEqual(hl.profiling_stats()["neighbors"]["calls"], calls)
+        hl.reset_profiling()
+        self.assertEqual(hl.profiling_stats(), dict())
+        
+    def test_late_import(self):
+        # a module importing a wrapper while enabled gets the original ------ #
+        hl.enable_profiling(["neighbors"])
+        late_mod = types.ModuleType("late_mod")
+        sys.modules["late_mod"] = late_mod
+        try:
+            exec("from src.hexlogic.hexlogic import neighbors", vars(late_mod))
+            self.assertIsNot(late_mod.neighbors, self.neighbors)
+            hl.disable_profiling()
+            self.assertIs(late_mod.neighbors, self.neighbors)
+            late_mod.neighbors((0, 0, 0))
+            self.assertNotIn("neighbors", hl.profiling_stats())
+        finally:
+            del sys.modules["late_mod"]
+        
+    def test_classmethods_and_constructors(self):
+        targets = hl.profiling_targets()
+        self.assertIn("GraphMatrix.from_cost_grid", targets)
+        self.assertIn("ContractionHierarchy.from_json", targets)
+        self.assertIn("GraphMatrix.__init__", targets)
+        self.assertNotIn("HexCoords.__init__", targets)
+        from_cost_grid = vars(hl.GraphMatrix)["from_cost_grid"]
+        init = hl.GraphMatrix.__init__
+        
+        hl.enable_profiling()
+        graph = hl.GraphMatrix.from_cost_grid([[1, 2], [3, None]])
+        self.assertIsInstance(graph, hl.GraphMatrix)
+        self.assertIsInstance(vars(hl.GraphMatrix)["from_cost_grid"], classmethod)
+        hl.GraphMatrix(())
+        stats = hl.profiling_stats()
+        self.assertEqual(stats["GraphMatrix.from_cost_grid"]["calls"], 1)
+        self.assertEqual(stats["GraphMatrix.__init__"]["calls"], 2)
+        hl.disable_profiling()
+        self.assertIs(vars(hl.GraphMatrix)["from_cost_grid"], from_cost_grid)
+        self.assertIs(hl.GraphMatrix.__init__, init)
+        
+    def test_text(self):
+        hl.enable_profiling(["distance"])
+        hl.distance((0, 0, 0), (1, -1, 0))
+        hl.distance((0, 0, 0), (2, -1, -1))
+        hl.disable_profiling()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "hexlogic.prom")
+            text = hl.profiling_text(path)
+            with open(path) as file:
+                self.assertEqual(file.read(), text)
+        self.assertIn('hexlogic_calls_total{function="distance"} 2\n', text)
+        self.assertIn("# TYPE hexlogic_seconds_total counter\n", text)
+        
+    def tearDown(self):
+        hl.disable_profiling()
+        hl.reset_profiling()
+        
+        
+# TestBenchmark ------------------------------------------------------------- #
+class TestBenchmark(unittest.TestCase):
+    
+    def test_percentile(self):
+        self.assertEqual(hb.percentile([3, 1, 2], 50), 2)
+        self.assertEqual(hb.percentile(list(range(1, 21)), 95), 19)
+        self.assertEqual(hb.percentile([4], 95), 4)
+        
+    def test_benchmark_map(self):
+        tiles = hb.benchmark_map(3)
+        self.assertEqual({(tile.q, tile.r, tile.s) for tile in tiles}, hl.in_range((0, 0, 0), 3))
+        self.assertEqual([tile.movement_cost for tile in tiles], [tile.movement_cost for tile in hb.benchmark_map(3)])
+        self.assertIsNotNone(hl.GraphMatrix(tiles).a_star_algorithm((-3, 0, 3), (3, 0, -3)))
+        
+    def test_benchmark_cases(self):
+        # the hierarchy is built before timing, if hierarchy_path is run ---- #
+        graph_of = lambda case: next(cell.cell_contents for cell in case.__closure__
+                                     if isinstance(cell.cell_contents, hl.GraphMatrix))
+        cases = hb.benchmark_cases(3)
+        self.assertIsNotNone(graph_of(cases["hierarchy_path"]).hierarchy)
+        self.assertEqual(len(cases["hierarchy_path"]()), len(cases["a_star_algorithm"]()))
+        cases = hb.benchmark_cases(3, names=("a_star_algorithm",))
+        self.assertIsNone(graph_of(cases["a_star_algorithm"]).hierarchy)
+    
+    def test_run_benchmarks(self):
+        results = hb.run_benchmarks(radii=(1, 2), names=("in_range", "distance"), repeat=2, min_sample_time=0)
+        self.assertEqual([(result["name"], result["radius"], result["tiles"]) for result in results["results"]], 
+                         [("in_range", 1, 7), ("distance", 1, 7), ("in_range", 2, 19), ("distance", 2, 19)])
+        for result in results["results"]:
+            self.assertEqual(len(result["samples"]), 2)
+            self.assertLessEqual(result["min"], result["median"])
+            self.assertLessEqual(result["median"], result["p95"])
+        self.assertEqual(json.loads(json.dumps(results)), results)
+        
+    def test_memory(self):
+        self.assertGreater(hb.peak_memory(lambda: [0] * 10000), 80000)
+        results = hb.run_benchmarks(radii=(2,), names=("GraphMatrix",), repeat=1, min_sample_time=0, memory=True)
+        result = results["results"][0]
+        self.assertGreater(result["peak_bytes"], 0)
+        self.assertEqual(result["footprint"], hl.GraphMatrix(hb.benchmark_map(2)).memory_footprint())
+        
+    def test_compare_results(self):
+        baseline = {("a_star_algorithm", 5):[1.0, 1.1, 0.9, 1.0, 1.05], 
+                    ("GraphMatrix", 5):[1.0, 1.1, 0.9, 1.0, 1.05], 
+                    ("in_range", 5):[1.0, 1.1, 0.9, 1.0, 1.05], 
+                    ("line_draw", 5):[1.0], 
+                    ("distance", 5):[1.0]}
+        current = {("a_star_algorithm", 5):[1.5, 1.6, 1.4, 1.5, 1.55], 
+                   ("GraphMatrix", 5):[0.5, 0.6, 0.4, 0.5, 0.55], 
+                   ("in_range", 5):[1.2, 0.8, 1.3, 0.7, 1.25], 
+                   ("line_draw", 5):[1.2], 
+                   ("hex_to_pixel", 5):[1.0]}
+        rows = {row["name"]:row for row in hb.compare_results(baseline, current, threshold=0.1)}
+        self.assertEqual(rows["a_star_algorithm"]["status"], "regressed")
+        self.assertAlmostEqual(rows["a_star_algorithm"]["change"], 0.5)
+        self.assertEqual(rows["GraphMatrix"]["status"], "improved")
+        self.assertEqual(rows["in_range"]["status"], "unchanged")
+        self.assertEqual(rows["line_draw"]["status"], "regressed")
+        self.assertIsNone(rows["line_draw"]["p_slower"])
+        self.assertEqual(rows["distance"]["status"], "missing")
+        self.assertEqual(rows["hex_to_pixel"]["status"], "new")
+        self.assertEqual(hb.compare_results(baseline, current, threshold=0.6)[0]["status"], "unchanged")
+        self.assertLess(hb.mann_whitney_p([1, 2, 3, 4], [5, 6, 7, 8]), 0.05)
+        self.assertGreater(hb.mann_whitney_p([5, 6, 7, 8], [1, 2, 3, 4]), 0.95)
+        
+    def test_gate_exit_code(self):
+        def result_file(directory, name, samples):
+            path = os.path.join(directory, name)
+            with open(path, "w") as file:
+                json.dump({"results":[{"name":"a_star_algorithm", "radius":5, "samples":samples}]}, file)
+            return path
+        with tempfile.TemporaryDirectory() as directory:
+            base_0 = result_file(directory, "base_0.json", [1.0, 1.1, 0.9])
+            base_1 = result_file(directory, "base_1.json", [1.0, 1.05])
+            slow = result_file(directory, "slow.json", [2.0, 2.1, 1.9, 2.0])
+            same = result_file(directory, "same.json", [1.0, 1.02, 0.98, 1.01])
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(hb.load_results([base_0, base_1]), {("a_star_algorithm", 5):[1.0, 1.1, 0.9, 1.0, 1.05]})
+                self.assertEqual(hb.main(["--baseline", base_0, base_1, "--current", slow]), 1)
+                self.assertEqual(hb.main(["--baseline", base_0, base_1, "--current", same]), 0)
+                self.assertEqual(hb.main(["--baseline", base_0, "--current", slow, "--threshold", "150"]), 0)
+                
+        
 # run unittests ------------------------------------------------------------- #
 unittest.main()
 